@@ -4,6 +4,12 @@ import os
 from fastapi import FastAPI
 
 from services.database import create_db_and_tables
+from services.docling_service import DOCLING_POOL_SERVICE
+from services.http_client_service import HTTP_CLIENT_SERVICE
+from services.icon_finder_service import ICON_FINDER_SERVICE
+from services.loop_monitor_service import LOOP_MONITOR_SERVICE
+from services.media_gc_service import MEDIA_GC_SERVICE
+from services.pdf_render_service import PDF_RENDER_SERVICE
 from utils.get_env import get_app_data_directory_env
 from utils.model_availability import (
     check_llm_and_image_provider_api_or_model_availability,
@@ -15,9 +21,24 @@ async def app_lifespan(_: FastAPI):
     """
     Lifespan context manager for FastAPI application.
     Initializes the application data directory and checks LLM model availability.
+    Starts the event loop monitor when LOOP_MONITOR is enabled.
+    Schedules garbage collection of unreferenced media files.
+    Warms up the icon index in the background.
+    Starts the docling parser worker processes.
+    Stops the PDF render worker processes, started on first use, on shutdown.
+    Closes the shared HTTP client sessions on shutdown.
 
     """
     os.makedirs(get_app_data_directory_env(), exist_ok=True)
     await create_db_and_tables()
     await check_llm_and_image_provider_api_or_model_availability()
+    LOOP_MONITOR_SERVICE.start_if_enabled()
+    MEDIA_GC_SERVICE.start_if_enabled()
+    ICON_FINDER_SERVICE.start_warm_up_if_enabled()
+    DOCLING_POOL_SERVICE.start()
     yield
+    await DOCLING_POOL_SERVICE.stop()
+    await PDF_RENDER_SERVICE.stop()
+    await MEDIA_GC_SERVICE.stop()
+    await HTTP_CLIENT_SERVICE.close()
+    await LOOP_MONITOR_SERVICE.stop()
@@ -1,10 +1,11 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from api.lifespan import app_lifespan
-from api.middlewares import UserConfigEnvUpdateMiddleware
+from api.middlewares import RequestProfilingMiddleware, UserConfigEnvUpdateMiddleware
 from api.v1.ppt.router import API_V1_PPT_ROUTER
 from api.v1.webhook.router import API_V1_WEBHOOK_ROUTER
 from api.v1.mock.router import API_V1_MOCK_ROUTER
+from api.v1.admin.router import API_V1_ADMIN_ROUTER
 
 
 app = FastAPI(lifespan=app_lifespan)
@@ -14,6 +15,7 @@ app = FastAPI(lifespan=app_lifespan)
 app.include_router(API_V1_PPT_ROUTER)
 app.include_router(API_V1_WEBHOOK_ROUTER)
 app.include_router(API_V1_MOCK_ROUTER)
+app.include_router(API_V1_ADMIN_ROUTER)
 
 # Middlewares
 origins = ["*"]
@@ -26,3 +28,4 @@ app.add_middleware(
 )
 
 app.add_middleware(UserConfigEnvUpdateMiddleware)
+app.add_middleware(RequestProfilingMiddleware)
@@ -1,8 +1,13 @@
 from fastapi import Request
+from starlette.datastructures import Headers, MutableHeaders
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-from utils.get_env import get_can_change_keys_env
+from services.request_profiler_service import REQUEST_PROFILER_SERVICE
+from utils.admin import is_valid_admin_token
+from utils.get_env import get_can_change_keys_env, get_request_profiling_env
+from utils.parsers import parse_bool_or_none
 from utils.user_config import update_env_with_user_config
 
 
@@ -11,3 +16,56 @@ class UserConfigEnvUpdateMiddleware(BaseHTTPMiddleware):
         if get_can_change_keys_env() != "false":
             update_env_with_user_config()
         return await call_next(request)
+
+
+class RequestProfilingMiddleware:
+    """
+    Profiles requests sent with `X-Profile: true` and a valid `X-Admin-Token`
+    when REQUEST_PROFILING is enabled. The profile id is returned in the
+    `X-Profile-Id` response header.
+    Wraps the whole ASGI call, so background tasks that run after the
+    response is sent (e.g. /generate/async) are part of the profile.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not parse_bool_or_none(
+            get_request_profiling_env()
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        if not (
+            parse_bool_or_none(headers.get("x-profile"))
+            and is_valid_admin_token(headers.get("x-admin-token"))
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        session = REQUEST_PROFILER_SERVICE.start_session(
+            scope["method"], scope["path"]
+        )
+        status_code = None
+
+        async def send_with_profile_headers(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                response_headers = MutableHeaders(scope=message)
+                if session:
+                    response_headers.append("X-Profile-Id", session.id)
+                else:
+                    response_headers.append("X-Profile-Status", "busy")
+            await send(message)
+
+        if not session:
+            await self.app(scope, receive, send_with_profile_headers)
+            return
+
+        try:
+            await self.app(scope, receive, send_with_profile_headers)
+        finally:
+            await REQUEST_PROFILER_SERVICE.finish_session(session, status_code)
@@ -0,0 +1,83 @@
+import os
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import FileResponse
+
+from services.asset_fetch_scheduler_service import ASSET_FETCH_SCHEDULER_SERVICE
+from services.docling_service import DOCLING_POOL_SERVICE
+from services.generated_image_index_service import GENERATED_IMAGE_INDEX_SERVICE
+from services.image_search_cache_service import IMAGE_SEARCH_CACHE_SERVICE
+from services.loop_monitor_service import LOOP_MONITOR_SERVICE
+from services.media_gc_service import MEDIA_GC_SERVICE
+from services.parsed_document_cache_service import PARSED_DOCUMENT_CACHE_SERVICE
+from services.pdf_render_service import PDF_RENDER_SERVICE
+from services.request_profiler_service import REQUEST_PROFILER_SERVICE
+from utils.admin import verify_admin_token
+
+API_V1_ADMIN_ROUTER = APIRouter(
+    prefix="/api/v1/admin",
+    tags=["Admin"],
+    dependencies=[Depends(verify_admin_token)],
+)
+
+
+@API_V1_ADMIN_ROUTER.get("/loop-monitor")
+async def get_loop_monitor_report():
+    return LOOP_MONITOR_SERVICE.get_report()
+
+
+@API_V1_ADMIN_ROUTER.delete("/loop-monitor", status_code=204)
+async def reset_loop_monitor_report():
+    LOOP_MONITOR_SERVICE.reset()
+
+
+@API_V1_ADMIN_ROUTER.get("/profiles")
+async def list_request_profiles():
+    return REQUEST_PROFILER_SERVICE.list_profiles()
+
+
+@API_V1_ADMIN_ROUTER.get("/profiles/{id}")
+async def get_request_profile(id: str):
+    profile_path = REQUEST_PROFILER_SERVICE.get_profile_path(id)
+    if not profile_path:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(profile_path, filename=os.path.basename(profile_path))
+
+
+@API_V1_ADMIN_ROUTER.get("/image-search-cache")
+async def get_image_search_cache_stats():
+    return IMAGE_SEARCH_CACHE_SERVICE.get_stats()
+
+
+@API_V1_ADMIN_ROUTER.get("/media-gc")
+async def get_last_media_gc_result():
+    return MEDIA_GC_SERVICE.last_result
+
+
+@API_V1_ADMIN_ROUTER.post("/media-gc")
+async def collect_unreferenced_media(dry_run: bool = False):
+    return await MEDIA_GC_SERVICE.collect(dry_run=dry_run)
+
+
+@API_V1_ADMIN_ROUTER.get("/asset-fetch-scheduler")
+async def get_asset_fetch_scheduler_stats():
+    return ASSET_FETCH_SCHEDULER_SERVICE.get_stats()
+
+
+@API_V1_ADMIN_ROUTER.get("/generated-image-index")
+async def get_generated_image_index_stats():
+    return GENERATED_IMAGE_INDEX_SERVICE.get_stats()
+
+
+@API_V1_ADMIN_ROUTER.get("/docling-pool")
+async def get_docling_pool_stats():
+    return DOCLING_POOL_SERVICE.get_stats()
+
+
+@API_V1_ADMIN_ROUTER.get("/pdf-render-pool")
+async def get_pdf_render_pool_stats():
+    return PDF_RENDER_SERVICE.get_stats()
+
+
+@API_V1_ADMIN_ROUTER.get("/document-cache")
+async def get_parsed_document_cache_stats():
+    return PARSED_DOCUMENT_CACHE_SERVICE.get_stats()
@@ -63,7 +63,9 @@ async def decompose_files(file_paths: Annotated[List[str], Body(embed=True)]):
             text_file.write(parsed_doc)
         response.append(
             DecomposedFileInfo(
-                name=os.path.basename(other_files[index]), file_path=file_path
+                name=os.path.basename(other_files[index]),
+                file_path=file_path,
+                error=documents_loader.errors[index],
             )
         )
 
@@ -1,5 +1,6 @@
 from typing import List
 from fastapi import APIRouter
+from fastapi.responses import JSONResponse
 from services.icon_finder_service import ICON_FINDER_SERVICE
 
 ICONS_ROUTER = APIRouter(prefix="/icons", tags=["Icons"])
@@ -8,3 +9,12 @@ ICONS_ROUTER = APIRouter(prefix="/icons", tags=["Icons"])
 @ICONS_ROUTER.get("/search", response_model=List[str])
 async def search_icons(query: str, limit: int = 20):
     return await ICON_FINDER_SERVICE.search_icons(query, limit)
+
+
+@ICONS_ROUTER.get("/status")
+async def get_icon_index_status():
+    # 503 until the index is loaded, so it can be used as a readiness probe
+    return JSONResponse(
+        ICON_FINDER_SERVICE.get_status(),
+        status_code=200 if ICON_FINDER_SERVICE.is_ready else 503,
+    )
@@ -1,5 +1,9 @@
-from typing import List
-from fastapi import APIRouter, Depends, File, UploadFile, HTTPException
+import asyncio
+import json
+from typing import List, Literal, Optional, Tuple
+from urllib.parse import urlparse
+from fastapi import APIRouter, Depends, File, Query, UploadFile, HTTPException
+from fastapi.responses import FileResponse, StreamingResponse
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
@@ -9,7 +13,9 @@ from models.image_prompt import ImagePrompt
 from models.sql.image_asset import ImageAsset
 from models.sql.presentation import PresentationModel
 from models.sql.slide import SlideModel
+from models.sse_response import SSECompleteResponse, SSEResponse
 from services.database import get_async_session
+from services.image_derivative_service import IMAGE_DERIVATIVE_SERVICE
 from services.image_generation_service import ImageGenerationService
 from services.temp_file_service import TEMP_FILE_SERVICE
 from utils.asset_directory_utils import get_images_directory
@@ -17,7 +23,13 @@ import os
 import uuid
 from utils.file_utils import get_file_name_with_random_uuid
 from utils.asset_directory_utils import get_uploads_directory
-from services.media_service import download_to_storage, is_external_media, finalize_local_path
+from services.media_service import (
+    download_to_storage,
+    is_external_media,
+    finalize_local_path,
+    is_content_addressed_filename,
+    get_media_file_path,
+)
 from utils.dict_utils import get_dict_paths_with_key, get_dict_at_path, set_dict_at_path
 import uuid as _uuid
 
@@ -115,7 +127,9 @@ async def delete_uploaded_image_by_id(
         if not image:
             raise HTTPException(status_code=404, detail="Image not found")
 
-        os.remove(image.path)
+        # Content addressed files can be shared, garbage collection removes them
+        if not is_content_addressed_filename(os.path.basename(image.path)):
+            os.remove(image.path)
 
         await sql_session.delete(image)
         await sql_session.commit()
@@ -150,89 +164,229 @@ async def cache_image(payload: CacheImageRequest):
         raise HTTPException(status_code=500, detail=f"Failed to cache image: {str(e)}")
 
 
+@IMAGES_ROUTER.get("/derivative")
+async def get_image_derivative(
+    url: str,
+    width: int = Query(gt=0, le=4096),
+    height: int = Query(gt=0, le=4096),
+    format: Literal["jpeg", "png", "webp"] = "webp",
+):
+    """
+    Serves a stored image (`/api/local-image/...`) resized for a box of
+    width x height points, so the editor does not load full-size originals.
+    """
+    source_path = get_media_file_path(url)
+    if not source_path:
+        raise HTTPException(status_code=404, detail="Image not found")
+    derivative_path = await asyncio.to_thread(
+        IMAGE_DERIVATIVE_SERVICE.get_derivative_path,
+        source_path,
+        width,
+        height,
+        format,
+    )
+    return FileResponse(derivative_path)
+
+
+STOCK_IMAGE_HOSTS = ("pixabay.com", "pexels.com")
+
+# Slides refreshed concurrently, provider limits still apply per image
+REFRESH_SLIDE_CONCURRENCY = 4
+
+
 class RefreshPresentationRequest(BaseModel):
     id: _uuid.UUID
+    dry_run: bool = False
+    stream: bool = False
+
+
+def get_stock_image_host(url: object) -> Optional[str]:
+    if not isinstance(url, str) or not (
+        url.startswith("http://") or url.startswith("https://")
+    ):
+        return None
+    host = urlparse(url).hostname or ""
+    for stock_host in STOCK_IMAGE_HOSTS:
+        if host == stock_host or host.endswith(f".{stock_host}"):
+            return stock_host
+    return None
+
+
+def get_stock_image_paths(slide: SlideModel) -> List[list]:
+    """Paths of image dicts with a prompt and a Pixabay or Pexels url."""
+    stock_image_paths = []
+    for path in get_dict_paths_with_key(slide.content, "__image_prompt__"):
+        image_dict = get_dict_at_path(slide.content, path) or {}
+        if (image_dict.get("__image_prompt__") or "").strip() and get_stock_image_host(
+            image_dict.get("__image_url__")
+        ):
+            stock_image_paths.append(path)
+    return stock_image_paths
+
+
+async def refresh_image(
+    image_generation_service: ImageGenerationService, prompt: str, priority: int
+) -> Tuple[Optional[str], Optional[ImageAsset]]:
+    result = await image_generation_service.generate_image(
+        ImagePrompt(prompt=prompt), priority=priority
+    )
+    if isinstance(result, ImageAsset):
+        return finalize_local_path(result.path) or result.path, result
+    if isinstance(result, str):
+        if is_external_media(result):
+            cached = await download_to_storage(result, priority=priority)
+            return cached or result, None
+        return finalize_local_path(result) or result, None
+    return None, None
+
+
+async def refresh_slide_images(
+    image_generation_service: ImageGenerationService,
+    slide: SlideModel,
+    image_paths: List[list],
+) -> Tuple[int, List[ImageAsset]]:
+    """Regenerates the given images of a slide in parallel, errors are skipped."""
+    results = await asyncio.gather(
+        *[
+            refresh_image(
+                image_generation_service,
+                get_dict_at_path(slide.content, path)["__image_prompt__"].strip(),
+                slide.index,
+            )
+            for path in image_paths
+        ],
+        return_exceptions=True,
+    )
+
+    regenerated = 0
+    new_assets = []
+    for path, result in zip(image_paths, results):
+        if isinstance(result, BaseException):
+            continue
+        final_url, image_asset = result
+        if not final_url:
+            continue
+        image_dict = get_dict_at_path(slide.content, path)
+        image_dict["__image_url__"] = final_url
+        set_dict_at_path(slide.content, path, image_dict)
+        regenerated += 1
+        if image_asset:
+            new_assets.append(image_asset)
+    return regenerated, new_assets
 
 
 @IMAGES_ROUTER.post("/refresh-presentation")
 async def refresh_presentation_images(payload: RefreshPresentationRequest, sql_session: AsyncSession = Depends(get_async_session)):
     """
-    For a given presentation, iterate through all slides and regenerate images
-    where the current __image_url__ points to pixabay.com or pexels.com, using
-    the slide's __image_prompt__. Newly generated images are stored locally and
-    slide content is updated to reference `/api/local-image/{filename}`.
+    For a given presentation, regenerate images where the current __image_url__
+    points to pixabay.com or pexels.com, using the slide's __image_prompt__.
+    Newly generated images are stored locally and slide content is updated to
+    reference `/api/local-image/{filename}`.
+
+    - Slides are refreshed in parallel and committed one by one, so progress
+      survives a dropped connection.
+    - `dry_run` only counts the images that would be replaced.
+    - `stream` returns progress as server-sent events instead of one response.
     """
     pres = await sql_session.get(PresentationModel, payload.id)
     if not pres:
         raise HTTPException(status_code=404, detail="Presentation not found")
 
-    slides = await sql_session.scalars(
-        select(SlideModel).where(SlideModel.presentation == payload.id).order_by(SlideModel.index)
+    slides = list(
+        await sql_session.scalars(
+            select(SlideModel).where(SlideModel.presentation == payload.id).order_by(SlideModel.index)
+        )
     )
-
-    images_directory = get_images_directory()
-    temp_dir = TEMP_FILE_SERVICE.create_temp_dir()
-    image_generation_service = ImageGenerationService(images_directory, temp_dir=temp_dir)
-
-    changed = False
-    processed = 0
-    regenerated = 0
-
-    for slide in slides:
-        # Find dicts that contain __image_prompt__
-        image_paths = get_dict_paths_with_key(slide.content, "__image_prompt__")
-        slide_changed = False
-        for path in image_paths:
-            image_dict = get_dict_at_path(slide.content, path) or {}
-            prompt = image_dict.get("__image_prompt__", "").strip()
-            url = image_dict.get("__image_url__", "")
-            if not prompt:
-                continue
-            # Only target pixabay.com or pexels.com
-            try:
-                host = ""
-                if isinstance(url, str) and (url.startswith("http://") or url.startswith("https://")):
-                    from urllib.parse import urlparse
-                    host = urlparse(url).hostname or ""
-                needs_regen = host.endswith("pixabay.com") or host.endswith("pexels.com") or (".pixabay.com" in host) or (".pexels.com" in host)
-            except Exception:
-                needs_regen = False
-
-            if not needs_regen:
-                continue
-
-            processed += 1
-            try:
-                result = await image_generation_service.generate_image(ImagePrompt(prompt=prompt))
-                final_url: str | None = None
-                if isinstance(result, ImageAsset):
-                    final_url = finalize_local_path(result.path) or result.path
-                elif isinstance(result, str):
-                    if is_external_media(result):
-                        cached = await download_to_storage(result)
-                        final_url = cached or result
-                    else:
-                        final_url = finalize_local_path(result) or result
-                if final_url:
-                    image_dict["__image_url__"] = final_url
-                    set_dict_at_path(slide.content, path, image_dict)
-                    slide_changed = True
-                    regenerated += 1
-            except Exception:
-                # Skip errors per image to continue batch
-                pass
-
-        if slide_changed:
-            # Ensure SQLAlchemy detects JSON field mutation
-            try:
-                flag_modified(slide, "content")
-            except Exception:
-                # Fallback: reassign content to trigger change detection
-                slide.content = dict(slide.content or {})
-            sql_session.add(slide)
-            changed = True
-    
-    if changed:
-        await sql_session.commit()
-
-    return {"id": str(payload.id), "updated": changed, "processed": processed, "regenerated": regenerated}
+    slides_with_paths = [
+        (slide, image_paths)
+        for slide in slides
+        if (image_paths := get_stock_image_paths(slide))
+    ]
+    processed = sum(len(image_paths) for _, image_paths in slides_with_paths)
+
+    if payload.dry_run:
+        by_host = {}
+        for slide, image_paths in slides_with_paths:
+            for path in image_paths:
+                host = get_stock_image_host(
+                    get_dict_at_path(slide.content, path)["__image_url__"]
+                )
+                by_host[host] = by_host.get(host, 0) + 1
+        return {
+            "id": str(payload.id),
+            "dry_run": True,
+            "slides": len(slides_with_paths),
+            "images": processed,
+            "by_host": by_host,
+        }
+
+    async def refresh():
+        """Yields (slide, regenerated) as slides finish, committing each."""
+        temp_dir = TEMP_FILE_SERVICE.create_temp_dir()
+        image_generation_service = ImageGenerationService(
+            get_images_directory(), temp_dir=temp_dir
+        )
+        semaphore = asyncio.Semaphore(REFRESH_SLIDE_CONCURRENCY)
+
+        async def refresh_slide(slide: SlideModel, image_paths: List[list]):
+            async with semaphore:
+                regenerated, new_assets = await refresh_slide_images(
+                    image_generation_service, slide, image_paths
+                )
+            return slide, regenerated, new_assets
+
+        tasks = [
+            asyncio.create_task(refresh_slide(slide, image_paths))
+            for slide, image_paths in slides_with_paths
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                slide, regenerated, new_assets = await next_done
+                if regenerated:
+                    # Ensure SQLAlchemy detects JSON field mutation
+                    flag_modified(slide, "content")
+                    sql_session.add(slide)
+                    sql_session.add_all(new_assets)
+                    await sql_session.commit()
+                yield slide, regenerated
+        finally:
+            for task in tasks:
+                task.cancel()
+            TEMP_FILE_SERVICE.cleanup_temp_dir(temp_dir)
+
+    if not payload.stream:
+        regenerated = 0
+        async for _, slide_regenerated in refresh():
+            regenerated += slide_regenerated
+        return {"id": str(payload.id), "updated": regenerated > 0, "processed": processed, "regenerated": regenerated}
+
+    async def inner():
+        completed_slides = 0
+        regenerated = 0
+        async for slide, slide_regenerated in refresh():
+            completed_slides += 1
+            regenerated += slide_regenerated
+            yield SSEResponse(
+                event="response",
+                data=json.dumps(
+                    {
+                        "type": "progress",
+                        "slide": slide.index,
+                        "regenerated": slide_regenerated,
+                        "completed_slides": completed_slides,
+                        "total_slides": len(slides_with_paths),
+                    }
+                ),
+            ).to_string()
+
+        yield SSECompleteResponse(
+            key="result",
+            value={
+                "id": str(payload.id),
+                "updated": regenerated > 0,
+                "processed": processed,
+                "regenerated": regenerated,
+            },
+        ).to_string()
+
+    return StreamingResponse(inner(), media_type="text/event-stream")
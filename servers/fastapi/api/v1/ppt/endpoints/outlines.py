@@ -18,6 +18,8 @@ from models.sse_response import (
 )
 from services.temp_file_service import TEMP_FILE_SERVICE
 from services.database import get_async_session
+from services.document_context_service import DOCUMENT_CONTEXT_SERVICE
+from services.document_retrieval_service import DOCUMENT_RETRIEVAL_SERVICE
 from services.documents_loader import DocumentsLoader
 from utils.llm_calls.generate_presentation_outlines import generate_ppt_outline
 from utils.ppt_utils import get_presentation_title_from_outlines
@@ -45,9 +47,15 @@ async def stream_outlines(
         if presentation.file_paths:
             documents_loader = DocumentsLoader(file_paths=presentation.file_paths)
             await documents_loader.load_documents(temp_dir)
-            documents = documents_loader.documents
-            if documents:
-                additional_context = "\n\n".join(documents)
+            for message in documents_loader.get_error_messages():
+                yield SSEStatusResponse(status=message).to_string()
+            # Indexed for slide content while the outline is generated
+            DOCUMENT_RETRIEVAL_SERVICE.start_build(
+                presentation.id, documents_loader.documents
+            )
+            additional_context = await DOCUMENT_CONTEXT_SERVICE.build(
+                documents_loader.documents
+            )
 
         presentation_outlines_text = ""
 
@@ -67,12 +67,6 @@ async def process_pdf_slides(
                 pdf_content = await pdf_file.read()
                 f.write(pdf_content)
 
-            # Generate screenshots from PDF using ImageMagick
-            screenshot_paths = await DocumentsLoader.get_page_images_from_pdf_async(
-                pdf_path, temp_dir
-            )
-            print(f"Generated {len(screenshot_paths)} PDF screenshots")
-
             # Move screenshots to images directory and generate URLs
             images_dir = get_images_directory()
             presentation_id = uuid.uuid4()
@@ -81,9 +75,13 @@ async def process_pdf_slides(
 
             slides_data = []
 
-            for i, screenshot_path in enumerate(screenshot_paths, 1):
+            # Pages are rendered in parallel and moved as soon as each is ready
+            async for i, screenshot_path in DocumentsLoader.stream_page_images_from_pdf(
+                pdf_path, temp_dir
+            ):
                 # Move screenshot to permanent location
-                screenshot_filename = f"slide_{i}.png"
+                extension = os.path.splitext(screenshot_path)[1]
+                screenshot_filename = f"slide_{i}{extension}"
                 permanent_screenshot_path = os.path.join(
                     presentation_images_dir, screenshot_filename
                 )
@@ -104,11 +102,14 @@ async def process_pdf_slides(
                 slides_data.append(
                     PdfSlideData(slide_number=i, screenshot_url=screenshot_url)
                 )
+            print(f"Generated {len(slides_data)} PDF screenshots")
 
             return PdfSlidesResponse(
                 success=True, slides=slides_data, total_slides=len(slides_data)
             )
 
+        except HTTPException:
+            raise
         except Exception as e:
             print(f"Error processing PDF slides: {str(e)}")
             raise HTTPException(
@@ -13,6 +13,7 @@ import xml.etree.ElementTree as ET
 import re
 
 from services.documents_loader import DocumentsLoader
+from services.http_client_service import HTTP_CLIENT_SERVICE
 from utils.asset_directory_utils import get_images_directory
 import uuid
 from constants.documents import POWERPOINT_TYPES
@@ -229,11 +230,11 @@ async def check_google_font_availability(font_name: str) -> bool:
         formatted_name = font_name.replace(" ", "+")
         url = f"https://fonts.googleapis.com/css2?family={formatted_name}&display=swap"
 
-        async with aiohttp.ClientSession() as session:
-            async with session.head(
-                url, timeout=aiohttp.ClientTimeout(total=10)
-            ) as response:
-                return response.status == 200
+        session = HTTP_CLIENT_SERVICE.get_session()
+        async with session.head(
+            url, timeout=aiohttp.ClientTimeout(total=10)
+        ) as response:
+            return response.status == 200
 
     except Exception as e:
         print(f"Error checking Google Font availability for {font_name}: {e}")
@@ -338,31 +339,20 @@ async def process_pptx_slides(
             # Convert PPTX to PDF
             pdf_path = await _convert_pptx_to_pdf(pptx_path, temp_dir)
 
-            # Generate screenshots using LibreOffice
-            screenshot_paths = await DocumentsLoader.get_page_images_from_pdf_async(
-                pdf_path, temp_dir
-            )
-            print(f"Screenshot paths: {screenshot_paths}")
-
-            # Analyze fonts across all slides
-            font_analysis = await analyze_fonts_in_all_slides(slide_xmls)
-            print(
-                f"Font analysis completed: {len(font_analysis.internally_supported_fonts)} supported, {len(font_analysis.not_supported_fonts)} not supported"
-            )
-
             # Move screenshots to images directory and generate URLs
             images_dir = get_images_directory()
             presentation_id = uuid.uuid4()
             presentation_images_dir = os.path.join(images_dir, str(presentation_id))
             os.makedirs(presentation_images_dir, exist_ok=True)
 
-            slides_data = []
-
-            for i, (xml_content, screenshot_path) in enumerate(
-                zip(slide_xmls, screenshot_paths), 1
+            # Pages are rendered in parallel and moved as soon as each is ready
+            screenshot_urls = []
+            async for i, screenshot_path in DocumentsLoader.stream_page_images_from_pdf(
+                pdf_path, temp_dir
             ):
                 # Move screenshot to permanent location
-                screenshot_filename = f"slide_{i}.png"
+                extension = os.path.splitext(screenshot_path)[1]
+                screenshot_filename = f"slide_{i}{extension}"
                 permanent_screenshot_path = os.path.join(
                     presentation_images_dir, screenshot_filename
                 )
@@ -373,13 +363,25 @@ async def process_pptx_slides(
                 ):
                     # Use shutil.copy2 instead of os.rename to handle cross-device moves
                     shutil.copy2(screenshot_path, permanent_screenshot_path)
-                    screenshot_url = (
+                    screenshot_urls.append(
                         f"/app_data/images/{presentation_id}/{screenshot_filename}"
                     )
                 else:
                     # Fallback if screenshot generation failed or file is empty placeholder
-                    screenshot_url = "/static/images/placeholder.jpg"
+                    screenshot_urls.append("/static/images/placeholder.jpg")
+            print(f"Generated {len(screenshot_urls)} slide screenshots")
+
+            # Analyze fonts across all slides
+            font_analysis = await analyze_fonts_in_all_slides(slide_xmls)
+            print(
+                f"Font analysis completed: {len(font_analysis.internally_supported_fonts)} supported, {len(font_analysis.not_supported_fonts)} not supported"
+            )
 
+            slides_data = []
+
+            for i, (xml_content, screenshot_url) in enumerate(
+                zip(slide_xmls, screenshot_urls), 1
+            ):
                 # Compute normalized fonts for this slide
                 raw_slide_fonts = extract_fonts_from_oxml(xml_content)
                 normalized_fonts = sorted(
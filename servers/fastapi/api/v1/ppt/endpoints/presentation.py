@@ -36,6 +36,8 @@ from models.presentation_with_slides import (
 )
 from models.sql.template import TemplateModel
 
+from services.document_context_service import DOCUMENT_CONTEXT_SERVICE
+from services.document_retrieval_service import DOCUMENT_RETRIEVAL_SERVICE
 from services.documents_loader import DocumentsLoader
 from services.webhook_service import WebhookService
 from utils.get_layout_by_name import get_layout_by_name
@@ -301,6 +303,9 @@ async def stream_presentation(
         structure = presentation.get_structure()
         layout = presentation.get_layout()
         outline = presentation.get_presentation_outline()
+        document_index = await DOCUMENT_RETRIEVAL_SERVICE.get_index(
+            presentation.id, presentation.file_paths
+        )
 
         # These tasks will be gathered and awaited after all slides are generated
         async_assets_generation_tasks = []
@@ -313,6 +318,10 @@ async def stream_presentation(
         for i, slide_layout_index in enumerate(structure.slides):
             slide_layout = layout.slides[slide_layout_index]
 
+            document_excerpts = await DOCUMENT_RETRIEVAL_SERVICE.retrieve(
+                document_index, outline.slides[i].content
+            )
+
             try:
                 slide_content = await get_slide_content_from_type_and_outline(
                     slide_layout,
@@ -321,6 +330,7 @@ async def stream_presentation(
                     presentation.tone,
                     presentation.verbosity,
                     presentation.instructions,
+                    document_excerpts,
                 )
             except HTTPException as e:
                 yield SSEErrorResponse(detail=e.detail).to_string()
@@ -543,6 +553,7 @@ async def generate_presentation_handler(
     try:
         # --- Start of Original Logic ---
         using_slides_markdown = False
+        warnings = []
 
         if request.slides_markdown:
             using_slides_markdown = True
@@ -560,9 +571,15 @@ async def generate_presentation_handler(
             if request.files:
                 documents_loader = DocumentsLoader(file_paths=request.files)
                 await documents_loader.load_documents()
-                documents = documents_loader.documents
-                if documents:
-                    additional_context = "\n\n".join(documents)
+                warnings = documents_loader.get_error_messages()
+                for warning in warnings:
+                    print(warning)
+                DOCUMENT_RETRIEVAL_SERVICE.start_build(
+                    presentation_id, documents_loader.documents
+                )
+                additional_context = await DOCUMENT_CONTEXT_SERVICE.build(
+                    documents_loader.documents
+                )
 
             n_slides_to_generate = request.n_slides
             if request.include_table_of_contents:
@@ -700,6 +717,7 @@ async def generate_presentation_handler(
         # NOTE: You may need to modify your ImageGenerationService class to accept this `temp_dir` argument.
         image_generation_service = ImageGenerationService(get_images_directory(), temp_dir=temp_dir)
         async_assets_generation_tasks = []
+        document_index = await DOCUMENT_RETRIEVAL_SERVICE.get_index(presentation_id)
 
         slides: List[SlideModel] = []
         slide_layout_indices = presentation_structure.slides
@@ -709,6 +727,14 @@ async def generate_presentation_handler(
             end = min(start + batch_size, len(slide_layouts))
             print(f"Generating slides from {start} to {end}")
 
+            batch_excerpts = await asyncio.gather(
+                *[
+                    DOCUMENT_RETRIEVAL_SERVICE.retrieve(
+                        document_index, presentation_outlines.slides[i].content
+                    )
+                    for i in range(start, end)
+                ]
+            )
             content_tasks = [
                 get_slide_content_from_type_and_outline(
                     slide_layouts[i],
@@ -717,6 +743,7 @@ async def generate_presentation_handler(
                     request.tone.value,
                     request.verbosity.value,
                     request.instructions,
+                    batch_excerpts[i - start],
                 )
                 for i in range(start, end)
             ]
@@ -775,6 +802,7 @@ async def generate_presentation_handler(
         response = PresentationPathAndEditPath(
             **presentation_and_path.model_dump(),
             edit_path=f"/presentation?id={presentation_id}",
+            warnings=warnings,
         )
 
         if async_status:
@@ -0,0 +1,77 @@
+import argparse
+import random
+from typing import List
+
+from PIL import Image
+
+from benchmarks.timing import measure, print_results, save_results
+from models.pptx_models import PptxObjectFitEnum, PptxObjectFitModel
+from utils.image_utils import (
+    create_circle_image,
+    fit_image,
+    invert_image,
+    round_image_corners,
+    set_image_opacity,
+)
+
+
+def create_synthetic_image(width: int, height: int, seed: int = 0) -> Image.Image:
+    """Noisy RGBA image so resampling and encoders can't shortcut flat colors."""
+    random.seed(seed)
+    return Image.frombytes(
+        "RGBA", (width, height), random.randbytes(width * height * 4)
+    )
+
+
+def run_benchmarks(sizes: List[int], repeat: int) -> List[dict]:
+    results = []
+    for size in sizes:
+        # Stock photos are usually landscape, layouts usually ask for smaller boxes
+        width, height = size, int(size * 2 / 3)
+        image = create_synthetic_image(width, height)
+        box_width, box_height = 400, 300
+
+        cases = {
+            "round_image_corners": lambda: round_image_corners(
+                image, [24, 24, 24, 24]
+            ),
+            "fit_image_cover": lambda: fit_image(
+                image,
+                box_width,
+                box_height,
+                PptxObjectFitModel(fit=PptxObjectFitEnum.COVER),
+            ),
+            "fit_image_contain": lambda: fit_image(
+                image,
+                box_width,
+                box_height,
+                PptxObjectFitModel(fit=PptxObjectFitEnum.CONTAIN),
+            ),
+            "invert_image": lambda: invert_image(image),
+            "set_image_opacity": lambda: set_image_opacity(image, 0.5),
+            "create_circle_image": lambda: create_circle_image(image),
+        }
+        for name, func in cases.items():
+            results.append(
+                measure(name, func, repeat=repeat, width=width, height=height)
+            )
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark utils/image_utils")
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[256, 1024, 2048],
+        help="Image widths to benchmark, height is 2/3 of the width",
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", type=str, help="Save results as JSON")
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.sizes, args.repeat)
+    print_results(results)
+    if args.output:
+        save_results(results, args.output)
@@ -0,0 +1,185 @@
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+from typing import List
+
+from pptx.enum.shapes import MSO_AUTO_SHAPE_TYPE
+
+from benchmarks.bench_image_utils import create_synthetic_image
+from benchmarks.timing import measure, print_results, save_results
+from models.pptx_models import (
+    PptxAutoShapeBoxModel,
+    PptxBoxShapeEnum,
+    PptxConnectorModel,
+    PptxFillModel,
+    PptxFontModel,
+    PptxObjectFitEnum,
+    PptxObjectFitModel,
+    PptxParagraphModel,
+    PptxPictureBoxModel,
+    PptxPictureModel,
+    PptxPositionModel,
+    PptxPresentationModel,
+    PptxShadowModel,
+    PptxSlideModel,
+    PptxStrokeModel,
+    PptxTextBoxModel,
+)
+from services.pptx_presentation_creator import PptxPresentationCreator
+
+
+def create_synthetic_images(directory: str, sizes: List[int]) -> List[str]:
+    image_paths = []
+    for index, size in enumerate(sizes):
+        image_path = os.path.join(directory, f"source_{size}.png")
+        create_synthetic_image(size, int(size * 2 / 3), seed=index).save(image_path)
+        image_paths.append(image_path)
+    return image_paths
+
+
+def get_picture_variants(image_path: str) -> List[PptxPictureBoxModel]:
+    picture = PptxPictureModel(is_network=False, path=image_path)
+    position = PptxPositionModel(left=760, top=120, width=440, height=330)
+    return [
+        PptxPictureBoxModel(position=position, picture=picture, clip=False),
+        PptxPictureBoxModel(
+            position=position,
+            picture=picture,
+            border_radius=[16, 16, 16, 16],
+            object_fit=PptxObjectFitModel(fit=PptxObjectFitEnum.COVER),
+        ),
+        PptxPictureBoxModel(
+            position=position,
+            picture=picture,
+            object_fit=PptxObjectFitModel(fit=PptxObjectFitEnum.CONTAIN),
+            opacity=0.6,
+        ),
+        PptxPictureBoxModel(
+            position=PptxPositionModel(left=80, top=500, width=120, height=120),
+            picture=picture,
+            shape=PptxBoxShapeEnum.CIRCLE,
+            invert=True,
+        ),
+    ]
+
+
+def create_synthetic_presentation(
+    n_slides: int, image_paths: List[str], seed: int = 0
+) -> PptxPresentationModel:
+    """
+    Builds a deck that mixes text boxes, autoshapes with shadows, connectors
+    and pictures with every transform handled by add_picture.
+    """
+    rng = random.Random(seed)
+    font = PptxFontModel(name="Inter", size=18, color="1F2937")
+    slides = []
+    for index in range(n_slides):
+        picture_variants = get_picture_variants(image_paths[index % len(image_paths)])
+        shapes = [
+            PptxTextBoxModel(
+                position=PptxPositionModel.for_textbox(80, 60, 640),
+                paragraphs=[
+                    PptxParagraphModel(
+                        font=PptxFontModel(size=36, font_weight=700),
+                        text=f"Slide {index + 1} title",
+                    ),
+                    PptxParagraphModel(
+                        font=font,
+                        text="Body with <b>bold</b>, <i>italic</i> and plain text "
+                        * rng.randint(1, 4),
+                    ),
+                ],
+            ),
+            PptxAutoShapeBoxModel(
+                type=MSO_AUTO_SHAPE_TYPE.ROUNDED_RECTANGLE,
+                position=PptxPositionModel(left=80, top=240, width=600, height=200),
+                fill=PptxFillModel(color="F3F4F6", opacity=0.9),
+                stroke=PptxStrokeModel(color="D1D5DB", thickness=1),
+                shadow=PptxShadowModel(radius=12, offset=4, opacity=0.25, angle=90),
+                border_radius=12,
+                paragraphs=[PptxParagraphModel(font=font, text="Card content")],
+            ),
+            PptxConnectorModel(
+                position=PptxPositionModel(left=80, top=470, width=600, height=0),
+                thickness=1.5,
+                color="9CA3AF",
+            ),
+            picture_variants[index % len(picture_variants)],
+        ]
+        slides.append(
+            PptxSlideModel(
+                background=PptxFillModel(color="FFFFFF"),
+                note=f"Speaker note {index + 1}",
+                shapes=shapes,
+            )
+        )
+    return PptxPresentationModel(name="benchmark", slides=slides)
+
+
+def run_benchmarks(
+    slide_counts: List[int], image_sizes: List[int], repeat: int
+) -> List[dict]:
+    results = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        image_paths = create_synthetic_images(temp_dir, image_sizes)
+        pptx_path = os.path.join(temp_dir, "benchmark.pptx")
+
+        for n_slides in slide_counts:
+
+            def get_creator():
+                model = create_synthetic_presentation(n_slides, image_paths)
+                return PptxPresentationCreator(model, temp_dir)
+
+            def get_created_ppt():
+                creator = get_creator()
+                asyncio.run(creator.create_ppt())
+                return creator
+
+            results.append(
+                measure(
+                    "create_ppt",
+                    lambda creator: asyncio.run(creator.create_ppt()),
+                    repeat=repeat,
+                    setup=get_creator,
+                    slides=n_slides,
+                )
+            )
+            results.append(
+                measure(
+                    "save",
+                    lambda creator: creator.save(pptx_path),
+                    repeat=repeat,
+                    setup=get_created_ppt,
+                    slides=n_slides,
+                )
+            )
+            results[-1]["file_size_mb"] = round(
+                os.path.getsize(pptx_path) / (1024 * 1024), 2
+            )
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark PptxPresentationCreator on synthetic decks"
+    )
+    parser.add_argument(
+        "--slides", type=int, nargs="+", default=[10, 100, 500], help="Deck sizes"
+    )
+    parser.add_argument(
+        "--image-sizes",
+        type=int,
+        nargs="+",
+        default=[640, 1920],
+        help="Widths of the source images used by picture shapes",
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", type=str, help="Save results as JSON")
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.slides, args.image_sizes, args.repeat)
+    print_results(results)
+    if args.output:
+        save_results(results, args.output)
@@ -0,0 +1,88 @@
+import argparse
+import asyncio
+import random
+from typing import List
+
+from benchmarks.timing import measure, print_results, save_results
+from services.score_based_chunker import ScoreBasedChunker
+
+
+WORDS = (
+    "revenue growth market customer analysis quarter strategy product "
+    "team operations risk forecast region margin cost pipeline"
+).split()
+
+
+def create_synthetic_markdown(size_mb: float, seed: int = 0) -> str:
+    """Docling-like markdown: nested headings, paragraphs, lists and tables."""
+    rng = random.Random(seed)
+    target = int(size_mb * 1024 * 1024)
+    parts = []
+    size = 0
+    section = 0
+    while size < target:
+        section += 1
+        level = rng.choice([1, 2, 2, 3, 3, 3, 4])
+        block = [f"{'#' * level} Section {section} {rng.choice(WORDS).title()}", ""]
+        for _ in range(rng.randint(2, 6)):
+            kind = rng.random()
+            if kind < 0.6:
+                block.append(" ".join(rng.choices(WORDS, k=rng.randint(30, 90))))
+            elif kind < 0.8:
+                block.extend(
+                    f"- {' '.join(rng.choices(WORDS, k=8))}"
+                    for _ in range(rng.randint(3, 8))
+                )
+            else:
+                block.append("| Metric | Q1 | Q2 | Q3 |")
+                block.append("|---|---|---|---|")
+                block.extend(
+                    f"| {rng.choice(WORDS)} | {rng.randint(1, 999)} | "
+                    f"{rng.randint(1, 999)} | {rng.randint(1, 999)} |"
+                    for _ in range(rng.randint(3, 12))
+                )
+            block.append("")
+        text = "\n".join(block)
+        parts.append(text)
+        size += len(text) + 1
+    return "\n".join(parts)
+
+
+def run_benchmarks(sizes: List[float], n_chunks: int, repeat: int) -> List[dict]:
+    chunker = ScoreBasedChunker()
+    results = []
+    for size_mb in sizes:
+        text = create_synthetic_markdown(size_mb)
+        n_headings = len(chunker.extract_headings(text))
+        results.append(
+            measure(
+                "get_n_chunks",
+                lambda: asyncio.run(chunker.get_n_chunks(text, n_chunks)),
+                repeat=repeat,
+                size_mb=size_mb,
+                headings=n_headings,
+            )
+        )
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark services/score_based_chunker"
+    )
+    parser.add_argument(
+        "--sizes",
+        type=float,
+        nargs="+",
+        default=[0.5, 2, 8],
+        help="Sizes of the synthetic markdown in MB",
+    )
+    parser.add_argument("--chunks", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", type=str, help="Save results as JSON")
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.sizes, args.chunks, args.repeat)
+    print_results(results)
+    if args.output:
+        save_results(results, args.output)
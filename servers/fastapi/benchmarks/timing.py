@@ -0,0 +1,86 @@
+import gc
+import json
+import resource
+import statistics
+import time
+import tracemalloc
+from typing import Any, Callable, List, Optional
+
+
+def measure(
+    name: str,
+    func: Callable[[], Any],
+    repeat: int = 5,
+    warmup: int = 1,
+    setup: Optional[Callable[[], Any]] = None,
+    **params,
+) -> dict:
+    """
+    Runs `func` `repeat` times and returns wall time statistics, the peak
+    memory allocated through Python during a single run and the process max RSS.
+    Max RSS also covers native buffers (PIL images, lxml trees) but never decreases,
+    so run heavy benchmarks last or in their own process.
+    If `setup` is provided, it runs untimed before every call and its result
+    is passed to `func`.
+    """
+
+    def run_once() -> float:
+        args = (setup(),) if setup else ()
+        gc.collect()
+        start = time.perf_counter()
+        func(*args)
+        return (time.perf_counter() - start) * 1000
+
+    for _ in range(warmup):
+        run_once()
+
+    timings: List[float] = [run_once() for _ in range(repeat)]
+
+    tracemalloc.start()
+    run_once()
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "name": name,
+        **params,
+        "repeat": repeat,
+        "min_ms": min(timings),
+        "mean_ms": statistics.mean(timings),
+        "stdev_ms": statistics.stdev(timings) if len(timings) > 1 else 0.0,
+        "peak_memory_mb": peak_memory / (1024 * 1024),
+        "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+
+RESULT_KEYS = (
+    "name",
+    "repeat",
+    "min_ms",
+    "mean_ms",
+    "stdev_ms",
+    "peak_memory_mb",
+    "max_rss_mb",
+)
+
+
+def print_results(results: List[dict]):
+    for result in results:
+        params = ", ".join(
+            f"{key}={value}"
+            for key, value in result.items()
+            if key
+            not in RESULT_KEYS
+        )
+        print(
+            f"{result['name']:<28} {params:<36} "
+            f"min {result['min_ms']:>10.2f} ms  "
+            f"mean {result['mean_ms']:>10.2f} ms  "
+            f"peak {result['peak_memory_mb']:>8.2f} MB  "
+            f"rss {result['max_rss_mb']:>8.2f} MB"
+        )
+
+
+def save_results(results: List[dict], path: str):
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2)
@@ -0,0 +1,19 @@
+import argparse
+import json
+
+from services.icon_finder_service import ICON_FINDER_SERVICE
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Build the icon search index (run from servers/fastapi)"
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Rebuild even if the index matches assets/icons.json and the model",
+    )
+    args = parser.parse_args()
+
+    index = ICON_FINDER_SERVICE.build_numpy_index(force=args.force)
+    print(json.dumps(index.get_manifest(), indent=2))
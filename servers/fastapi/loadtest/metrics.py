@@ -0,0 +1,150 @@
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel
+
+
+class Sample(BaseModel):
+    stage: int
+    name: str
+    latency_ms: float
+    ok: bool
+    error: Optional[str] = None
+
+
+class StageInfo(BaseModel):
+    offered_rate: float
+    duration: float
+    started: int = 0
+    dropped: int = 0
+
+
+def percentile(values: List[float], p: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    index = min(len(values) - 1, int(round(p * (len(values) - 1))))
+    return values[index]
+
+
+class MetricsRecorder:
+    """Collects per-request samples and summarizes them per arrival-rate stage."""
+
+    def __init__(self):
+        self.samples: List[Sample] = []
+        self.stages: List[StageInfo] = []
+
+    def start_stage(self, offered_rate: float, duration: float) -> int:
+        self.stages.append(StageInfo(offered_rate=offered_rate, duration=duration))
+        return len(self.stages) - 1
+
+    def record(
+        self,
+        stage: int,
+        name: str,
+        latency_ms: float,
+        ok: bool,
+        error: Optional[str] = None,
+    ):
+        self.samples.append(
+            Sample(stage=stage, name=name, latency_ms=latency_ms, ok=ok, error=error)
+        )
+
+    def summarize_stage(self, stage: int) -> dict:
+        info = self.stages[stage]
+        by_name: Dict[str, List[Sample]] = defaultdict(list)
+        for sample in self.samples:
+            if sample.stage == stage:
+                by_name[sample.name].append(sample)
+
+        steps = {}
+        for name, samples in sorted(by_name.items()):
+            latencies = [each.latency_ms for each in samples if each.ok]
+            errors: Dict[str, int] = defaultdict(int)
+            for each in samples:
+                if not each.ok:
+                    errors[each.error or "unknown"] += 1
+            steps[name] = {
+                "count": len(samples),
+                "error_rate": sum(errors.values()) / len(samples),
+                "p50_ms": percentile(latencies, 0.5),
+                "p95_ms": percentile(latencies, 0.95),
+                "p99_ms": percentile(latencies, 0.99),
+                "errors": dict(errors),
+            }
+
+        flows = by_name.get("flow", [])
+        completed = sum(1 for each in flows if each.ok)
+        return {
+            "stage": stage,
+            "offered_rate": info.offered_rate,
+            "duration": info.duration,
+            "started": info.started,
+            "dropped": info.dropped,
+            "completed": completed,
+            "failed": len(flows) - completed,
+            "achieved_rate": completed / info.duration if info.duration else 0.0,
+            "steps": steps,
+        }
+
+    def summarize(self, latency_slo_ms: float, max_error_rate: float) -> dict:
+        """
+        A stage is saturated when flows are dropped client-side, when the flow
+        error rate exceeds `max_error_rate` or when the flow p95 exceeds `latency_slo_ms`.
+        """
+        stages = [self.summarize_stage(index) for index in range(len(self.stages))]
+        saturation_stage = None
+        for each in stages:
+            flow = each["steps"].get("flow")
+            reasons = []
+            if each["dropped"]:
+                reasons.append("dropped")
+            if flow and flow["error_rate"] > max_error_rate:
+                reasons.append("error_rate")
+            if flow and flow["p95_ms"] > latency_slo_ms:
+                reasons.append("latency")
+            each["saturated"] = reasons
+            if reasons and saturation_stage is None:
+                saturation_stage = each["stage"]
+
+        return {
+            "stages": stages,
+            "saturation_stage": saturation_stage,
+            "saturation_rate": (
+                stages[saturation_stage]["offered_rate"]
+                if saturation_stage is not None
+                else None
+            ),
+            "latency_slo_ms": latency_slo_ms,
+            "max_error_rate": max_error_rate,
+        }
+
+
+def print_summary(summary: dict):
+    for stage in summary["stages"]:
+        print(
+            f"\nStage {stage['stage']}: offered {stage['offered_rate']}/s, "
+            f"started {stage['started']}, completed {stage['completed']}, "
+            f"failed {stage['failed']}, dropped {stage['dropped']}, "
+            f"achieved {stage['achieved_rate']:.2f}/s"
+            + (
+                f" [saturated: {', '.join(stage['saturated'])}]"
+                if stage["saturated"]
+                else ""
+            )
+        )
+        for name, step in stage["steps"].items():
+            print(
+                f"  {name:<22} n={step['count']:<5} "
+                f"err={step['error_rate'] * 100:>5.1f}%  "
+                f"p50={step['p50_ms']:>9.0f} ms  "
+                f"p95={step['p95_ms']:>9.0f} ms  "
+                f"p99={step['p99_ms']:>9.0f} ms"
+            )
+            for error, count in step["errors"].items():
+                print(f"    {count} x {error}")
+
+    if summary["saturation_rate"] is None:
+        print("\nNo saturation detected at the tested arrival rates")
+    else:
+        print(f"\nSaturation reached at {summary['saturation_rate']} flows/s")
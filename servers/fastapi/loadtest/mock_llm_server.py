@@ -0,0 +1,167 @@
+import argparse
+import asyncio
+import json
+import time
+import uuid
+from typing import Any, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+import uvicorn
+
+LOREM = (
+    "Lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod "
+    "tempor incididunt ut labore et dolore magna aliqua "
+)
+
+
+class MockLLMSettings:
+    model = "mock"
+    latency_ms = 500
+    stream_chunks = 20
+    chunk_interval_ms = 25
+
+
+SETTINGS = MockLLMSettings()
+
+app = FastAPI()
+
+
+def _resolve_ref(ref: str, root: dict) -> dict:
+    node: Any = root
+    for part in ref.lstrip("#/").split("/"):
+        node = node[part]
+    return node
+
+
+def _get_text(min_length: int, max_length: Optional[int]) -> str:
+    length = max(min_length, min(max_length or 40, 40))
+    return (LOREM * (length // len(LOREM) + 1))[:length].strip().ljust(length, ".")
+
+
+def sample_from_schema(schema: dict, root: Optional[dict] = None) -> Any:
+    """Builds the smallest value that satisfies the common JSON schema keywords."""
+    root = root or schema
+
+    if "$ref" in schema:
+        return sample_from_schema(_resolve_ref(schema["$ref"], root), root)
+    for key in ("anyOf", "oneOf", "allOf"):
+        if key in schema:
+            options = [each for each in schema[key] if each.get("type") != "null"]
+            return sample_from_schema(options[0] if options else {}, root)
+    if "const" in schema:
+        return schema["const"]
+    if "enum" in schema:
+        return schema["enum"][0]
+
+    schema_type = schema.get("type")
+    if isinstance(schema_type, list):
+        schema_type = next((each for each in schema_type if each != "null"), None)
+
+    if schema_type == "object" or "properties" in schema:
+        return {
+            key: sample_from_schema(value, root)
+            for key, value in schema.get("properties", {}).items()
+        }
+    if schema_type == "array":
+        n_items = max(schema.get("minItems", 1), 1)
+        if "maxItems" in schema:
+            n_items = min(n_items, schema["maxItems"])
+        return [sample_from_schema(schema.get("items", {}), root) for _ in range(n_items)]
+    if schema_type == "string":
+        return _get_text(schema.get("minLength", 0), schema.get("maxLength"))
+    if schema_type == "integer":
+        return schema.get("minimum", 0)
+    if schema_type == "number":
+        return float(schema.get("minimum", 0))
+    if schema_type == "boolean":
+        return True
+    return None
+
+
+def get_response_content(body: dict) -> str:
+    response_format = body.get("response_format") or {}
+    schema = (response_format.get("json_schema") or {}).get("schema")
+    if schema:
+        return json.dumps(sample_from_schema(schema))
+    return "Mock response"
+
+
+def get_completion_chunk(completion_id: str, delta: dict, finish_reason=None) -> str:
+    chunk = {
+        "id": completion_id,
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": SETTINGS.model,
+        "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+    }
+    return f"data: {json.dumps(chunk)}\n\n"
+
+
+@app.get("/v1/models")
+async def list_models():
+    return {
+        "object": "list",
+        "data": [{"id": SETTINGS.model, "object": "model", "owned_by": "mock"}],
+    }
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    content = get_response_content(body)
+    completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+
+    await asyncio.sleep(SETTINGS.latency_ms / 1000)
+
+    if not body.get("stream"):
+        return {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": SETTINGS.model,
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": "stop",
+                }
+            ],
+            "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+        }
+
+    async def inner():
+        chunk_size = max(1, len(content) // SETTINGS.stream_chunks)
+        yield get_completion_chunk(completion_id, {"role": "assistant"})
+        for start in range(0, len(content), chunk_size):
+            await asyncio.sleep(SETTINGS.chunk_interval_ms / 1000)
+            yield get_completion_chunk(
+                completion_id, {"content": content[start : start + chunk_size]}
+            )
+        yield get_completion_chunk(completion_id, {}, finish_reason="stop")
+        yield "data: [DONE]\n\n"
+
+    return StreamingResponse(inner(), media_type="text/event-stream")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="OpenAI compatible mock LLM that answers with schema valid JSON"
+    )
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--model", type=str, default=SETTINGS.model)
+    parser.add_argument(
+        "--latency-ms", type=int, default=SETTINGS.latency_ms, help="Time to first token"
+    )
+    parser.add_argument("--stream-chunks", type=int, default=SETTINGS.stream_chunks)
+    parser.add_argument(
+        "--chunk-interval-ms", type=int, default=SETTINGS.chunk_interval_ms
+    )
+    args = parser.parse_args()
+
+    SETTINGS.model = args.model
+    SETTINGS.latency_ms = args.latency_ms
+    SETTINGS.stream_chunks = args.stream_chunks
+    SETTINGS.chunk_interval_ms = args.chunk_interval_ms
+
+    uvicorn.run(app, host="0.0.0.0", port=args.port, log_level="warning")
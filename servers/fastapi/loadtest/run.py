@@ -0,0 +1,167 @@
+import argparse
+import asyncio
+import json
+import random
+import time
+from typing import Dict, List, Optional, Set
+
+import httpx
+
+from loadtest.metrics import MetricsRecorder, print_summary
+from loadtest.scenarios import SCENARIOS, ScenarioContext, load_layout, parse_mix
+
+
+async def run_flow(scenario: str, ctx: ScenarioContext):
+    start = time.perf_counter()
+    try:
+        await SCENARIOS[scenario](ctx)
+        ok, error = True, None
+    except Exception as e:
+        ok = False
+        error = f"{scenario}: {str(e) or type(e).__name__}"
+    latency_ms = (time.perf_counter() - start) * 1000
+    ctx.recorder.record(ctx.stage, "flow", latency_ms, ok, error)
+    ctx.recorder.record(ctx.stage, f"flow:{scenario}", latency_ms, ok, error)
+
+
+async def run_load_test(
+    base_url: str,
+    rates: List[float],
+    stage_duration: float,
+    mix: Dict[str, float],
+    max_in_flight: int,
+    drain_timeout: float,
+    request_timeout: float,
+    n_slides: int,
+    template: str,
+    layout: dict,
+    poll_interval: float,
+    admin_token: Optional[str],
+    seed: int,
+) -> MetricsRecorder:
+    """
+    Open-loop load test: flows arrive as a Poisson process at each rate in
+    `rates` for `stage_duration` seconds, regardless of how fast the server
+    answers. Arrivals beyond `max_in_flight` are dropped and counted.
+    """
+    random.seed(seed)
+    recorder = MetricsRecorder()
+    scenarios = list(mix.keys())
+    weights = list(mix.values())
+    in_flight: Set[asyncio.Task] = set()
+
+    headers = {"X-Admin-Token": admin_token} if admin_token else None
+    limits = httpx.Limits(max_connections=max_in_flight * 2)
+    async with httpx.AsyncClient(
+        base_url=base_url,
+        timeout=request_timeout,
+        limits=limits,
+        headers=headers,
+    ) as client:
+        for rate in rates:
+            stage = recorder.start_stage(rate, stage_duration)
+            print(f"Stage {stage}: {rate} flows/s for {stage_duration}s")
+            stage_end = time.monotonic() + stage_duration
+            while True:
+                await asyncio.sleep(random.expovariate(rate))
+                if time.monotonic() >= stage_end:
+                    break
+                if len(in_flight) >= max_in_flight:
+                    recorder.stages[stage].dropped += 1
+                    continue
+                recorder.stages[stage].started += 1
+                ctx = ScenarioContext(
+                    client,
+                    recorder,
+                    stage,
+                    n_slides,
+                    template,
+                    layout,
+                    poll_interval,
+                    request_timeout,
+                )
+                scenario = random.choices(scenarios, weights)[0]
+                task = asyncio.create_task(run_flow(scenario, ctx))
+                in_flight.add(task)
+                task.add_done_callback(in_flight.discard)
+
+        if in_flight:
+            print(f"Waiting up to {drain_timeout}s for {len(in_flight)} flows")
+            _, pending = await asyncio.wait(in_flight, timeout=drain_timeout)
+            for task in pending:
+                task.cancel()
+
+    return recorder
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Replay a mix of API flows against a running server"
+    )
+    parser.add_argument("--base-url", type=str, default="http://localhost:5000")
+    parser.add_argument(
+        "--rates",
+        type=float,
+        nargs="+",
+        default=[0.1, 0.2, 0.5, 1, 2],
+        help="Flow arrival rates per second, one stage per rate",
+    )
+    parser.add_argument(
+        "--stage-duration", type=float, default=60, help="Seconds per stage"
+    )
+    parser.add_argument(
+        "--mix",
+        type=str,
+        default="interactive=2,async_generate=1,image_search=5",
+        help=f"Scenario weights. Available: {', '.join(SCENARIOS)}",
+    )
+    parser.add_argument("--max-in-flight", type=int, default=200)
+    parser.add_argument("--drain-timeout", type=float, default=300)
+    parser.add_argument("--request-timeout", type=float, default=600)
+    parser.add_argument("--n-slides", type=int, default=5)
+    parser.add_argument("--template", type=str, default="general")
+    parser.add_argument(
+        "--layout-file",
+        type=str,
+        help="Layout JSON used for /prepare, defaults to a small built-in layout",
+    )
+    parser.add_argument("--poll-interval", type=float, default=2)
+    parser.add_argument(
+        "--latency-slo-ms",
+        type=float,
+        default=120000,
+        help="Flow p95 above this marks a stage as saturated",
+    )
+    parser.add_argument(
+        "--max-error-rate",
+        type=float,
+        default=0.05,
+        help="Flow error rate above this marks a stage as saturated",
+    )
+    parser.add_argument("--admin-token", type=str, help="Sent as X-Admin-Token")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=str, help="Save summary as JSON")
+    args = parser.parse_args()
+
+    recorder = asyncio.run(
+        run_load_test(
+            base_url=args.base_url,
+            rates=args.rates,
+            stage_duration=args.stage_duration,
+            mix=parse_mix(args.mix),
+            max_in_flight=args.max_in_flight,
+            drain_timeout=args.drain_timeout,
+            request_timeout=args.request_timeout,
+            n_slides=args.n_slides,
+            template=args.template,
+            layout=load_layout(args.layout_file),
+            poll_interval=args.poll_interval,
+            admin_token=args.admin_token,
+            seed=args.seed,
+        )
+    )
+    summary = recorder.summarize(args.latency_slo_ms, args.max_error_rate)
+    print_summary(summary)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(summary, f, indent=2)
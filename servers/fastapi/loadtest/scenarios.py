@@ -0,0 +1,275 @@
+import asyncio
+import json
+import random
+import time
+from typing import Awaitable, Callable, Dict, Optional
+
+import httpx
+
+from loadtest.metrics import MetricsRecorder
+
+
+PROMPTS = [
+    "Quarterly sales review for a regional retail chain",
+    "Introduction to renewable energy storage",
+    "Onboarding plan for new engineering hires",
+    "Market analysis of electric scooters in Europe",
+    "Cybersecurity awareness training for employees",
+    "Product roadmap for a mobile banking app",
+]
+
+IMAGE_QUERIES = ["team meeting", "city skyline", "solar panels", "growth chart"]
+ICON_QUERIES = ["growth", "team", "analytics", "security", "money", "time"]
+
+# Unordered layout, so /prepare exercises the structure call as the web app does
+DEFAULT_LAYOUT = {
+    "name": "loadtest",
+    "ordered": False,
+    "slides": [
+        {
+            "id": "loadtest:title",
+            "name": "Title",
+            "description": "Title slide with a short subtitle",
+            "json_schema": {
+                "type": "object",
+                "properties": {
+                    "title": {"type": "string", "minLength": 10, "maxLength": 60},
+                    "subtitle": {"type": "string", "minLength": 10, "maxLength": 120},
+                },
+                "required": ["title", "subtitle"],
+            },
+        },
+        {
+            "id": "loadtest:image-and-text",
+            "name": "Image and text",
+            "description": "Heading, paragraph, an image and an icon",
+            "json_schema": {
+                "type": "object",
+                "properties": {
+                    "heading": {"type": "string", "minLength": 10, "maxLength": 60},
+                    "body": {"type": "string", "minLength": 50, "maxLength": 300},
+                    "image": {
+                        "type": "object",
+                        "properties": {
+                            "__image_url__": {"type": "string"},
+                            "__image_prompt__": {
+                                "type": "string",
+                                "minLength": 10,
+                                "maxLength": 50,
+                            },
+                        },
+                        "required": ["__image_prompt__"],
+                    },
+                    "icon": {
+                        "type": "object",
+                        "properties": {
+                            "__icon_url__": {"type": "string"},
+                            "__icon_query__": {
+                                "type": "string",
+                                "minLength": 3,
+                                "maxLength": 20,
+                            },
+                        },
+                        "required": ["__icon_query__"],
+                    },
+                },
+                "required": ["heading", "body", "image", "icon"],
+            },
+        },
+    ],
+}
+
+
+class StepError(Exception):
+    pass
+
+
+class ScenarioContext:
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        recorder: MetricsRecorder,
+        stage: int,
+        n_slides: int,
+        template: str,
+        layout: dict,
+        poll_interval: float,
+        poll_timeout: float,
+    ):
+        self.client = client
+        self.recorder = recorder
+        self.stage = stage
+        self.n_slides = n_slides
+        self.template = template
+        self.layout = layout
+        self.poll_interval = poll_interval
+        self.poll_timeout = poll_timeout
+
+    async def request(self, name: str, method: str, url: str, **kwargs) -> dict:
+        start = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+            if response.status_code >= 400:
+                raise StepError(f"HTTP {response.status_code}")
+            data = response.json() if response.content else {}
+        except Exception as e:
+            self._record_error(name, start, e)
+            raise
+        self.recorder.record(self.stage, name, self._elapsed_ms(start), True)
+        return data
+
+    async def sse(self, name: str, url: str, complete_key: str) -> dict:
+        """Consumes an SSE endpoint and returns the value of its complete event."""
+        start = time.perf_counter()
+        try:
+            async with self.client.stream("GET", url) as response:
+                if response.status_code >= 400:
+                    raise StepError(f"HTTP {response.status_code}")
+                async for line in response.aiter_lines():
+                    if not line.startswith("data: "):
+                        continue
+                    event = json.loads(line[len("data: ") :])
+                    if event.get("type") == "error":
+                        raise StepError(f"SSE error: {event.get('detail')}")
+                    if event.get("type") == "complete":
+                        result = event[complete_key]
+                        break
+                else:
+                    raise StepError("SSE ended without complete event")
+        except Exception as e:
+            self._record_error(name, start, e)
+            raise
+        self.recorder.record(self.stage, name, self._elapsed_ms(start), True)
+        return result
+
+    def _elapsed_ms(self, start: float) -> float:
+        return (time.perf_counter() - start) * 1000
+
+    def _record_error(self, name: str, start: float, e: Exception):
+        error = str(e) if isinstance(e, StepError) else type(e).__name__
+        self.recorder.record(self.stage, name, self._elapsed_ms(start), False, error)
+
+
+async def interactive_flow(ctx: ScenarioContext):
+    """Web app flow: create, outlines, prepare, stream slides, export and edit a slide."""
+    presentation = await ctx.request(
+        "create",
+        "POST",
+        "/api/v1/ppt/presentation/create",
+        json={
+            "content": random.choice(PROMPTS),
+            "n_slides": ctx.n_slides,
+            "language": "English",
+        },
+    )
+    presentation_id = presentation["id"]
+
+    presentation = await ctx.sse(
+        "outline_stream",
+        f"/api/v1/ppt/outlines/stream/{presentation_id}",
+        "presentation",
+    )
+
+    await ctx.request(
+        "prepare",
+        "POST",
+        "/api/v1/ppt/presentation/prepare",
+        json={
+            "presentation_id": presentation_id,
+            "outlines": presentation["outlines"]["slides"],
+            "layout": ctx.layout,
+        },
+    )
+
+    presentation = await ctx.sse(
+        "stream",
+        f"/api/v1/ppt/presentation/stream/{presentation_id}",
+        "presentation",
+    )
+
+    await ctx.request(
+        "export",
+        "POST",
+        "/api/v1/ppt/presentation/export",
+        json={"id": presentation_id, "export_as": "pptx"},
+    )
+
+    slides = presentation.get("slides") or []
+    if slides:
+        await ctx.request(
+            "edit_slide",
+            "POST",
+            "/api/v1/ppt/slide/edit",
+            json={"id": slides[-1]["id"], "prompt": "Make it more concise"},
+        )
+
+
+async def async_generate_flow(ctx: ScenarioContext):
+    """API flow: queue /generate/async and poll its status until it finishes."""
+    task = await ctx.request(
+        "generate_async",
+        "POST",
+        "/api/v1/ppt/presentation/generate/async",
+        json={
+            "content": random.choice(PROMPTS),
+            "n_slides": ctx.n_slides,
+            "template": ctx.template,
+        },
+    )
+
+    deadline = time.monotonic() + ctx.poll_timeout
+    while True:
+        await asyncio.sleep(ctx.poll_interval)
+        status = await ctx.request(
+            "status_poll", "GET", f"/api/v1/ppt/presentation/status/{task['id']}"
+        )
+        if status["status"] == "completed":
+            return
+        if status["status"] == "error":
+            raise StepError("Generation failed")
+        if time.monotonic() > deadline:
+            raise StepError("Generation timed out")
+
+
+async def image_search_flow(ctx: ScenarioContext):
+    """Editor flow: image search followed by icon search."""
+    await ctx.request(
+        "image_search",
+        "GET",
+        "/api/v1/ppt/images/generate",
+        params={"prompt": random.choice(IMAGE_QUERIES)},
+    )
+    await ctx.request(
+        "icon_search",
+        "GET",
+        "/api/v1/ppt/icons/search",
+        params={"query": random.choice(ICON_QUERIES), "limit": 20},
+    )
+
+
+SCENARIOS: Dict[str, Callable[[ScenarioContext], Awaitable[None]]] = {
+    "interactive": interactive_flow,
+    "async_generate": async_generate_flow,
+    "image_search": image_search_flow,
+}
+
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    """Parses weights like 'interactive=2,image_search=5'."""
+    weights = {}
+    for each in mix.split(","):
+        name, _, weight = each.partition("=")
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise ValueError(
+                f"Unknown scenario '{name}'. Available: {', '.join(SCENARIOS)}"
+            )
+        weights[name] = float(weight or 1)
+    return weights
+
+
+def load_layout(layout_file: Optional[str]) -> dict:
+    if not layout_file:
+        return DEFAULT_LAYOUT
+    with open(layout_file, "r") as f:
+        return json.load(f)
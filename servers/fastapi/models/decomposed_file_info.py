@@ -1,6 +1,10 @@
+from typing import Optional
+
 from pydantic import BaseModel
 
 
 class DecomposedFileInfo(BaseModel):
     name: str
     file_path: str
+    # Set when the file could not be parsed, file_path then holds no content
+    error: Optional[str] = None
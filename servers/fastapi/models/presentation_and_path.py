@@ -1,3 +1,4 @@
+from typing import List
 from pydantic import BaseModel
 import uuid
 
@@ -9,3 +10,5 @@ class PresentationAndPath(BaseModel):
 
 class PresentationPathAndEditPath(PresentationAndPath):
     edit_path: str
+    # Attached files that could not be read and were left out
+    warnings: List[str] = []
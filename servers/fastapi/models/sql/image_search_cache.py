@@ -0,0 +1,21 @@
+from datetime import datetime
+from typing import List
+
+from sqlalchemy import JSON, Column, DateTime
+from sqlmodel import Field, SQLModel
+
+from utils.datetime_utils import get_current_utc_datetime
+
+
+class ImageSearchCacheModel(SQLModel, table=True):
+    __tablename__ = "image_search_cache"
+
+    # "{provider}:{normalized query}"
+    id: str = Field(primary_key=True)
+    provider: str
+    query: str
+    results: List[str] = Field(sa_column=Column(JSON, nullable=False))
+    created_at: datetime = Field(
+        sa_column=Column(DateTime(timezone=True), nullable=False, index=True),
+        default_factory=get_current_utc_datetime,
+    )
@@ -0,0 +1,21 @@
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Text
+from sqlmodel import Field, SQLModel
+
+from utils.datetime_utils import get_current_utc_datetime
+
+
+class MediaUrlModel(SQLModel, table=True):
+    """Maps a remote media URL to the content-addressed file it was stored as"""
+
+    __tablename__ = "media_urls"
+
+    # SHA-256 of the url
+    id: str = Field(primary_key=True)
+    url: str = Field(sa_column=Column(Text, nullable=False))
+    filename: str = Field(index=True)
+    created_at: datetime = Field(
+        sa_column=Column(DateTime(timezone=True), nullable=False),
+        default_factory=get_current_utc_datetime,
+    )
@@ -0,0 +1,200 @@
+import asyncio
+import heapq
+import itertools
+import random
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple, TypeVar
+from urllib.parse import urlparse
+
+import aiohttp
+
+from utils.get_env import (
+    get_asset_fetch_host_concurrency_env,
+    get_asset_fetch_provider_concurrency_env,
+)
+
+
+T = TypeVar("T")
+
+DEFAULT_PROVIDER_CONCURRENCY = 4
+DEFAULT_HOST_CONCURRENCY = 6
+
+
+def is_retryable_error(error: BaseException) -> bool:
+    if isinstance(error, aiohttp.ClientResponseError):
+        return error.status == 429 or error.status >= 500
+    return isinstance(error, (aiohttp.ClientConnectionError, asyncio.TimeoutError))
+
+
+class PriorityLimiter:
+    """
+    Semaphore that wakes waiters by priority (lower first), then FIFO.
+    Must only be used from a single event loop.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.active = 0
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._counter = itertools.count()
+
+    @property
+    def waiting(self) -> int:
+        return sum(1 for _, _, future in self._waiters if not future.done())
+
+    async def acquire(self, priority: int = 0):
+        if self.active < self.limit and not self.waiting:
+            self.active += 1
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._counter), future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            # Slot was handed over right before cancellation, pass it on
+            if future.done() and not future.cancelled():
+                self.release()
+            raise
+
+    def release(self):
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                # Slot is handed over, so active count stays the same
+                future.set_result(None)
+                return
+        self.active -= 1
+
+
+class AssetFetchSchedulerService:
+    """
+    Schedules outbound asset fetches (image generation, stock searches and
+    downloads) shared by every presentation being generated.
+
+    - Concurrency is capped per provider and per download host.
+    - Waiting fetches start in priority order, so earlier slides of a
+      streaming presentation get their assets first.
+    - Transient failures (connection errors, timeouts, 429 and 5xx) are
+      retried with exponential backoff.
+    - Identical fetches already in flight are joined instead of repeated.
+    """
+
+    MAX_RETRIES = 2
+    BACKOFF_SECONDS = 0.5
+
+    def __init__(self):
+        self._limiters: Dict[str, PriorityLimiter] = {}
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self.deduplicated = 0
+        self.retried = 0
+
+    @property
+    def provider_concurrency(self) -> int:
+        return int(
+            get_asset_fetch_provider_concurrency_env() or DEFAULT_PROVIDER_CONCURRENCY
+        )
+
+    @property
+    def host_concurrency(self) -> int:
+        return int(get_asset_fetch_host_concurrency_env() or DEFAULT_HOST_CONCURRENCY)
+
+    async def run_for_provider(
+        self,
+        provider: str,
+        func: Callable[[], Awaitable[T]],
+        priority: int = 0,
+        dedup_key: Optional[str] = None,
+    ) -> T:
+        return await self._run(
+            f"provider:{provider}",
+            self.provider_concurrency,
+            func,
+            priority,
+            dedup_key,
+        )
+
+    async def run_for_url(
+        self,
+        url: str,
+        func: Callable[[], Awaitable[T]],
+        priority: int = 0,
+        dedup_key: Optional[str] = None,
+    ) -> T:
+        host = urlparse(url).hostname or ""
+        return await self._run(
+            f"host:{host}", self.host_concurrency, func, priority, dedup_key
+        )
+
+    async def _run(
+        self,
+        limiter_key: str,
+        limit: int,
+        func: Callable[[], Awaitable[T]],
+        priority: int,
+        dedup_key: Optional[str],
+    ) -> T:
+        if not dedup_key:
+            return await self._run_limited(limiter_key, limit, func, priority)
+
+        dedup_key = f"{limiter_key}:{dedup_key}"
+        task = self._in_flight.get(dedup_key)
+        if task:
+            self.deduplicated += 1
+        else:
+            task = asyncio.create_task(
+                self._run_limited(limiter_key, limit, func, priority)
+            )
+            self._in_flight[dedup_key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(dedup_key, None))
+
+        # Cancelling one caller must not cancel the fetch for the others
+        return await asyncio.shield(task)
+
+    def _get_limiter(self, limiter_key: str, limit: int) -> PriorityLimiter:
+        limiter = self._limiters.get(limiter_key)
+        if not limiter:
+            limiter = PriorityLimiter(limit)
+            self._limiters[limiter_key] = limiter
+        limiter.limit = limit
+        return limiter
+
+    async def _run_limited(
+        self,
+        limiter_key: str,
+        limit: int,
+        func: Callable[[], Awaitable[T]],
+        priority: int,
+    ) -> T:
+        limiter = self._get_limiter(limiter_key, limit)
+        await limiter.acquire(priority)
+        try:
+            attempt = 0
+            while True:
+                try:
+                    return await func()
+                except Exception as e:
+                    if attempt >= self.MAX_RETRIES or not is_retryable_error(e):
+                        raise
+                    attempt += 1
+                    self.retried += 1
+                    delay = self.BACKOFF_SECONDS * (2 ** (attempt - 1))
+                    await asyncio.sleep(delay + random.uniform(0, delay))
+        finally:
+            limiter.release()
+
+    def get_stats(self) -> dict:
+        return {
+            "provider_concurrency": self.provider_concurrency,
+            "host_concurrency": self.host_concurrency,
+            "in_flight": len(self._in_flight),
+            "deduplicated": self.deduplicated,
+            "retried": self.retried,
+            "limiters": {
+                key: {"active": limiter.active, "waiting": limiter.waiting}
+                for key, limiter in self._limiters.items()
+                if limiter.active or limiter.waiting
+            },
+        }
+
+
+ASSET_FETCH_SCHEDULER_SERVICE = AssetFetchSchedulerService()
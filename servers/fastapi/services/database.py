@@ -12,7 +12,9 @@ from models.sql.async_presentation_generation_status import (
     AsyncPresentationGenerationTaskModel,
 )
 from models.sql.image_asset import ImageAsset
+from models.sql.image_search_cache import ImageSearchCacheModel
 from models.sql.key_value import KeyValueSqlModel
+from models.sql.media_url import MediaUrlModel
 from models.sql.ollama_pull_status import OllamaPullStatus
 from models.sql.presentation import PresentationModel
 from models.sql.slide import SlideModel
@@ -59,6 +61,8 @@ async def create_db_and_tables():
                     SlideModel.__table__,
                     KeyValueSqlModel.__table__,
                     ImageAsset.__table__,
+                    ImageSearchCacheModel.__table__,
+                    MediaUrlModel.__table__,
                     PresentationLayoutCodeModel.__table__,
                     TemplateModel.__table__,
                     WebhookSubscription.__table__,
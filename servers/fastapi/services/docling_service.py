@@ -1,17 +1,37 @@
-from docling.document_converter import (
-    DocumentConverter,
-    PdfFormatOption,
-    PowerpointFormatOption,
-    WordFormatOption,
+import os
+from typing import Optional, Tuple
+
+from services.process_pool_service import WarmProcessPool
+from utils.get_env import (
+    get_docling_max_queue_env,
+    get_docling_timeout_seconds_env,
+    get_docling_workers_env,
 )
-from docling.datamodel.pipeline_options import PdfPipelineOptions
-from docling.datamodel.base_models import InputFormat
+
+
+DEFAULT_WORKERS = 2
+DEFAULT_MAX_QUEUE = 32
+DEFAULT_TIMEOUT_SECONDS = 600
+
+# Identifies docling output in the parsed document cache, update when the
+# converter configuration changes
+DOCLING_PARSER_OPTIONS = {"parser": "docling", "version": 1, "do_ocr": False}
 
 
 class DoclingService:
     def __init__(self):
+        # Imported here, docling is only needed inside parser worker processes
+        from docling.document_converter import (
+            DocumentConverter,
+            PdfFormatOption,
+            PowerpointFormatOption,
+            WordFormatOption,
+        )
+        from docling.datamodel.pipeline_options import PdfPipelineOptions
+        from docling.datamodel.base_models import InputFormat
+
         self.pipeline_options = PdfPipelineOptions()
-        self.pipeline_options.do_ocr = False
+        self.pipeline_options.do_ocr = DOCLING_PARSER_OPTIONS["do_ocr"]
 
         self.converter = DocumentConverter(
             allowed_formats=[InputFormat.PPTX, InputFormat.PDF, InputFormat.DOCX],
@@ -28,6 +48,76 @@ class DoclingService:
             },
         )
 
-    def parse_to_markdown(self, file_path: str) -> str:
-        result = self.converter.convert(file_path)
+    def parse_to_markdown(
+        self, file_path: str, page_range: Optional[Tuple[int, int]] = None
+    ) -> str:
+        """page_range is 1-based and inclusive, only used for PDFs."""
+        if page_range:
+            result = self.converter.convert(file_path, page_range=page_range)
+        else:
+            result = self.converter.convert(file_path)
         return result.document.export_to_markdown()
+
+
+# Converter of the current parser worker process
+_WORKER_DOCLING_SERVICE: Optional[DoclingService] = None
+
+
+def initialize_docling_worker():
+    from docling.datamodel.base_models import InputFormat
+
+    global _WORKER_DOCLING_SERVICE
+    _WORKER_DOCLING_SERVICE = DoclingService()
+    # Loads the PDF layout models now, so the first document doesn't pay for it
+    _WORKER_DOCLING_SERVICE.converter.initialize_pipeline(InputFormat.PDF)
+
+
+def parse_to_markdown_in_worker(
+    file_path: str, page_range: Optional[Tuple[int, int]] = None
+) -> str:
+    return _WORKER_DOCLING_SERVICE.parse_to_markdown(file_path, page_range)
+
+
+class DoclingPoolService:
+    """
+    Parses documents with docling in a pool of worker processes, each keeping
+    one initialized DocumentConverter, so conversions neither block the event
+    loop nor rebuild the converter per request.
+    Configured by DOCLING_WORKERS, DOCLING_MAX_QUEUE and DOCLING_TIMEOUT_SECONDS.
+    """
+
+    def __init__(self):
+        self.pool = WarmProcessPool(
+            "docling",
+            initialize_docling_worker,
+            get_workers=lambda: int(get_docling_workers_env() or DEFAULT_WORKERS),
+            get_max_queue=lambda: int(
+                get_docling_max_queue_env() or DEFAULT_MAX_QUEUE
+            ),
+        )
+
+    @property
+    def timeout(self) -> float:
+        return float(get_docling_timeout_seconds_env() or DEFAULT_TIMEOUT_SECONDS)
+
+    def start(self):
+        self.pool.start()
+
+    async def stop(self):
+        await self.pool.stop()
+
+    async def parse_to_markdown(
+        self, file_path: str, page_range: Optional[Tuple[int, int]] = None
+    ) -> str:
+        return await self.pool.run(
+            parse_to_markdown_in_worker,
+            os.path.abspath(file_path),
+            page_range,
+            timeout=self.timeout,
+        )
+
+    def get_stats(self) -> dict:
+        return {"timeout_seconds": self.timeout, **self.pool.get_stats()}
+
+
+DOCLING_POOL_SERVICE = DoclingPoolService()
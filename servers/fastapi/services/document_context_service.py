@@ -0,0 +1,233 @@
+import asyncio
+import math
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from services.score_based_chunker import ScoreBasedChunker
+from utils.get_env import (
+    get_additional_context_summarize_env,
+    get_additional_context_token_budget_env,
+)
+from utils.llm_calls.summarize_document_chunk import summarize_document_chunk
+from utils.llm_provider import get_model
+from utils.parsers import parse_bool_or_none
+
+
+DEFAULT_TOKEN_BUDGET = 24000
+
+
+def estimate_tokens(text: str) -> int:
+    # About 4 characters per token for English with common LLM tokenizers.
+    # CJK, Thai and similar scripts are about one token per character, so
+    # non-ASCII characters are counted as a token each to never underestimate.
+    ascii_chars = len(text.encode("ascii", "ignore"))
+    return math.ceil(ascii_chars / 4) + len(text) - ascii_chars
+
+
+@dataclass
+class DocumentSection:
+    document_index: int
+    order: int
+    text: str
+    score: float
+
+    @property
+    def tokens(self) -> int:
+        return estimate_tokens(self.text)
+
+
+class DocumentContextService:
+    """
+    Builds the additional context of the outline prompt from parsed documents
+    within a token budget, so prompt size and outline latency stay bounded
+    regardless of upload size.
+
+    Documents that fit are passed through unchanged. Otherwise documents are
+    split into heading sections by ScoreBasedChunker and the best scored
+    sections are kept, in document order. With ADDITIONAL_CONTEXT_SUMMARIZE,
+    sections are first condensed by the LLM in parallel (map) and the
+    summaries are then selected the same way (reduce).
+
+    ADDITIONAL_CONTEXT_TOKEN_BUDGET is either a number or a comma separated
+    list like "24000,gpt-4.1=100000,llama3.2=6000" where bare numbers set the
+    default and model=tokens entries override it for that model.
+    """
+
+    # Sections of documents without headings
+    FALLBACK_SECTION_TOKENS = 1000
+    # Input per summarization call and calls running at once
+    SUMMARY_INPUT_TOKENS = 6000
+    SUMMARY_CONCURRENCY = 4
+    MIN_SUMMARY_TOKENS = 150
+    # Smaller leftovers of the budget are not worth a truncated section
+    MIN_TRUNCATED_TOKENS = 200
+
+    def __init__(self):
+        self.chunker = ScoreBasedChunker()
+
+    @staticmethod
+    def parse_token_budgets(value: Optional[str]) -> Tuple[int, Dict[str, int]]:
+        default = DEFAULT_TOKEN_BUDGET
+        budgets = {}
+        for entry in (value or "").split(","):
+            entry = entry.strip()
+            if not entry:
+                continue
+            if "=" in entry:
+                model, budget = entry.rsplit("=", 1)
+                budgets[model.strip()] = int(budget)
+            else:
+                default = int(entry)
+        return default, budgets
+
+    def get_token_budget(self, model: Optional[str] = None) -> int:
+        default, budgets = self.parse_token_budgets(
+            get_additional_context_token_budget_env()
+        )
+        return budgets.get(model or get_model(), default)
+
+    @property
+    def summarize(self) -> bool:
+        return bool(parse_bool_or_none(get_additional_context_summarize_env()))
+
+    def split_sections(self, document_index: int, text: str) -> List[DocumentSection]:
+        headings = self.chunker.extract_headings(text)
+        if not headings:
+            return self._split_paragraphs(document_index, text)
+
+        scores = self.chunker.score_headings(headings)
+        chunks = self.chunker.get_chunks_from_headings(
+            text, headings, scores, len(headings)
+        )
+        sections = []
+        preamble = text[: text.find(headings[0])].strip()
+        if preamble:
+            # Text before the first heading usually introduces the document
+            sections.append(DocumentSection(document_index, 0, preamble, max(scores)))
+        for chunk in chunks:
+            sections.append(
+                DocumentSection(
+                    document_index,
+                    len(sections),
+                    f"{chunk.heading}\n{chunk.content}".strip(),
+                    chunk.score,
+                )
+            )
+        return sections
+
+    def _split_paragraphs(self, document_index: int, text: str) -> List[DocumentSection]:
+        sections = []
+        current = []
+        current_tokens = 0
+        for paragraph in text.split("\n\n"):
+            tokens = estimate_tokens(paragraph)
+            if current and current_tokens + tokens > self.FALLBACK_SECTION_TOKENS:
+                sections.append("\n\n".join(current))
+                current, current_tokens = [], 0
+            current.append(paragraph)
+            current_tokens += tokens
+        if current:
+            sections.append("\n\n".join(current))
+        # Beginning of a document weighs a little more, the rest equally
+        return [
+            DocumentSection(document_index, i, each, 2.0 if i == 0 else 1.0)
+            for i, each in enumerate(sections)
+            if each.strip()
+        ]
+
+    def select_sections(
+        self, sections: List[DocumentSection], budget: int
+    ) -> List[DocumentSection]:
+        """Best scored sections within budget, returned in document order."""
+        selected = []
+        remaining = budget
+        for section in sorted(
+            sections, key=lambda each: (-each.score, each.document_index, each.order)
+        ):
+            tokens = section.tokens
+            if tokens <= remaining:
+                selected.append(section)
+                remaining -= tokens
+            elif remaining >= self.MIN_TRUNCATED_TOKENS:
+                # Characters per token of this section, scripts differ
+                max_chars = remaining * len(section.text) // tokens
+                text = section.text[:max_chars].rsplit("\n", 1)[0]
+                selected.append(
+                    DocumentSection(
+                        section.document_index, section.order, text, section.score
+                    )
+                )
+                remaining -= estimate_tokens(text)
+        selected.sort(key=lambda each: (each.document_index, each.order))
+        return selected
+
+    def _group_for_summary(
+        self, sections: List[DocumentSection]
+    ) -> List[List[DocumentSection]]:
+        groups = []
+        current = []
+        current_tokens = 0
+        for section in sections:
+            if current and (
+                current_tokens + section.tokens > self.SUMMARY_INPUT_TOKENS
+                or current[-1].document_index != section.document_index
+            ):
+                groups.append(current)
+                current, current_tokens = [], 0
+            current.append(section)
+            current_tokens += section.tokens
+        if current:
+            groups.append(current)
+        return groups
+
+    async def summarize_sections(
+        self, sections: List[DocumentSection], budget: int
+    ) -> List[DocumentSection]:
+        total_tokens = sum(each.tokens for each in sections)
+        ratio = budget / total_tokens
+        semaphore = asyncio.Semaphore(self.SUMMARY_CONCURRENCY)
+
+        async def summarize(group: List[DocumentSection]) -> DocumentSection:
+            text = "\n\n".join(each.text for each in group)
+            max_tokens = max(
+                self.MIN_SUMMARY_TOKENS, int(estimate_tokens(text) * ratio)
+            )
+            async with semaphore:
+                summary = await summarize_document_chunk(text, max_tokens)
+            return DocumentSection(
+                group[0].document_index,
+                group[0].order,
+                summary.strip(),
+                max(each.score for each in group),
+            )
+
+        return await asyncio.gather(
+            *[summarize(each) for each in self._group_for_summary(sections)]
+        )
+
+    async def build(self, documents: List[str], model: Optional[str] = None) -> str:
+        documents = [each for each in documents if each and each.strip()]
+        joined = "\n\n".join(documents)
+        budget = self.get_token_budget(model)
+        if estimate_tokens(joined) <= budget:
+            return joined
+
+        sections = []
+        for i, document in enumerate(documents):
+            sections.extend(await asyncio.to_thread(self.split_sections, i, document))
+
+        if self.summarize:
+            try:
+                sections = await self.summarize_sections(sections, budget)
+            except Exception as e:
+                print(f"Could not summarize documents, selecting sections: {e}")
+
+        selected = self.select_sections(sections, budget)
+        print(
+            f"Reduced additional context from {estimate_tokens(joined)} to "
+            f"{sum(each.tokens for each in selected)} estimated tokens"
+        )
+        return "\n\n".join(each.text for each in selected)
+
+
+DOCUMENT_CONTEXT_SERVICE = DocumentContextService()
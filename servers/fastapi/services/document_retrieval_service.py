@@ -0,0 +1,193 @@
+import asyncio
+import uuid
+from typing import List, Optional, Set
+
+import numpy as np
+
+from services.document_context_service import DocumentContextService, estimate_tokens
+from services.documents_loader import DocumentsLoader
+from services.icon_finder_service import ICON_FINDER_SERVICE, normalize_rows
+from utils.get_env import get_document_retrieval_top_k_env
+from utils.lru_cache import LruCache
+
+
+DEFAULT_TOP_K = 3
+
+
+class DocumentIndex:
+    """Chunks of the documents of one presentation and their embeddings."""
+
+    MIN_SIMILARITY = 0.2
+
+    def __init__(self, chunks: List[str], embeddings: np.ndarray, embedding_function):
+        self.chunks = chunks
+        self.embeddings = embeddings
+        self.embedding_function = embedding_function
+
+    def query(self, query: str, k: int) -> List[str]:
+        """Up to k chunks most similar to query, returned in document order."""
+        if not self.chunks or k <= 0:
+            return []
+        query_embedding = normalize_rows(
+            np.array(self.embedding_function([query]), dtype=np.float32)
+        )[0]
+        similarities = self.embeddings @ query_embedding
+        top = np.argsort(-similarities)[:k]
+        return [
+            self.chunks[i]
+            for i in sorted(top)
+            if similarities[i] >= self.MIN_SIMILARITY
+        ]
+
+
+class DocumentRetrievalService:
+    """
+    Grounds slide content in the attached documents without sending whole
+    documents to every slide call.
+
+    Documents are split into heading sections by DocumentContextService,
+    sections are cut into chunks small enough for the MiniLM model shipped
+    for icon search, and the chunk embeddings are kept in memory per
+    presentation. Each slide content call then gets the
+    DOCUMENT_RETRIEVAL_TOP_K chunks closest to its outline, 0 disables it.
+
+    Indexes are built in the background while the outline is generated. If
+    the server restarted in between, the index is rebuilt from the files of
+    the presentation, which hits the parsed document cache.
+    """
+
+    CHUNK_TOKENS = 250
+    EMBEDDING_BATCH_SIZE = 64
+    MAX_INDEXES = 32
+
+    def __init__(self):
+        self.context_service = DocumentContextService()
+        self.indexes: LruCache[asyncio.Task] = LruCache(self.MAX_INDEXES)
+        # Keeps builds evicted from indexes alive until they finish
+        self._build_tasks: Set[asyncio.Task] = set()
+
+    @property
+    def top_k(self) -> int:
+        return int(get_document_retrieval_top_k_env() or DEFAULT_TOP_K)
+
+    def _split_section(self, text: str) -> List[str]:
+        max_chars = self.CHUNK_TOKENS * 4
+        paragraphs = []
+        for paragraph in text.split("\n\n"):
+            paragraph = paragraph.strip()
+            while len(paragraph) > max_chars:
+                cut = paragraph.rfind(" ", 0, max_chars)
+                if cut <= 0:
+                    cut = max_chars
+                paragraphs.append(paragraph[:cut])
+                paragraph = paragraph[cut:].strip()
+            if paragraph:
+                paragraphs.append(paragraph)
+
+        chunks = []
+        current = ""
+        for paragraph in paragraphs:
+            if current and len(current) + len(paragraph) + 2 > max_chars:
+                chunks.append(current)
+                current = ""
+            current = f"{current}\n\n{paragraph}" if current else paragraph
+
+        if current:
+            chunks.append(current)
+
+        # Continued chunks keep the heading of their section for context
+        heading = text.split("\n", 1)[0]
+        if heading.startswith("#"):
+            chunks[1:] = [f"{heading}\n{chunk}" for chunk in chunks[1:]]
+        return chunks
+
+    def split_chunks(self, documents: List[str]) -> List[str]:
+        chunks = []
+        for i, document in enumerate(documents):
+            if not document or not document.strip():
+                continue
+            for section in self.context_service.split_sections(i, document):
+                chunks.extend(self._split_section(section.text))
+        return chunks
+
+    def build_index(self, documents: List[str]) -> DocumentIndex:
+        """Chunks and embeds documents. Blocking."""
+        embedding_function = ICON_FINDER_SERVICE.get_embedding_function()
+        chunks = self.split_chunks(documents)
+        if not chunks:
+            return DocumentIndex([], np.zeros((0, 0), np.float32), embedding_function)
+
+        embeddings = []
+        for i in range(0, len(chunks), self.EMBEDDING_BATCH_SIZE):
+            embeddings.extend(
+                embedding_function(chunks[i : i + self.EMBEDDING_BATCH_SIZE])
+            )
+        embeddings = normalize_rows(np.array(embeddings, dtype=np.float32))
+        print(
+            f"Indexed {len(chunks)} document chunks, "
+            f"{sum(estimate_tokens(each) for each in chunks)} estimated tokens"
+        )
+        return DocumentIndex(chunks, embeddings, embedding_function)
+
+    async def _load_and_build_index(self, file_paths: List[str]) -> DocumentIndex:
+        documents_loader = DocumentsLoader(file_paths=file_paths)
+        await documents_loader.load_documents()
+        return await asyncio.to_thread(self.build_index, documents_loader.documents)
+
+    def start_build(self, presentation_id: uuid.UUID, documents: List[str]):
+        """Starts indexing documents of a presentation in the background."""
+        if self.top_k <= 0 or not any(each and each.strip() for each in documents):
+            return
+        self._add_build(
+            presentation_id,
+            asyncio.create_task(asyncio.to_thread(self.build_index, documents)),
+        )
+
+    def _add_build(self, presentation_id: uuid.UUID, task: asyncio.Task):
+        self._build_tasks.add(task)
+        self.indexes.set(presentation_id, task)
+        task.add_done_callback(lambda _: self._on_build_done(presentation_id, task))
+
+    def _on_build_done(self, presentation_id: uuid.UUID, task: asyncio.Task):
+        self._build_tasks.discard(task)
+        # Failed builds are forgotten, so the next get_index tries again
+        if task.cancelled() or task.exception() is not None:
+            if self.indexes.get(presentation_id) is task:
+                self.indexes.delete(presentation_id)
+
+    async def get_index(
+        self, presentation_id: uuid.UUID, file_paths: Optional[List[str]] = None
+    ) -> Optional[DocumentIndex]:
+        """
+        Index of the presentation, waiting for a build in progress. Without
+        an index in memory, it is built from file_paths when given. Returns
+        None if retrieval is disabled or the index could not be built.
+        """
+        if self.top_k <= 0:
+            return None
+
+        task = self.indexes.get(presentation_id)
+        if task is None:
+            if not file_paths:
+                return None
+            task = asyncio.create_task(self._load_and_build_index(file_paths))
+            self._add_build(presentation_id, task)
+
+        try:
+            # Shielded, so a cancelled request doesn't cancel a shared build
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"Could not index documents, slides are generated without them: {e}")
+            return None
+
+    async def retrieve(self, index: Optional[DocumentIndex], query: str) -> Optional[str]:
+        """Relevant chunks for query joined as prompt context, if any."""
+        if index is None or not query:
+            return None
+        chunks = await asyncio.to_thread(index.query, query, self.top_k)
+        return "\n\n---\n\n".join(chunks) or None
+
+
+DOCUMENT_RETRIEVAL_SERVICE = DocumentRetrievalService()
@@ -1,8 +1,7 @@
 import mimetypes
 from fastapi import HTTPException
 import os, asyncio
-from typing import List, Tuple
-import pdfplumber
+from typing import AsyncIterator, List, Optional, Tuple
 
 from constants.documents import (
     PDF_MIME_TYPES,
@@ -10,18 +9,30 @@ from constants.documents import (
     TEXT_MIME_TYPES,
     WORD_TYPES,
 )
-from services.docling_service import DoclingService
+from services.docling_service import DOCLING_PARSER_OPTIONS, DOCLING_POOL_SERVICE
+from services.parsed_document_cache_service import PARSED_DOCUMENT_CACHE_SERVICE
+from services.pdf_render_service import PDF_RENDER_SERVICE
+from services.pdf_text_service import PDF_TEXT_SERVICE
+from services.process_pool_service import ProcessPoolBusyError
+from utils.file_utils import get_file_sha256
+from utils.get_env import get_pdf_fast_text_extraction_env, get_pdf_max_pages_env
+from utils.parsers import parse_bool_or_none
+
+
+# Identifies text layer output in the parsed document cache
+PDF_TEXT_PARSER_OPTIONS = {"parser": "pdf_text", "version": 1}
 
 
 class DocumentsLoader:
+    # Files loaded at once, docling parsing is further bounded by its pool
+    MAX_CONCURRENT_FILES = 4
 
     def __init__(self, file_paths: List[str]):
         self._file_paths = file_paths
 
-        self.docling_service = DoclingService()
-
         self._documents: List[str] = []
         self._images: List[List[str]] = []
+        self._errors: List[Optional[str]] = []
 
     @property
     def documents(self):
@@ -31,41 +42,84 @@ class DocumentsLoader:
     def images(self):
         return self._images
 
+    @property
+    def errors(self):
+        """Error per file, None for files that loaded. Failed files have no content."""
+        return self._errors
+
+    def get_error_messages(self) -> List[str]:
+        """One message per file that failed to load, for reporting to users."""
+        return [
+            f"Could not read {os.path.basename(file_path)}: {error}"
+            for file_path, error in zip(self._file_paths, self._errors)
+            if error
+        ]
+
     async def load_documents(
         self,
-        temp_dir: str,
+        temp_dir: Optional[str] = None,
         load_text: bool = True,
         load_images: bool = False,
     ):
-        documents: List[str] = []
-        images: List[str] = []
-
+        """
+        Loads files concurrently, keeping results in the order of file_paths.
+        A file that fails to parse is recorded in errors instead of failing
+        the others.
+        """
         for file_path in self._file_paths:
             if not os.path.exists(file_path):
                 raise HTTPException(
                     status_code=404, detail=f"File {file_path} not found"
                 )
 
-            document = ""
-            imgs = []
+        semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_FILES)
 
-            mime_type = mimetypes.guess_type(file_path)[0]
-            if mime_type in PDF_MIME_TYPES:
-                document, imgs = await self.load_pdf(
-                    file_path, load_text, load_images, temp_dir
-                )
-            elif mime_type in TEXT_MIME_TYPES:
-                document = await self.load_text(file_path)
-            elif mime_type in POWERPOINT_TYPES:
-                document = self.load_powerpoint(file_path)
-            elif mime_type in WORD_TYPES:
-                document = self.load_msword(file_path)
+        async def load(file_path: str):
+            async with semaphore:
+                try:
+                    document, imgs = await self.load_document(
+                        file_path, temp_dir, load_text, load_images
+                    )
+                    return document, imgs, None
+                except HTTPException as e:
+                    # Server is overloaded, the whole request should be retried
+                    if e.status_code == 503:
+                        raise
+                    error = e.detail
+                except Exception as e:
+                    error = str(e) or type(e).__name__
+                print(f"Error loading {file_path}: {error}")
+                return "", [], error
 
-            documents.append(document)
-            images.append(imgs)
+        results = await asyncio.gather(*[load(each) for each in self._file_paths])
 
-        self._documents = documents
-        self._images = images
+        self._documents = [document for document, _, _ in results]
+        self._images = [imgs for _, imgs, _ in results]
+        self._errors = [error for _, _, error in results]
+
+    async def load_document(
+        self,
+        file_path: str,
+        temp_dir: Optional[str],
+        load_text: bool,
+        load_images: bool,
+    ) -> Tuple[str, List[str]]:
+        document = ""
+        imgs = []
+
+        mime_type = mimetypes.guess_type(file_path)[0]
+        if mime_type in PDF_MIME_TYPES:
+            document, imgs = await self.load_pdf(
+                file_path, load_text, load_images, temp_dir
+            )
+        elif mime_type in TEXT_MIME_TYPES:
+            document = await self.load_text(file_path)
+        elif mime_type in POWERPOINT_TYPES:
+            document = await self.load_powerpoint(file_path)
+        elif mime_type in WORD_TYPES:
+            document = await self.load_msword(file_path)
+
+        return document, imgs
 
     async def load_pdf(
         self,
@@ -76,38 +130,167 @@ class DocumentsLoader:
     ) -> Tuple[str, List[str]]:
         image_paths = []
         document: str = ""
+        if not (load_text or load_images):
+            return document, image_paths
+        file_hash = await self.get_file_hash(file_path)
 
         if load_text:
-            document = self.docling_service.parse_to_markdown(file_path)
+            document = await self.load_pdf_text(file_path, file_hash)
 
         if load_images:
-            image_paths = await self.get_page_images_from_pdf_async(file_path, temp_dir)
+            image_paths = await self.load_page_images(file_path, temp_dir, file_hash)
 
         return document, image_paths
 
+    @staticmethod
+    def get_pdf_page_range() -> Optional[Tuple[int, int]]:
+        max_pages = get_pdf_max_pages_env()
+        return (1, int(max_pages)) if max_pages else None
+
+    @staticmethod
+    def use_fast_pdf_text() -> bool:
+        return parse_bool_or_none(get_pdf_fast_text_extraction_env()) is not False
+
+    async def load_pdf_text(self, file_path: str, file_hash: str) -> str:
+        """
+        Uses the PDF text layer when it passes the quality checks of
+        PdfTextService.probe and falls back to docling otherwise.
+        """
+        page_range = self.get_pdf_page_range()
+        if not self.use_fast_pdf_text():
+            return await self.parse_with_docling(file_path, file_hash, page_range)
+
+        options = {**PDF_TEXT_PARSER_OPTIONS, "page_range": page_range}
+        document = await PARSED_DOCUMENT_CACHE_SERVICE.get_markdown(
+            file_hash, options
+        )
+        if document is not None:
+            return document
+
+        file_name = os.path.basename(file_path)
+        try:
+            probe = await asyncio.to_thread(
+                PDF_TEXT_SERVICE.probe, file_path, page_range
+            )
+        except Exception as e:
+            print(f"Parsing {file_name} with docling: could not read text layer: {e}")
+            return await self.parse_with_docling(file_path, file_hash, page_range)
+
+        if not probe.is_text_native:
+            print(f"Parsing {file_name} with docling: {probe.reason}")
+            return await self.parse_with_docling(file_path, file_hash, page_range)
+
+        try:
+            pages = [
+                markdown
+                async for _, markdown in PDF_TEXT_SERVICE.stream_pages(
+                    file_path, probe.body_font_size, page_range
+                )
+            ]
+        except Exception as e:
+            print(f"Parsing {file_name} with docling: could not read text layer: {e}")
+            return await self.parse_with_docling(file_path, file_hash, page_range)
+        document = "\n\n".join(pages)
+        await PARSED_DOCUMENT_CACHE_SERVICE.set_markdown(file_hash, options, document)
+        return document
+
+    @staticmethod
+    async def get_file_hash(file_path: str) -> str:
+        return await asyncio.to_thread(get_file_sha256, file_path)
+
+    async def load_page_images(
+        self, file_path: str, temp_dir: str, file_hash: str
+    ) -> List[str]:
+        options = PDF_RENDER_SERVICE.get_options()
+        image_paths = await PARSED_DOCUMENT_CACHE_SERVICE.get_page_images(
+            file_hash, options, temp_dir
+        )
+        if image_paths is None:
+            image_paths = await self.get_page_images_from_pdf_async(
+                file_path, temp_dir
+            )
+            await PARSED_DOCUMENT_CACHE_SERVICE.set_page_images(
+                file_hash, options, image_paths
+            )
+        return image_paths
+
     async def load_text(self, file_path: str) -> str:
         with open(file_path, "r") as file:
             return await asyncio.to_thread(file.read)
 
-    def load_msword(self, file_path: str) -> str:
-        return self.docling_service.parse_to_markdown(file_path)
+    async def load_msword(self, file_path: str) -> str:
+        return await self.parse_with_docling(file_path)
+
+    async def load_powerpoint(self, file_path: str) -> str:
+        return await self.parse_with_docling(file_path)
+
+    async def parse_with_docling(
+        self,
+        file_path: str,
+        file_hash: Optional[str] = None,
+        page_range: Optional[Tuple[int, int]] = None,
+        use_cache: bool = True,
+    ) -> str:
+        options = DOCLING_PARSER_OPTIONS
+        if page_range:
+            options = {**options, "page_range": page_range}
+        if use_cache:
+            file_hash = file_hash or await self.get_file_hash(file_path)
+            document = await PARSED_DOCUMENT_CACHE_SERVICE.get_markdown(
+                file_hash, options
+            )
+            if document is not None:
+                return document
 
-    def load_powerpoint(self, file_path: str) -> str:
-        return self.docling_service.parse_to_markdown(file_path)
+        try:
+            document = await DOCLING_POOL_SERVICE.parse_to_markdown(
+                file_path, page_range
+            )
+        except ProcessPoolBusyError:
+            raise HTTPException(
+                status_code=503,
+                detail="Too many documents are being parsed, please try again later",
+            )
+        except asyncio.TimeoutError:
+            raise HTTPException(
+                status_code=504,
+                detail=f"Timed out parsing {os.path.basename(file_path)}",
+            )
+
+        if use_cache:
+            await PARSED_DOCUMENT_CACHE_SERVICE.set_markdown(
+                file_hash, options, document
+            )
+        return document
 
     @classmethod
-    def get_page_images_from_pdf(cls, file_path: str, temp_dir: str) -> List[str]:
-        with pdfplumber.open(file_path) as pdf:
-            images = []
-            for page in pdf.pages:
-                img = page.to_image(resolution=150)
-                image_path = os.path.join(temp_dir, f"page_{page.page_number}.png")
-                img.save(image_path)
-                images.append(image_path)
-            return images
+    async def stream_page_images_from_pdf(
+        cls, file_path: str, temp_dir: str
+    ) -> AsyncIterator[Tuple[int, str]]:
+        """Yields (page number, image path) in page order as pages are rendered."""
+        try:
+            async for page in PDF_RENDER_SERVICE.stream_page_images(
+                file_path, temp_dir
+            ):
+                yield page
+        except ProcessPoolBusyError:
+            raise HTTPException(
+                status_code=503,
+                detail="Too many PDF pages are being rendered, please try again later",
+            )
+        except asyncio.TimeoutError:
+            raise HTTPException(
+                status_code=504,
+                detail=f"Timed out rendering {os.path.basename(file_path)}",
+            )
 
     @classmethod
-    async def get_page_images_from_pdf_async(cls, file_path: str, temp_dir: str):
-        return await asyncio.to_thread(
-            cls.get_page_images_from_pdf, file_path, temp_dir
-        )
+    async def get_page_images_from_pdf_async(
+        cls, file_path: str, temp_dir: str
+    ) -> List[str]:
+        return [
+            image_path
+            async for _, image_path in cls.stream_page_images_from_pdf(
+                file_path, temp_dir
+            )
+        ]
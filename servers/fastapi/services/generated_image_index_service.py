@@ -0,0 +1,150 @@
+import asyncio
+import os
+from typing import Dict, List, Optional
+
+import numpy as np
+from sqlmodel import select
+
+from models.image_prompt import ImagePrompt
+from models.sql.image_asset import ImageAsset
+from services.database import async_session_maker
+from utils.get_env import (
+    get_generated_image_similarity_threshold_env,
+    get_reuse_generated_images_env,
+)
+from utils.parsers import normalize_text, parse_bool_or_none
+
+
+class GeneratedImageIndexService:
+    """
+    Looks up previously generated AI images (DALL-E 3, Gemini) by prompt so
+    identical requests reuse the stored image instead of paying for a new one.
+
+    The index is built lazily from ImageAsset rows and keyed by normalized
+    prompt plus theme prompt. When GENERATED_IMAGE_SIMILARITY_THRESHOLD is set,
+    prompts without an exact match are compared by MiniLM embedding cosine
+    similarity against indexed prompts with the same theme.
+    Disabled unless REUSE_GENERATED_IMAGES is true.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.similar_hits = 0
+        self.misses = 0
+        self._paths: Dict[str, str] = {}
+        self._embeddings: Dict[str, np.ndarray] = {}
+        self._load_lock = asyncio.Lock()
+        self._is_loaded = False
+
+    @property
+    def is_enabled(self) -> bool:
+        return bool(parse_bool_or_none(get_reuse_generated_images_env()))
+
+    @property
+    def similarity_threshold(self) -> Optional[float]:
+        threshold = get_generated_image_similarity_threshold_env()
+        return float(threshold) if threshold else None
+
+    @staticmethod
+    def get_key(prompt: str, theme_prompt: Optional[str]) -> str:
+        return f"{normalize_text(prompt)}|{normalize_text(theme_prompt)}"
+
+    async def _load(self):
+        async with self._load_lock:
+            if self._is_loaded:
+                return
+            async with async_session_maker() as sql_session:
+                assets = await sql_session.scalars(
+                    select(ImageAsset)
+                    .where(ImageAsset.is_uploaded == False)
+                    .order_by(ImageAsset.created_at)
+                )
+                for asset in assets:
+                    self.register(asset)
+            self._is_loaded = True
+
+    def register(self, asset: ImageAsset):
+        extras = asset.extras or {}
+        if not extras.get("prompt"):
+            return
+        key = self.get_key(extras["prompt"], extras.get("theme_prompt"))
+        self._paths[key] = asset.path
+        self._embeddings.pop(key, None)
+
+    def _get_existing_path(self, key: str) -> Optional[str]:
+        path = self._paths.get(key)
+        if path and os.path.isfile(path):
+            return path
+        # Stored file was removed, forget it
+        self._paths.pop(key, None)
+        self._embeddings.pop(key, None)
+        return None
+
+    def _embed(self, texts: List[str]) -> np.ndarray:
+        from services.icon_finder_service import ICON_FINDER_SERVICE
+
+        embeddings = np.array(ICON_FINDER_SERVICE.get_embedding_function()(texts))
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        return embeddings / np.maximum(norms, 1e-12)
+
+    def _find_similar_key(
+        self, key: str, candidates: List[str], threshold: float
+    ) -> Optional[str]:
+        prompt = key.split("|", 1)[0]
+        missing = [each for each in candidates if each not in self._embeddings]
+        if missing:
+            embeddings = self._embed([each.split("|", 1)[0] for each in missing])
+            self._embeddings.update(zip(missing, embeddings))
+
+        query = self._embed([prompt])[0]
+        matrix = np.stack([self._embeddings[each] for each in candidates])
+        scores = matrix @ query
+        best = int(np.argmax(scores))
+        return candidates[best] if scores[best] >= threshold else None
+
+    async def find(self, prompt: ImagePrompt) -> Optional[str]:
+        """Returns the path of a stored image generated for an equivalent prompt."""
+        if not self.is_enabled:
+            return None
+
+        try:
+            await self._load()
+            key = self.get_key(prompt.prompt, prompt.theme_prompt)
+            path = self._get_existing_path(key)
+            if path:
+                self.hits += 1
+                return path
+
+            threshold = self.similarity_threshold
+            theme = key.split("|", 1)[1]
+            candidates = [
+                each for each in self._paths if each.split("|", 1)[1] == theme
+            ]
+            if threshold is not None and candidates:
+                similar_key = await asyncio.to_thread(
+                    self._find_similar_key, key, candidates, threshold
+                )
+                path = similar_key and self._get_existing_path(similar_key)
+                if path:
+                    self.similar_hits += 1
+                    return path
+        except Exception as e:
+            print(f"Error looking up generated images: {e}")
+
+        self.misses += 1
+        return None
+
+    def get_stats(self) -> dict:
+        total = self.hits + self.similar_hits + self.misses
+        return {
+            "enabled": self.is_enabled,
+            "similarity_threshold": self.similarity_threshold,
+            "indexed": len(self._paths),
+            "hits": self.hits,
+            "similar_hits": self.similar_hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits + self.similar_hits) / total if total else 0.0,
+        }
+
+
+GENERATED_IMAGE_INDEX_SERVICE = GeneratedImageIndexService()
@@ -0,0 +1,68 @@
+import asyncio
+from typing import Dict, Tuple
+
+import aiohttp
+
+
+class HttpClientService:
+    """
+    Shared aiohttp sessions for all outbound requests.
+
+    Sessions keep connections alive between requests, cache DNS lookups and
+    cap connections per host. The "external" session goes through proxies
+    from the environment and has bounded timeouts. The "internal" session
+    talks to the bundled Next.js app and Ollama, whose exports and model
+    pulls can legitimately take minutes, so only connecting is bounded.
+
+    Callers must not close the returned sessions, they are closed from the
+    app lifespan.
+    """
+
+    LIMIT = 100
+    LIMIT_PER_HOST = 10
+    DNS_CACHE_TTL_SECONDS = 300
+    KEEPALIVE_TIMEOUT_SECONDS = 30
+
+    EXTERNAL_TIMEOUT = aiohttp.ClientTimeout(total=60, connect=10, sock_read=30)
+    INTERNAL_TIMEOUT = aiohttp.ClientTimeout(total=None, connect=10)
+
+    def __init__(self):
+        self._sessions: Dict[
+            str, Tuple[aiohttp.ClientSession, asyncio.AbstractEventLoop]
+        ] = {}
+
+    def get_session(self, internal: bool = False) -> aiohttp.ClientSession:
+        """Must be called from inside the running event loop."""
+        name = "internal" if internal else "external"
+        loop = asyncio.get_running_loop()
+
+        session, session_loop = self._sessions.get(name, (None, None))
+        # Sessions are bound to the loop they were created on
+        if session is None or session.closed or session_loop is not loop:
+            session = self._create_session(internal)
+            self._sessions[name] = (session, loop)
+        return session
+
+    def _create_session(self, internal: bool) -> aiohttp.ClientSession:
+        connector = aiohttp.TCPConnector(
+            limit=self.LIMIT,
+            limit_per_host=self.LIMIT_PER_HOST,
+            ttl_dns_cache=self.DNS_CACHE_TTL_SECONDS,
+            keepalive_timeout=self.KEEPALIVE_TIMEOUT_SECONDS,
+        )
+        return aiohttp.ClientSession(
+            connector=connector,
+            timeout=self.INTERNAL_TIMEOUT if internal else self.EXTERNAL_TIMEOUT,
+            trust_env=not internal,
+        )
+
+    async def close(self):
+        sessions = list(self._sessions.values())
+        self._sessions.clear()
+        current_loop = asyncio.get_running_loop()
+        for session, loop in sessions:
+            if loop is current_loop and not session.closed:
+                await session.close()
+
+
+HTTP_CLIENT_SERVICE = HttpClientService()
@@ -1,56 +1,378 @@
 import asyncio
 import json
-import chromadb
-from chromadb.config import Settings
-from chromadb.utils.embedding_functions import ONNXMiniLM_L6_V2
+import os
+import threading
+import time
+import uuid
+from typing import List, Optional, Set, Tuple
 
+import numpy as np
+
+from utils.get_env import (
+    get_icon_index_backend_env,
+    get_icon_index_warm_up_env,
+    get_icon_search_cache_size_env,
+)
+from utils.file_utils import get_file_sha256
+from utils.lru_cache import LruCache
+from utils.parsers import normalize_text, parse_bool_or_none
+
+
+PLACEHOLDER_ICON_URL = "/static/icons/placeholder.svg"
+ICON_INDEX_DIRECTORY = "icon_index"
+ICONS_FILE_PATH = "assets/icons.json"
+DEFAULT_SEARCH_CACHE_SIZE = 4096
+
+
+def get_search_cache_size() -> int:
+    return int(get_icon_search_cache_size_env() or DEFAULT_SEARCH_CACHE_SIZE)
+
+
+def get_icon_documents() -> Tuple[List[str], List[str]]:
+    """Returns ids and searchable text of the bold icon variants."""
+    with open(ICONS_FILE_PATH, "r") as f:
+        icons = json.load(f)
+
+    documents = []
+    ids = []
+    for each in icons["icons"]:
+        if each["name"].split("-")[-1] == "bold":
+            documents.append(f"{each['name']} {each['tags']}")
+            ids.append(each["name"])
+    return ids, documents
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.maximum(norms, 1e-12)
+
+
+class ChromaIconIndex:
+    """Icons collection persisted by ChromaDB under chroma/ and queried by HNSW."""
+
+    collection_name = "icons"
+
+    def __init__(self, embedding_function):
+        import chromadb
+        from chromadb.config import Settings
 
-class IconFinderService:
-    def __init__(self):
-        self.collection_name = "icons"
         self.client = chromadb.PersistentClient(
             path="chroma", settings=Settings(anonymized_telemetry=False)
         )
-        print("Initializing icons collection...")
-        self._initialize_icons_collection()
-        print("Icons collection initialized.")
-
-    def _initialize_icons_collection(self):
-        self.embedding_function = ONNXMiniLM_L6_V2()
-        self.embedding_function.DOWNLOAD_PATH = "chroma/models"
-        self.embedding_function._download_model_if_not_exists()
         try:
             self.collection = self.client.get_collection(
-                self.collection_name, embedding_function=self.embedding_function
+                self.collection_name, embedding_function=embedding_function
             )
         except Exception:
-            with open("assets/icons.json", "r") as f:
-                icons = json.load(f)
+            ids, documents = get_icon_documents()
+            self.collection = self.client.create_collection(
+                name=self.collection_name,
+                embedding_function=embedding_function,
+                metadata={"hnsw:space": "cosine"},
+            )
+            if documents:
+                self.collection.add(documents=documents, ids=ids)
 
-            documents = []
-            ids = []
+    def count(self) -> int:
+        return self.collection.count()
 
-            for i, each in enumerate(icons["icons"]):
-                if each["name"].split("-")[-1] == "bold":
-                    doc_text = f"{each['name']} {each['tags']}"
-                    documents.append(doc_text)
-                    ids.append(each["name"])
+    def query(self, queries: List[str], n_results: int) -> List[List[str]]:
+        return self.collection.query(query_texts=queries, n_results=n_results)["ids"]
 
-            if documents:
-                self.collection = self.client.create_collection(
-                    name=self.collection_name,
-                    embedding_function=self.embedding_function,
-                    metadata={"hnsw:space": "cosine"},
-                )
-                self.collection.add(documents=documents, ids=ids)
 
-    async def search_icons(self, query: str, k: int = 1):
-        result = await asyncio.to_thread(
-            self.collection.query,
-            query_texts=[query],
-            n_results=k,
+class NumpyIconIndex:
+    """
+    Normalized icon embeddings stored as a float16 matrix and memory-mapped,
+    so worker processes share the same pages. A batch of queries is answered
+    with one matrix product, cosine similarity being a dot product of
+    normalized vectors.
+
+    The index is usually prebuilt into the image with build_icon_index.py.
+    Its manifest records the checksum of assets/icons.json and the embedding
+    model, and the index is only rebuilt when either no longer matches.
+    """
+
+    # Bump when the stored layout changes
+    FORMAT_VERSION = 1
+    EMBEDDING_BATCH_SIZE = 256
+
+    def __init__(self, directory: str, embedding_function):
+        self.directory = directory
+        self.embedding_function = embedding_function
+        self.embeddings_path = os.path.join(directory, "embeddings.npy")
+        self.ids_path = os.path.join(directory, "ids.json")
+        self.manifest_path = os.path.join(directory, "manifest.json")
+        self.query_embeddings: LruCache[np.ndarray] = LruCache(
+            get_search_cache_size()
         )
-        return [f"/static/icons/bold/{each}.svg" for each in result["ids"][0]]
+
+    @property
+    def model_version(self) -> str:
+        name = getattr(self.embedding_function, "MODEL_NAME", None)
+        return name or type(self.embedding_function).__name__
+
+    def get_expected_manifest(self) -> dict:
+        return {
+            "format_version": self.FORMAT_VERSION,
+            "model": self.model_version,
+            "icons_checksum": get_file_sha256(ICONS_FILE_PATH),
+        }
+
+    def get_manifest(self) -> Optional[dict]:
+        try:
+            with open(self.manifest_path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def is_up_to_date(self) -> bool:
+        manifest = self.get_manifest()
+        if not manifest or not os.path.exists(self.embeddings_path):
+            return False
+        expected = self.get_expected_manifest()
+        if any(manifest.get(key) != value for key, value in expected.items()):
+            return False
+        return manifest.get("embeddings_checksum") == get_file_sha256(
+            self.embeddings_path
+        )
+
+    def load_or_build(self) -> bool:
+        """Loads the index, rebuilding it first if stale. Returns True if rebuilt."""
+        rebuilt = not self.is_up_to_date()
+        if rebuilt:
+            print("Icons index is missing or out of date, rebuilding...")
+            self.build(*get_icon_documents())
+        self.load()
+        return rebuilt
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        embeddings = []
+        for i in range(0, len(texts), self.EMBEDDING_BATCH_SIZE):
+            batch = texts[i : i + self.EMBEDDING_BATCH_SIZE]
+            embeddings.extend(self.embedding_function(batch))
+        return normalize_rows(np.array(embeddings, dtype=np.float32))
+
+    def embed_queries(self, queries: List[str]) -> np.ndarray:
+        vectors = {}
+        for query in queries:
+            vector = self.query_embeddings.get(query)
+            if vector is not None:
+                vectors[query] = vector
+        missing = [each for each in queries if each not in vectors]
+        if missing:
+            for query, vector in zip(missing, self.embed(missing)):
+                self.query_embeddings.set(query, vector)
+                vectors[query] = vector
+        return np.stack([vectors[each] for each in queries])
+
+    def build(self, ids: List[str], documents: List[str]):
+        os.makedirs(self.directory, exist_ok=True)
+        embeddings = self.embed(documents).astype(np.float16)
+        # Written under temporary names, so other workers never load a partial
+        # index. The manifest goes last, a crash leaves the index stale.
+        suffix = f".{uuid.uuid4().hex}.part"
+        with open(self.embeddings_path + suffix, "wb") as f:
+            np.save(f, embeddings)
+        with open(self.ids_path + suffix, "w") as f:
+            json.dump(ids, f)
+        manifest = {
+            **self.get_expected_manifest(),
+            "count": len(ids),
+            "dimensions": int(embeddings.shape[1]),
+            "embeddings_checksum": get_file_sha256(self.embeddings_path + suffix),
+        }
+        with open(self.manifest_path + suffix, "w") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(self.embeddings_path + suffix, self.embeddings_path)
+        os.replace(self.ids_path + suffix, self.ids_path)
+        os.replace(self.manifest_path + suffix, self.manifest_path)
+
+    def load(self):
+        self.embeddings = np.load(self.embeddings_path, mmap_mode="r")
+        with open(self.ids_path, "r") as f:
+            self.ids: List[str] = json.load(f)
+
+    def count(self) -> int:
+        return len(self.ids)
+
+    def query(self, queries: List[str], n_results: int) -> List[List[str]]:
+        k = min(n_results, len(self.ids))
+        if not k:
+            return [[] for _ in queries]
+        scores = self.embed_queries(queries) @ self.embeddings.T
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.take_along_axis(top, np.argsort(-top_scores, axis=1), axis=1)
+        return [[self.ids[i] for i in row] for row in order]
+
+
+class IconFinderService:
+    """
+    Finds icons by semantic similarity of the query to icon names and tags.
+
+    Nothing is loaded on import. The ONNX MiniLM model and the index
+    (ICON_INDEX_BACKEND, NumPy by default) are initialized on first use, or
+    in the background from the app lifespan unless ICON_INDEX_WARM_UP is false.
+    While the index is warming up, searches return a placeholder icon instead
+    of waiting for it.
+    """
+
+    # Lookups arriving within this window are embedded and queried together
+    BATCH_WINDOW_SECONDS = 0.005
+    MAX_BATCH_SIZE = 64
+
+    def __init__(self):
+        self.status = "not_started"
+        self.backend: Optional[str] = None
+        self.error: Optional[str] = None
+        self.warm_up_seconds: Optional[float] = None
+        self.results_cache: LruCache[List[str]] = LruCache(get_search_cache_size())
+        self._init_lock = threading.Lock()
+        self._warm_up_task: Optional[asyncio.Task] = None
+        self._pending: List[Tuple[str, int, asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._batch_tasks: Set[asyncio.Task] = set()
+
+    @property
+    def is_ready(self) -> bool:
+        return self.status == "ready"
+
+    def initialize(self):
+        """Loads the index. Blocking, safe to call from several threads."""
+        with self._init_lock:
+            if self.is_ready:
+                return
+            self.status = "warming_up"
+            started_at = time.perf_counter()
+            try:
+                self.backend = get_icon_index_backend_env() or "numpy"
+                print(f"Initializing icons index ({self.backend})...")
+                self._load_embedding_function()
+                if self.backend == "chroma":
+                    self.index = ChromaIconIndex(self.embedding_function)
+                else:
+                    self.index = NumpyIconIndex(
+                        ICON_INDEX_DIRECTORY, self.embedding_function
+                    )
+                    self.index.load_or_build()
+                print("Icons index initialized.")
+            except Exception as e:
+                self.status = "failed"
+                self.error = str(e)
+                raise
+            self.warm_up_seconds = time.perf_counter() - started_at
+            self.error = None
+            self.status = "ready"
+
+    def _load_embedding_function(self):
+        from chromadb.utils.embedding_functions import ONNXMiniLM_L6_V2
+
+        self.embedding_function = ONNXMiniLM_L6_V2()
+        self.embedding_function.DOWNLOAD_PATH = "chroma/models"
+        self.embedding_function._download_model_if_not_exists()
+
+    def build_numpy_index(self, force: bool = False) -> NumpyIconIndex:
+        """Builds the NumPy index ahead of time, see build_icon_index.py."""
+        self._load_embedding_function()
+        index = NumpyIconIndex(ICON_INDEX_DIRECTORY, self.embedding_function)
+        if force or not index.is_up_to_date():
+            index.build(*get_icon_documents())
+        return index
+
+    def get_embedding_function(self):
+        """Returns the MiniLM embedding function, initializing it if needed. Blocking."""
+        self.initialize()
+        return self.embedding_function
+
+    def start_warm_up(self):
+        """Must be called from inside the running event loop."""
+        if self.is_ready or (self._warm_up_task and not self._warm_up_task.done()):
+            return
+        self._warm_up_task = asyncio.create_task(self._warm_up())
+
+    def start_warm_up_if_enabled(self):
+        if parse_bool_or_none(get_icon_index_warm_up_env()) is False:
+            return
+        self.start_warm_up()
+
+    async def _warm_up(self):
+        try:
+            await asyncio.to_thread(self.initialize)
+        except Exception as e:
+            print(f"Error initializing icons index: {e}")
+
+    def get_status(self) -> dict:
+        status = {
+            "status": self.status,
+            "error": self.error,
+            "warm_up_seconds": self.warm_up_seconds,
+            "backend": self.backend,
+            "icons": self.index.count() if self.is_ready else None,
+            "results_cache": self.results_cache.get_stats(),
+        }
+        if self.is_ready and isinstance(self.index, NumpyIconIndex):
+            status["query_embeddings_cache"] = self.index.query_embeddings.get_stats()
+        return status
+
+    async def search_icons(self, query: str, k: int = 1):
+        """
+        Icon queries of a whole deck (or of concurrent decks) usually arrive
+        together, so they are collected for BATCH_WINDOW_SECONDS and resolved
+        with a single embedding pass and index query.
+
+        The same short queries repeat a lot, so results are kept in an LRU
+        cache keyed by normalized query and k.
+        """
+        if not self.is_ready:
+            self.start_warm_up()
+            return [PLACEHOLDER_ICON_URL]
+
+        query = normalize_text(query) or query
+        ids = self.results_cache.get((query, k))
+        if ids is None:
+            ids = await self._enqueue(query, k)
+            self.results_cache.set((query, k), ids)
+        return [f"/static/icons/bold/{each}.svg" for each in ids]
+
+    async def _enqueue(self, query: str, k: int) -> List[str]:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((query, k, future))
+        if len(self._pending) >= self.MAX_BATCH_SIZE:
+            self._flush()
+        elif not self._flush_handle:
+            self._flush_handle = loop.call_later(
+                self.BATCH_WINDOW_SECONDS, self._flush
+            )
+        return await future
+
+    def _flush(self):
+        if self._flush_handle:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        task = asyncio.create_task(self._query_batch(batch))
+        self._batch_tasks.add(task)
+        task.add_done_callback(self._batch_tasks.discard)
+
+    async def _query_batch(self, batch: List[Tuple[str, int, asyncio.Future]]):
+        queries = list(dict.fromkeys(query for query, _, _ in batch))
+        try:
+            ids = await asyncio.to_thread(
+                self.index.query, queries, max(k for _, k, _ in batch)
+            )
+        except Exception as e:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        ids_by_query = dict(zip(queries, ids))
+        for query, k, future in batch:
+            if not future.done():
+                future.set_result(ids_by_query[query][:k])
 
 
 ICON_FINDER_SERVICE = IconFinderService()
@@ -0,0 +1,126 @@
+import math
+import os
+import uuid
+from typing import Optional
+
+from PIL import Image
+
+from services.media_service import is_content_addressed_filename
+from utils.asset_directory_utils import get_derivatives_directory
+from utils.file_utils import get_file_sha256
+from utils.get_env import get_app_data_directory_env, get_image_derivative_scale_env
+
+
+DEFAULT_SCALE = 2.0
+
+# Formats that can be resized without losing anything (GIF may be animated)
+_RESIZABLE_FORMATS = {"JPEG", "PNG", "WEBP", "BMP", "TIFF", "MPO"}
+
+_EXTENSIONS = {"jpeg": ".jpg", "png": ".png", "webp": ".webp"}
+
+
+class ImageDerivativeService:
+    """
+    Produces right-sized copies of images for the box they are rendered in.
+
+    A derivative is the smallest aspect-preserving downscale that still covers
+    the box at IMAGE_DERIVATIVE_SCALE pixels per point, so object-fit, clip
+    and cover transforms keep full quality. Derivatives are cached on disk
+    keyed by source content hash, target size and format. Images that are
+    already small enough, or cannot be decoded, are returned unchanged.
+    """
+
+    JPEG_QUALITY = 85
+    WEBP_QUALITY = 80
+
+    @property
+    def scale(self) -> float:
+        return float(get_image_derivative_scale_env() or DEFAULT_SCALE)
+
+    def get_source_hash(self, source_path: str) -> str:
+        filename = os.path.basename(source_path)
+        # Content addressed files are already named by their hash
+        if is_content_addressed_filename(filename):
+            return os.path.splitext(filename)[0]
+
+        return get_file_sha256(source_path)
+
+    def get_derivative_path(
+        self,
+        source_path: str,
+        width: float,
+        height: float,
+        format: Optional[str] = None,
+    ) -> str:
+        """
+        Returns the path of a derivative of source_path for a box of
+        width x height points, or source_path when no derivative is needed.
+        Format is "jpeg", "png" or "webp"; by default JPEG is used for opaque
+        images and PNG for images with transparency.
+        """
+        if width <= 0 or height <= 0 or not os.path.isfile(source_path):
+            return source_path
+        # Derivatives are stored under APP_DATA_DIRECTORY, without it the
+        # original is used
+        if not get_app_data_directory_env():
+            return source_path
+        target_width = math.ceil(width * self.scale)
+        target_height = math.ceil(height * self.scale)
+
+        try:
+            with Image.open(source_path) as image:
+                if image.format not in _RESIZABLE_FORMATS:
+                    return source_path
+
+                factor = max(target_width / image.width, target_height / image.height)
+                if factor >= 1 and (not format or format == image.format.lower()):
+                    return source_path
+
+                size = (
+                    min(image.width, math.ceil(image.width * factor)),
+                    min(image.height, math.ceil(image.height * factor)),
+                )
+                has_alpha = image.mode in ("RGBA", "LA", "PA") or (
+                    image.mode == "P" and "transparency" in image.info
+                )
+                format = format or ("png" if has_alpha else "jpeg")
+
+                derivative_path = os.path.join(
+                    get_derivatives_directory(),
+                    f"{self.get_source_hash(source_path)}_{size[0]}x{size[1]}"
+                    f"{_EXTENSIONS[format]}",
+                )
+                if os.path.exists(derivative_path):
+                    return derivative_path
+
+                # Lets JPEG decode at a reduced scale, much cheaper for huge photos
+                image.draft("RGB", size)
+                image = image.convert("RGBA" if has_alpha else "RGB")
+                if image.size != size:
+                    image = image.resize(size, Image.LANCZOS)
+                self._save_atomically(image, derivative_path, format)
+                return derivative_path
+        except Exception as e:
+            print(f"Could not create derivative of {source_path}: {e}")
+            return source_path
+
+    def _save_atomically(self, image: Image.Image, path: str, format: str):
+        temp_path = os.path.join(os.path.dirname(path), f".{uuid.uuid4().hex}.part")
+        try:
+            if format == "jpeg":
+                if image.mode != "RGB":
+                    image = image.convert("RGB")
+                image.save(
+                    temp_path, "JPEG", quality=self.JPEG_QUALITY, optimize=True
+                )
+            elif format == "webp":
+                image.save(temp_path, "WEBP", quality=self.WEBP_QUALITY)
+            else:
+                image.save(temp_path, "PNG", optimize=True)
+            os.replace(temp_path, path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+
+IMAGE_DERIVATIVE_SERVICE = ImageDerivativeService()
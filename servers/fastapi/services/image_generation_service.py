@@ -1,11 +1,17 @@
 import asyncio
 import os
-import aiohttp
+from typing import Dict, List, Optional
 from google import genai
 from google.genai.types import GenerateContentConfig
 from openai import AsyncOpenAI
+from enums.image_provider import ImageProvider
 from models.image_prompt import ImagePrompt
 from models.sql.image_asset import ImageAsset
+from services.asset_fetch_scheduler_service import ASSET_FETCH_SCHEDULER_SERVICE
+from services.generated_image_index_service import GENERATED_IMAGE_INDEX_SERVICE
+from services.http_client_service import HTTP_CLIENT_SERVICE
+from services.image_search_cache_service import IMAGE_SEARCH_CACHE_SERVICE
+from services.media_service import finalize_local_path, get_media_file_path
 from utils.download_helpers import download_file
 from utils.get_env import get_pexels_api_key_env
 from utils.get_env import get_pixabay_api_key_env
@@ -14,15 +20,20 @@ from utils.image_provider import (
     is_pixabay_selected,
     is_gemini_flash_selected,
     is_dalle3_selected,
+    get_selected_image_provider,
 )
 import uuid
 
 
+STOCK_SEARCH_RESULTS_PER_PAGE = 10
+
+
 class ImageGenerationService:
 
     def __init__(self, permanent_storage_path: str, temp_dir: str):
         self.permanent_storage_path = permanent_storage_path
         self.temp_dir = temp_dir
+        self.search_result_usage: Dict[str, int] = {}
         # FIX #1: Add this line back to set up the generation function.
         self.image_gen_func = self.get_image_gen_func()
 
@@ -40,13 +51,16 @@ class ImageGenerationService:
     def is_stock_provider_selected(self):
         return is_pixels_selected() or is_pixabay_selected()
 
-    async def generate_image(self, prompt: ImagePrompt) -> str | ImageAsset:
+    async def generate_image(
+        self, prompt: ImagePrompt, priority: int = 0
+    ) -> str | ImageAsset:
         """
         Generates an image based on the provided prompt.
         - If no image generation function is available, returns a placeholder image.
         - If the stock provider is selected, it uses the prompt directly,
         otherwise it uses the full image prompt with theme.
         - Output Directory is used for saving the generated image not the stock provider.
+        - Lower priority values are fetched first when the provider is busy.
         """
         if not self.image_gen_func:
             print("No image generation function found. Using placeholder image.")
@@ -61,19 +75,19 @@ class ImageGenerationService:
             if self.is_stock_provider_selected():
                 # For stock photos (Pexels, Pixabay), we just get a URL.
                 # The file will be downloaded to the temp_dir later.
-                image_path = await self.image_gen_func(image_prompt)
+                image_path = await self.image_gen_func(image_prompt, priority)
             else:
-                # FIX #2: Pass self.temp_dir, NOT self.output_directory
-                # This ensures AI-generated images are also saved to the temporary, cleanable directory.
-                image_path = await self.image_gen_func(image_prompt, self.temp_dir)
+                reused_path = await GENERATED_IMAGE_INDEX_SERVICE.find(prompt)
+                if reused_path:
+                    print(f"Reusing generated image {reused_path}")
+                    return finalize_local_path(reused_path) or reused_path
+                image_path = await self.generate_ai_image(image_prompt, priority)
 
             if image_path:
                 if image_path.startswith("http"):
                     return image_path
                 elif os.path.exists(image_path):
-                    # FIX #3: When creating an ImageAsset, the path is the temporary path.
-                    # The permanent path will be handled when the asset is moved later.
-                    return ImageAsset(
+                    image_asset = ImageAsset(
                         path=image_path,
                         is_uploaded=False,
                         extras={
@@ -81,12 +95,33 @@ class ImageGenerationService:
                             "theme_prompt": prompt.theme_prompt,
                         },
                     )
+                    GENERATED_IMAGE_INDEX_SERVICE.register(image_asset)
+                    return image_asset
             raise Exception(f"Image not found at {image_path}")
 
         except Exception as e:
             print(f"Error generating image: {e}")
             return "/static/images/placeholder.jpg"
 
+    async def generate_ai_image(self, prompt: str, priority: int = 0) -> Optional[str]:
+        """
+        Runs AI image generation through the shared asset fetch scheduler and
+        moves the result into permanent media storage right away.
+        Identical prompts already being generated for another presentation are
+        joined, so the result may live in another job's temp dir and has to be
+        stored before that job cleans up.
+        """
+        image_path = await ASSET_FETCH_SCHEDULER_SERVICE.run_for_provider(
+            get_selected_image_provider().value,
+            lambda: self.image_gen_func(prompt, self.temp_dir),
+            priority=priority,
+            dedup_key=prompt,
+        )
+        if image_path:
+            stored_path = get_media_file_path(finalize_local_path(image_path))
+            image_path = stored_path or image_path
+        return image_path
+
     async def generate_image_openai(self, prompt: str, output_directory: str) -> str:
         client = AsyncOpenAI()
         result = await client.images.generate(
@@ -120,31 +155,73 @@ class ImageGenerationService:
 
         return image_path
 
-    async def get_image_from_pexels(self, prompt: str) -> str:
-        async with aiohttp.ClientSession(trust_env=True) as session:
-            response = await session.get(
-                f"https://api.pexels.com/v1/search?query={prompt}&per_page=1",
-                headers={"Authorization": f"{get_pexels_api_key_env()}"},
+    def pick_search_result(self, provider: str, prompt: str, image_urls: List[str]):
+        """
+        Rotates through cached search results so repeated prompts within the
+        same presentation get different photos.
+        """
+        key = IMAGE_SEARCH_CACHE_SERVICE.get_key(provider, prompt)
+        index = self.search_result_usage.get(key, 0)
+        self.search_result_usage[key] = index + 1
+        return image_urls[index % len(image_urls)]
+
+    async def get_image_from_pexels(self, prompt: str, priority: int = 0) -> str:
+        provider = ImageProvider.PEXELS.value
+        image_urls = await IMAGE_SEARCH_CACHE_SERVICE.get(provider, prompt)
+        if not image_urls:
+            image_urls = await ASSET_FETCH_SCHEDULER_SERVICE.run_for_provider(
+                provider,
+                lambda: self.search_pexels(prompt),
+                priority=priority,
+                dedup_key=IMAGE_SEARCH_CACHE_SERVICE.normalize_query(prompt),
             )
+            await IMAGE_SEARCH_CACHE_SERVICE.set(provider, prompt, image_urls)
+        return self.pick_search_result(provider, prompt, image_urls)
+
+    async def search_pexels(self, prompt: str) -> List[str]:
+        session = HTTP_CLIENT_SERVICE.get_session()
+        async with session.get(
+            "https://api.pexels.com/v1/search",
+            params={"query": prompt, "per_page": STOCK_SEARCH_RESULTS_PER_PAGE},
+            headers={"Authorization": f"{get_pexels_api_key_env()}"},
+        ) as response:
+            response.raise_for_status()
             data = await response.json()
-            if data.get("photos") and len(data["photos"]) > 0:
-                image_url = data["photos"][0]["src"]["large"]
-                return image_url
-            else:
-                raise Exception("No photos found on Pexels for the given prompt.")
-
-
-    async def get_image_from_pixabay(self, prompt: str) -> str:
-        async with aiohttp.ClientSession(trust_env=True) as session:
-            response = await session.get(
-                f"https://pixabay.com/api/?key={get_pixabay_api_key_env()}&q={prompt}&image_type=photo&per_page=3"
+        if data.get("photos") and len(data["photos"]) > 0:
+            return [photo["src"]["large"] for photo in data["photos"]]
+        else:
+            raise Exception("No photos found on Pexels for the given prompt.")
+
+    async def get_image_from_pixabay(self, prompt: str, priority: int = 0) -> str:
+        provider = ImageProvider.PIXABAY.value
+        image_urls = await IMAGE_SEARCH_CACHE_SERVICE.get(provider, prompt)
+        if not image_urls:
+            image_urls = await ASSET_FETCH_SCHEDULER_SERVICE.run_for_provider(
+                provider,
+                lambda: self.search_pixabay(prompt),
+                priority=priority,
+                dedup_key=IMAGE_SEARCH_CACHE_SERVICE.normalize_query(prompt),
             )
+            await IMAGE_SEARCH_CACHE_SERVICE.set(provider, prompt, image_urls)
+        return self.pick_search_result(provider, prompt, image_urls)
+
+    async def search_pixabay(self, prompt: str) -> List[str]:
+        session = HTTP_CLIENT_SERVICE.get_session()
+        async with session.get(
+            "https://pixabay.com/api/",
+            params={
+                "key": get_pixabay_api_key_env(),
+                "q": prompt,
+                "image_type": "photo",
+                "per_page": STOCK_SEARCH_RESULTS_PER_PAGE,
+            },
+        ) as response:
+            response.raise_for_status()
             data = await response.json()
-            if data.get("hits") and len(data["hits"]) > 0:
-                image_url = data["hits"][0]["largeImageURL"]
-                return image_url
-            else:
-                raise Exception("No hits found on Pixabay for the given prompt.")
+        if data.get("hits") and len(data["hits"]) > 0:
+            return [hit["largeImageURL"] for hit in data["hits"]]
+        else:
+            raise Exception("No hits found on Pixabay for the given prompt.")
 
 
 
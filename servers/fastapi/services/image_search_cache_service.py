@@ -0,0 +1,121 @@
+from datetime import timedelta, timezone
+from typing import List, Optional
+
+from sqlalchemy import delete, func
+from sqlmodel import select
+
+from models.sql.image_search_cache import ImageSearchCacheModel
+from services.database import async_session_maker
+from utils.datetime_utils import get_current_utc_datetime
+from utils.get_env import (
+    get_image_search_cache_max_entries_env,
+    get_image_search_cache_ttl_hours_env,
+)
+from utils.parsers import normalize_text
+
+
+DEFAULT_TTL_HOURS = 24 * 7
+DEFAULT_MAX_ENTRIES = 10000
+
+
+class ImageSearchCacheService:
+    """
+    Persists stock image search results (Pexels, Pixabay) keyed by provider
+    and normalized query. Entries expire after IMAGE_SEARCH_CACHE_TTL_HOURS and
+    the oldest entries are evicted beyond IMAGE_SEARCH_CACHE_MAX_ENTRIES.
+    Cache failures never fail image generation, they only count as misses.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def ttl(self) -> timedelta:
+        return timedelta(
+            hours=float(get_image_search_cache_ttl_hours_env() or DEFAULT_TTL_HOURS)
+        )
+
+    @property
+    def max_entries(self) -> int:
+        return int(get_image_search_cache_max_entries_env() or DEFAULT_MAX_ENTRIES)
+
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        return normalize_text(query)
+
+    def get_key(self, provider: str, query: str) -> str:
+        return f"{provider}:{self.normalize_query(query)}"
+
+    async def get(self, provider: str, query: str) -> Optional[List[str]]:
+        try:
+            async with async_session_maker() as sql_session:
+                entry = await sql_session.get(
+                    ImageSearchCacheModel, self.get_key(provider, query)
+                )
+        except Exception as e:
+            print(f"Error reading image search cache: {e}")
+            entry = None
+
+        if entry and entry.results and not self._is_expired(entry):
+            self.hits += 1
+            return entry.results
+
+        self.misses += 1
+        return None
+
+    async def set(self, provider: str, query: str, results: List[str]):
+        if not results:
+            return
+        try:
+            async with async_session_maker() as sql_session:
+                await sql_session.merge(
+                    ImageSearchCacheModel(
+                        id=self.get_key(provider, query),
+                        provider=provider,
+                        query=self.normalize_query(query),
+                        results=results,
+                        created_at=get_current_utc_datetime(),
+                    )
+                )
+                await sql_session.commit()
+                await self._evict(sql_session)
+        except Exception as e:
+            print(f"Error writing image search cache: {e}")
+
+    async def _evict(self, sql_session):
+        count = await sql_session.scalar(
+            select(func.count()).select_from(ImageSearchCacheModel)
+        )
+        overflow = (count or 0) - self.max_entries
+        if overflow <= 0:
+            return
+        oldest_ids = await sql_session.scalars(
+            select(ImageSearchCacheModel.id)
+            .order_by(ImageSearchCacheModel.created_at)
+            .limit(overflow)
+        )
+        await sql_session.execute(
+            delete(ImageSearchCacheModel).where(
+                ImageSearchCacheModel.id.in_(list(oldest_ids))
+            )
+        )
+        await sql_session.commit()
+
+    def _is_expired(self, entry: ImageSearchCacheModel) -> bool:
+        created_at = entry.created_at
+        # SQLite returns naive datetimes
+        if created_at.tzinfo is None:
+            created_at = created_at.replace(tzinfo=timezone.utc)
+        return created_at + self.ttl < get_current_utc_datetime()
+
+    def get_stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+IMAGE_SEARCH_CACHE_SERVICE = ImageSearchCacheService()
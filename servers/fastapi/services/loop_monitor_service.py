@@ -0,0 +1,207 @@
+import asyncio
+from collections import deque
+import os
+import sys
+import threading
+import time
+import traceback
+from typing import Deque, Dict, List, Optional
+
+from utils.get_env import get_loop_monitor_env, get_loop_monitor_threshold_ms_env
+from utils.parsers import parse_bool_or_none
+
+
+APP_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class LoopMonitorService:
+    """
+    Detects callbacks that block the event loop.
+
+    A heartbeat coroutine wakes up every `interval_ms` and records how late it
+    was scheduled (loop lag). A watchdog thread checks the heartbeat and, when
+    it has been stale for longer than `threshold_ms`, captures the stack of the
+    event loop thread. Blocking events are aggregated per code location.
+    """
+
+    def __init__(
+        self,
+        threshold_ms: float = 100,
+        interval_ms: float = 20,
+        max_lag_samples: int = 10000,
+    ):
+        self.threshold_ms = threshold_ms
+        self.interval_ms = interval_ms
+
+        self._lock = threading.Lock()
+        self._lag_samples: Deque[float] = deque(maxlen=max_lag_samples)
+        self._blocking_locations: Dict[str, dict] = {}
+
+        self._loop_thread_id: Optional[int] = None
+        self._last_heartbeat = 0.0
+        self._pending_stack: Optional[List[traceback.FrameSummary]] = None
+        self._heartbeat_task: Optional[asyncio.Task] = None
+        self._watchdog_thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._started_at: Optional[float] = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._heartbeat_task is not None and not self._heartbeat_task.done()
+
+    def start_if_enabled(self):
+        if not parse_bool_or_none(get_loop_monitor_env()):
+            return
+        threshold_ms = get_loop_monitor_threshold_ms_env()
+        if threshold_ms:
+            self.threshold_ms = float(threshold_ms)
+        self.start()
+
+    def start(self):
+        """Must be called from inside the running event loop."""
+        if self.is_running:
+            return
+
+        self._loop_thread_id = threading.get_ident()
+        self._last_heartbeat = time.monotonic()
+        self._started_at = time.time()
+        self._stop_event.clear()
+
+        self._heartbeat_task = asyncio.create_task(self._heartbeat())
+        self._watchdog_thread = threading.Thread(
+            target=self._watch, name="loop-monitor", daemon=True
+        )
+        self._watchdog_thread.start()
+        print(f"Event loop monitor started with threshold {self.threshold_ms} ms")
+
+    async def stop(self):
+        self._stop_event.set()
+        if self._heartbeat_task:
+            self._heartbeat_task.cancel()
+            try:
+                await self._heartbeat_task
+            except asyncio.CancelledError:
+                pass
+            self._heartbeat_task = None
+        if self._watchdog_thread:
+            await asyncio.to_thread(self._watchdog_thread.join)
+            self._watchdog_thread = None
+
+    def reset(self):
+        with self._lock:
+            self._lag_samples.clear()
+            self._blocking_locations.clear()
+            self._started_at = time.time()
+
+    async def _heartbeat(self):
+        interval = self.interval_ms / 1000
+        while True:
+            expected_at = time.monotonic() + interval
+            await asyncio.sleep(interval)
+            now = time.monotonic()
+            lag_ms = max(0.0, (now - expected_at) * 1000)
+
+            with self._lock:
+                self._last_heartbeat = now
+                self._lag_samples.append(lag_ms)
+                pending_stack = self._pending_stack
+                self._pending_stack = None
+
+            if pending_stack is not None:
+                self._record_blocking_event(pending_stack, lag_ms)
+
+    def _watch(self):
+        interval = self.interval_ms / 1000
+        while not self._stop_event.wait(interval):
+            with self._lock:
+                last_heartbeat = self._last_heartbeat
+                stalled_ms = (time.monotonic() - last_heartbeat) * 1000
+                already_captured = self._pending_stack is not None
+
+            if already_captured or stalled_ms < self.threshold_ms:
+                continue
+
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            stack = traceback.extract_stack(frame)
+            del frame
+
+            with self._lock:
+                # Heartbeat may have resumed while the stack was being captured
+                if self._last_heartbeat == last_heartbeat:
+                    self._pending_stack = stack
+
+    def _get_blocking_frame(
+        self, stack: List[traceback.FrameSummary]
+    ) -> traceback.FrameSummary:
+        """Innermost frame that belongs to this app, else innermost frame."""
+        for frame in reversed(stack):
+            filename = os.path.abspath(frame.filename)
+            if (
+                filename.startswith(APP_ROOT)
+                and "site-packages" not in filename
+                and filename != os.path.abspath(__file__)
+            ):
+                return frame
+        return stack[-1]
+
+    def _record_blocking_event(
+        self, stack: List[traceback.FrameSummary], duration_ms: float
+    ):
+        frame = self._get_blocking_frame(stack)
+        location = (
+            f"{os.path.relpath(frame.filename, APP_ROOT)}:{frame.lineno} "
+            f"({frame.name})"
+        )
+        with self._lock:
+            entry = self._blocking_locations.get(location)
+            if not entry:
+                entry = {
+                    "location": location,
+                    "count": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "last_seen_at": None,
+                    "stack": [],
+                }
+                self._blocking_locations[location] = entry
+            entry["count"] += 1
+            entry["total_ms"] += duration_ms
+            entry["last_seen_at"] = time.time()
+            if duration_ms >= entry["max_ms"]:
+                entry["max_ms"] = duration_ms
+                entry["stack"] = traceback.format_list(stack)
+
+    def get_report(self) -> dict:
+        with self._lock:
+            lag_samples = sorted(self._lag_samples)
+            locations = [dict(each) for each in self._blocking_locations.values()]
+
+        locations.sort(key=lambda x: x["total_ms"], reverse=True)
+
+        def percentile(p: float) -> float:
+            if not lag_samples:
+                return 0.0
+            index = min(len(lag_samples) - 1, int(round(p * (len(lag_samples) - 1))))
+            return lag_samples[index]
+
+        return {
+            "running": self.is_running,
+            "started_at": self._started_at,
+            "threshold_ms": self.threshold_ms,
+            "interval_ms": self.interval_ms,
+            "lag": {
+                "samples": len(lag_samples),
+                "mean_ms": (
+                    sum(lag_samples) / len(lag_samples) if lag_samples else 0.0
+                ),
+                "p50_ms": percentile(0.5),
+                "p99_ms": percentile(0.99),
+                "max_ms": lag_samples[-1] if lag_samples else 0.0,
+            },
+            "blocking_locations": locations,
+        }
+
+
+LOOP_MONITOR_SERVICE = LoopMonitorService()
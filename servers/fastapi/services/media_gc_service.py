@@ -0,0 +1,176 @@
+import asyncio
+import json
+import os
+import time
+from typing import List, Optional, Set
+
+from sqlalchemy import delete
+from sqlmodel import select
+
+from models.sql.image_asset import ImageAsset
+from models.sql.media_url import MediaUrlModel
+from models.sql.presentation_layout_code import PresentationLayoutCodeModel
+from models.sql.slide import SlideModel
+from services.database import async_session_maker
+from services.media_service import (
+    CONTENT_ADDRESSED_FILENAME_RE,
+    get_media_images_directory,
+    is_content_addressed_filename,
+)
+from utils.asset_directory_utils import get_derivatives_directory
+from utils.get_env import get_media_gc_interval_hours_env
+
+
+DEFAULT_INTERVAL_HOURS = 24
+
+
+class MediaGarbageCollectorService:
+    """
+    Deletes content-addressed media files that are no longer referenced.
+
+    References are collected by scanning slide content, slide html, layout
+    code and image assets for content-addressed filenames. Only files named
+    by their content hash are ever deleted, and only once they are older than
+    `min_age_seconds`, so images of presentations still being generated
+    survive until their slides are saved. Resized derivatives of deleted
+    files are deleted with them. Derivatives of other sources (uploads,
+    static and app data images) are keyed by a content hash that can't be
+    traced back to a file, so they are kept.
+    """
+
+    def __init__(self, min_age_seconds: float = 6 * 60 * 60):
+        self.min_age_seconds = min_age_seconds
+        self.last_result: Optional[dict] = None
+        self._task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def interval_hours(self) -> float:
+        interval_hours = get_media_gc_interval_hours_env()
+        if interval_hours is None or interval_hours == "":
+            return DEFAULT_INTERVAL_HOURS
+        return float(interval_hours)
+
+    def start_if_enabled(self):
+        if self.interval_hours <= 0 or self._task:
+            return
+        self._task = asyncio.create_task(self._run_periodically())
+
+    async def stop(self):
+        if not self._task:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run_periodically(self):
+        while True:
+            await asyncio.sleep(self.interval_hours * 60 * 60)
+            try:
+                result = await self.collect()
+                print(
+                    f"Media GC deleted {len(result['deleted'])} files, "
+                    f"freed {result['freed_bytes']} bytes"
+                )
+            except Exception as e:
+                print(f"Error collecting unreferenced media: {e}")
+
+    async def get_referenced_filenames(self) -> Set[str]:
+        referenced = set()
+        columns = [
+            SlideModel.content,
+            SlideModel.html_content,
+            PresentationLayoutCodeModel.layout_code,
+            ImageAsset.path,
+        ]
+        async with async_session_maker() as sql_session:
+            for column in columns:
+                rows = await sql_session.stream_scalars(
+                    select(column).execution_options(yield_per=500)
+                )
+                async for value in rows:
+                    if not value:
+                        continue
+                    text = value if isinstance(value, str) else json.dumps(value)
+                    referenced.update(CONTENT_ADDRESSED_FILENAME_RE.findall(text))
+        return referenced
+
+    def _delete_unreferenced(self, referenced: Set[str], dry_run: bool) -> dict:
+        images_dir = get_media_images_directory()
+        now = time.time()
+        scanned = 0
+        deleted: List[str] = []
+        deleted_hashes: Set[str] = set()
+        freed_bytes = 0
+
+        for entry in os.scandir(images_dir):
+            if not entry.is_file():
+                continue
+            is_partial = entry.name.startswith(".") and entry.name.endswith(".part")
+            if not is_partial:
+                if not is_content_addressed_filename(entry.name):
+                    continue
+                scanned += 1
+                if entry.name in referenced:
+                    continue
+
+            stat = entry.stat()
+            if now - stat.st_mtime < self.min_age_seconds:
+                continue
+
+            if not dry_run:
+                try:
+                    os.remove(entry.path)
+                except FileNotFoundError:
+                    continue
+            if not is_partial:
+                deleted.append(entry.name)
+                deleted_hashes.add(os.path.splitext(entry.name)[0])
+            freed_bytes += stat.st_size
+
+        deleted_derivatives = 0
+        for entry in os.scandir(get_derivatives_directory()):
+            # Derivatives are named "{source hash}_{width}x{height}{ext}"
+            if not entry.is_file() or entry.name.split("_")[0] not in deleted_hashes:
+                continue
+            stat = entry.stat()
+            if not dry_run:
+                try:
+                    os.remove(entry.path)
+                except FileNotFoundError:
+                    continue
+            deleted_derivatives += 1
+            freed_bytes += stat.st_size
+
+        return {
+            "dry_run": dry_run,
+            "scanned": scanned,
+            "referenced": len(referenced),
+            "deleted": deleted,
+            "deleted_derivatives": deleted_derivatives,
+            "freed_bytes": freed_bytes,
+        }
+
+    async def collect(self, dry_run: bool = False) -> dict:
+        async with self._lock:
+            referenced = await self.get_referenced_filenames()
+            result = await asyncio.to_thread(
+                self._delete_unreferenced, referenced, dry_run
+            )
+            if result["deleted"] and not dry_run:
+                async with async_session_maker() as sql_session:
+                    await sql_session.execute(
+                        delete(MediaUrlModel).where(
+                            MediaUrlModel.filename.in_(result["deleted"])
+                        )
+                    )
+                    await sql_session.commit()
+            result["finished_at"] = time.time()
+            self.last_result = result
+            return result
+
+
+MEDIA_GC_SERVICE = MediaGarbageCollectorService()
@@ -1,14 +1,32 @@
+import hashlib
 import os
 import re
 import uuid
-import aiohttp
-from typing import Optional
-import shutil
+from typing import Dict, List, Optional
+from urllib.parse import unquote, urlparse
+
+from sqlmodel import select
+
+from models.sql.media_url import MediaUrlModel
+from services.asset_fetch_scheduler_service import ASSET_FETCH_SCHEDULER_SERVICE
+from services.database import async_session_maker
+from services.http_client_service import HTTP_CLIENT_SERVICE
 from utils.asset_directory_utils import get_uploads_directory
+from utils.datetime_utils import get_current_utc_datetime
+from utils.get_env import get_app_data_directory_env
 
 
 _SAFE_NAME_RE = re.compile(r"[^a-zA-Z0-9_.-]")
 
+# Files stored by this service are named "{sha256 of content}{ext}"
+CONTENT_ADDRESSED_FILENAME_RE = re.compile(r"[a-f0-9]{64}\.[a-z0-9]+")
+
+_CHUNK_SIZE = 64 * 1024
+
+STATIC_DIRECTORY = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'static'
+)
+
 
 def _infer_ext_from_url(url: str) -> str:
     try:
@@ -25,28 +43,133 @@ def _safe_filename(name: str) -> str:
     return _SAFE_NAME_RE.sub('_', name)
 
 
-async def download_to_storage(url: str) -> Optional[str]:
-    """
-    Downloads a remote image to local uploads/images and returns a public URL path
-    like /media/images/{filename}. Returns None on failure.
-    """
-    uploads = get_uploads_directory()
-    images_dir = os.path.join(uploads, 'images')
+def get_media_images_directory() -> str:
+    images_dir = os.path.join(get_uploads_directory(), 'images')
     os.makedirs(images_dir, exist_ok=True)
+    return images_dir
 
-    ext = _infer_ext_from_url(url)
-    filename = _safe_filename(f"{uuid.uuid4().hex}{ext}")
+
+def is_content_addressed_filename(filename: str) -> bool:
+    return CONTENT_ADDRESSED_FILENAME_RE.fullmatch(filename) is not None
+
+
+def _get_temp_path(images_dir: str) -> str:
+    # Dot-prefixed so partial files are never served or picked up as media
+    return os.path.join(images_dir, f".{uuid.uuid4().hex}.part")
+
+
+def _commit_temp_file(images_dir: str, temp_path: str, digest: str, ext: str) -> str:
+    """
+    Atomically moves a fully written temp file to its content-addressed name.
+    When the content already exists the temp file is discarded and the
+    existing file is touched, so garbage collection treats it as fresh.
+    """
+    filename = _safe_filename(f"{digest}{ext}")
     file_path = os.path.join(images_dir, filename)
+    if os.path.exists(file_path):
+        os.remove(temp_path)
+        os.utime(file_path)
+    else:
+        os.replace(temp_path, file_path)
+    return filename
+
+
+def _remove_if_exists(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _get_url_id(url: str) -> str:
+    return hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+
+async def _get_indexed_filenames(urls: List[str]) -> Dict[str, str]:
+    """Maps urls downloaded before to their stored filenames, in one query."""
+    if not urls:
+        return {}
+    url_ids = {_get_url_id(url): url for url in urls}
+    try:
+        async with async_session_maker() as sql_session:
+            entries = await sql_session.scalars(
+                select(MediaUrlModel).where(MediaUrlModel.id.in_(list(url_ids)))
+            )
+            entries = list(entries)
+    except Exception as e:
+        print(f"Error reading media url index: {e}")
+        return {}
+
+    images_dir = get_media_images_directory()
+    filenames = {}
+    for entry in entries:
+        file_path = os.path.join(images_dir, entry.filename)
+        if os.path.isfile(file_path):
+            os.utime(file_path)
+            filenames[url_ids[entry.id]] = entry.filename
+    return filenames
+
+
+async def _get_indexed_filename(url: str) -> Optional[str]:
+    return (await _get_indexed_filenames([url])).get(url)
+
+
+async def _index_url(url: str, filename: str):
+    try:
+        async with async_session_maker() as sql_session:
+            await sql_session.merge(
+                MediaUrlModel(
+                    id=_get_url_id(url),
+                    url=url,
+                    filename=filename,
+                    created_at=get_current_utc_datetime(),
+                )
+            )
+            await sql_session.commit()
+    except Exception as e:
+        print(f"Error writing media url index: {e}")
+
 
+async def _download(url: str) -> str:
+    """Downloads url into the content-addressed store and returns the filename."""
+    images_dir = get_media_images_directory()
+    temp_path = _get_temp_path(images_dir)
+    hasher = hashlib.sha256()
     try:
-        timeout = aiohttp.ClientTimeout(total=60)
-        async with aiohttp.ClientSession(timeout=timeout, trust_env=True) as session:
-            async with session.get(url) as resp:
-                if resp.status != 200:
-                    return None
-                with open(file_path, 'wb') as f:
-                    async for chunk in resp.content.iter_chunked(64 * 1024):
-                        f.write(chunk)
+        session = HTTP_CLIENT_SERVICE.get_session()
+        async with session.get(url) as resp:
+            resp.raise_for_status()
+            with open(temp_path, 'wb') as f:
+                async for chunk in resp.content.iter_chunked(_CHUNK_SIZE):
+                    hasher.update(chunk)
+                    f.write(chunk)
+        filename = _commit_temp_file(
+            images_dir, temp_path, hasher.hexdigest(), _infer_ext_from_url(url)
+        )
+    except BaseException:
+        _remove_if_exists(temp_path)
+        raise
+
+    await _index_url(url, filename)
+    return filename
+
+
+async def download_to_storage(url: str, priority: int = 0) -> Optional[str]:
+    """
+    Downloads a remote image to local uploads/images and returns a public URL path
+    like /api/local-image/{sha256}.{ext}. URLs that were downloaded before are
+    served from the url index without hitting the network, and identical
+    content is stored only once. Downloads go through the shared asset fetch
+    scheduler, lower priority values first. Returns None on failure.
+    """
+    indexed_filename = await _get_indexed_filename(url)
+    if indexed_filename:
+        return f"/api/local-image/{indexed_filename}"
+
+    try:
+        filename = await ASSET_FETCH_SCHEDULER_SERVICE.run_for_url(
+            url, lambda: _download(url), priority=priority, dedup_key=url
+        )
     except Exception:
         return None
 
@@ -54,6 +177,88 @@ async def download_to_storage(url: str) -> Optional[str]:
     return f"/api/local-image/{filename}"
 
 
+def get_media_file_path(url: str) -> Optional[str]:
+    """Returns the file behind a /api/local-image/ url, if it exists."""
+    if not url or not url.startswith('/api/local-image/'):
+        return None
+    filename = os.path.basename(url.split('?')[0])
+    file_path = os.path.join(get_media_images_directory(), filename)
+    return file_path if os.path.isfile(file_path) else None
+
+
+def _join_inside(base_dir: str, relative_path: str) -> Optional[str]:
+    base_dir = os.path.abspath(base_dir)
+    path = os.path.abspath(os.path.join(base_dir, relative_path.lstrip('/')))
+    if os.path.commonpath([base_dir, path]) != base_dir:
+        return None
+    return path
+
+
+def resolve_public_path(url: str) -> Optional[str]:
+    """
+    Maps urls served by this app to existing local files without any I/O
+    beyond a stat, with or without scheme and host:
+    /api/local-image/{name}, /app_data/{path} and /static/{path}.
+    """
+    if not url or not isinstance(url, str):
+        return None
+    if url.startswith('http://') or url.startswith('https://'):
+        url_path = unquote(urlparse(url).path)
+    else:
+        url_path = unquote(url.split('?')[0])
+
+    candidates = []
+    if url_path.startswith('/api/local-image/'):
+        candidates.append(
+            _join_inside(get_media_images_directory(), os.path.basename(url_path))
+        )
+    elif url_path.startswith('/app_data/'):
+        relative_path = url_path[len('/app_data/'):]
+        candidates.append(
+            _join_inside(get_app_data_directory_env() or '/app_data', relative_path)
+        )
+        # Docker serves APP_DATA_DIRECTORY at /app_data
+        candidates.append(_join_inside('/app_data', relative_path))
+    elif url_path.startswith('/static/'):
+        candidates.append(_join_inside(STATIC_DIRECTORY, url_path[len('/static/'):]))
+
+    for candidate in candidates:
+        if candidate and os.path.isfile(candidate):
+            return candidate
+    return None
+
+
+async def resolve_local_asset_paths(urls: List[str]) -> List[Optional[str]]:
+    """
+    Resolves asset urls to local files without network I/O. App urls are
+    mapped directly and remote urls through the media url index. Returns
+    None for urls that are not available locally.
+    """
+    local_paths = [resolve_public_path(url) for url in urls]
+    remote_urls = [
+        url
+        for url, local_path in zip(urls, local_paths)
+        if not local_path and is_external_media(url)
+    ]
+    if not remote_urls:
+        return local_paths
+
+    indexed_filenames = await _get_indexed_filenames(list(dict.fromkeys(remote_urls)))
+    if not indexed_filenames:
+        return local_paths
+
+    images_dir = get_media_images_directory()
+    return [
+        local_path
+        or (
+            os.path.join(images_dir, indexed_filenames[url])
+            if url in indexed_filenames
+            else None
+        )
+        for url, local_path in zip(urls, local_paths)
+    ]
+
+
 def is_external_media(url: Optional[str]) -> bool:
     if not url or not isinstance(url, str):
         return False
@@ -64,21 +269,30 @@ def is_external_media(url: Optional[str]) -> bool:
 
 def finalize_local_path(path: str) -> Optional[str]:
     """
-    Copies a local image file (e.g., generated in a temp dir) into
-    APP_DATA_DIRECTORY/uploads/images and returns a public URL
-    like /api/local-image/{filename}. Returns None on failure.
+    Stores a local image file (e.g., generated in a temp dir) in
+    APP_DATA_DIRECTORY/uploads/images under its content hash and returns a
+    public URL like /api/local-image/{sha256}.{ext}. Returns None on failure.
     """
+    temp_path = None
     try:
         if not path or not os.path.isfile(path):
             return None
-        uploads = get_uploads_directory()
-        images_dir = os.path.join(uploads, 'images')
-        os.makedirs(images_dir, exist_ok=True)
-
-        filename = os.path.basename(path)
-        dest_path = os.path.join(images_dir, filename)
-        if os.path.abspath(dest_path) != os.path.abspath(path):
-            shutil.copy2(path, dest_path)
+        images_dir = get_media_images_directory()
+
+        # Already stored
+        if os.path.dirname(os.path.abspath(path)) == os.path.abspath(images_dir):
+            return f"/api/local-image/{os.path.basename(path)}"
+
+        temp_path = _get_temp_path(images_dir)
+        hasher = hashlib.sha256()
+        with open(path, 'rb') as src, open(temp_path, 'wb') as dst:
+            while chunk := src.read(_CHUNK_SIZE):
+                hasher.update(chunk)
+                dst.write(chunk)
+        ext = os.path.splitext(path)[1].lower() or '.jpg'
+        filename = _commit_temp_file(images_dir, temp_path, hasher.hexdigest(), ext)
         return f"/api/local-image/{filename}"
     except Exception:
+        if temp_path:
+            _remove_if_exists(temp_path)
         return None
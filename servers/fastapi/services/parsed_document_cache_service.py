@@ -0,0 +1,204 @@
+import asyncio
+import hashlib
+import json
+import os
+import shutil
+import uuid
+from typing import List, Optional
+
+from utils.asset_directory_utils import get_document_cache_directory
+from utils.get_env import get_document_cache_max_mb_env
+
+
+DEFAULT_MAX_MB = 1024
+
+
+class ParsedDocumentCacheService:
+    """
+    Persists parser output (markdown and PDF page images) on disk, keyed by
+    the SHA-256 of the file bytes and the parser options, so the same upload
+    is parsed once across /files/decompose, outline streaming and regenerate.
+
+    Markdown is stored as {key}.md and page images in a {key} directory, both
+    written atomically. Reads refresh the modification time, and the least
+    recently used entries are evicted once the cache grows beyond
+    DOCUMENT_CACHE_MAX_MB, 0 disables the cache.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+
+    @property
+    def max_bytes(self) -> int:
+        return int(float(get_document_cache_max_mb_env() or DEFAULT_MAX_MB) * 1e6)
+
+    @property
+    def is_enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    @staticmethod
+    def get_key(file_hash: str, options: dict) -> str:
+        options_json = json.dumps(options, sort_keys=True)
+        return hashlib.sha256(f"{file_hash}|{options_json}".encode()).hexdigest()
+
+    def _get_path(self, key: str, extension: str = "") -> str:
+        return os.path.join(get_document_cache_directory(), f"{key}{extension}")
+
+    def _touch(self, path: str) -> bool:
+        try:
+            os.utime(path)
+            return True
+        except FileNotFoundError:
+            return False
+
+    def _read_markdown(self, path: str) -> Optional[str]:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                markdown = f.read()
+        except FileNotFoundError:
+            return None
+        self._touch(path)
+        return markdown
+
+    def _write_markdown(self, path: str, markdown: str):
+        temp_path = f"{path}.{uuid.uuid4().hex}.part"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write(markdown)
+        os.replace(temp_path, path)
+
+    async def get_markdown(self, file_hash: str, options: dict) -> Optional[str]:
+        if not self.is_enabled:
+            return None
+        try:
+            path = self._get_path(self.get_key(file_hash, options), ".md")
+            markdown = await asyncio.to_thread(self._read_markdown, path)
+        except Exception as e:
+            # A broken cache is a miss, it never fails parsing
+            print(f"Error reading parsed document cache: {e}")
+            markdown = None
+        if markdown is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return markdown
+
+    async def set_markdown(self, file_hash: str, options: dict, markdown: str):
+        if not self.is_enabled:
+            return
+        try:
+            path = self._get_path(self.get_key(file_hash, options), ".md")
+            await asyncio.to_thread(self._write_markdown, path, markdown)
+            await asyncio.to_thread(self._evict)
+        except Exception as e:
+            print(f"Error writing parsed document cache: {e}")
+
+    def _copy_page_images(self, directory: str, temp_dir: str) -> Optional[List[str]]:
+        if not self._touch(directory):
+            return None
+        image_paths = []
+        for name in sorted(os.listdir(directory), key=self._get_page_number):
+            image_path = os.path.join(temp_dir, name)
+            shutil.copyfile(os.path.join(directory, name), image_path)
+            image_paths.append(image_path)
+        return image_paths
+
+    @staticmethod
+    def _get_page_number(name: str) -> int:
+        return int(os.path.splitext(name)[0].rsplit("_", 1)[-1])
+
+    def _write_page_images(self, directory: str, image_paths: List[str]):
+        temp_directory = f"{directory}.{uuid.uuid4().hex}.part"
+        os.makedirs(temp_directory)
+        try:
+            for image_path in image_paths:
+                shutil.copyfile(
+                    image_path,
+                    os.path.join(temp_directory, os.path.basename(image_path)),
+                )
+            os.rename(temp_directory, directory)
+        except OSError:
+            # Also raised when another request stored the same pages first
+            shutil.rmtree(temp_directory, ignore_errors=True)
+            if not os.path.isdir(directory):
+                raise
+
+    async def get_page_images(
+        self, file_hash: str, options: dict, temp_dir: str
+    ) -> Optional[List[str]]:
+        """Copies cached page images into temp_dir and returns their paths."""
+        if not self.is_enabled:
+            return None
+        try:
+            directory = self._get_path(self.get_key(file_hash, options))
+            image_paths = await asyncio.to_thread(
+                self._copy_page_images, directory, temp_dir
+            )
+        except Exception as e:
+            print(f"Error reading parsed document cache: {e}")
+            image_paths = None
+        if image_paths is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return image_paths
+
+    async def set_page_images(
+        self, file_hash: str, options: dict, image_paths: List[str]
+    ):
+        """Image names must end with the page number, like page_1.png."""
+        if not self.is_enabled:
+            return
+        try:
+            directory = self._get_path(self.get_key(file_hash, options))
+            await asyncio.to_thread(self._write_page_images, directory, image_paths)
+            await asyncio.to_thread(self._evict)
+        except Exception as e:
+            print(f"Error writing parsed document cache: {e}")
+
+    def _get_entry_size(self, path: str) -> int:
+        if not os.path.isdir(path):
+            return os.path.getsize(path)
+        return sum(
+            os.path.getsize(os.path.join(path, name)) for name in os.listdir(path)
+        )
+
+    def _evict(self):
+        cache_directory = get_document_cache_directory()
+        entries = []
+        total_size = 0
+        for name in os.listdir(cache_directory):
+            if name.endswith(".part"):
+                continue
+            path = os.path.join(cache_directory, name)
+            try:
+                size = self._get_entry_size(path)
+                entries.append((os.path.getmtime(path), size, path))
+            except FileNotFoundError:
+                continue
+            total_size += size
+
+        entries.sort()
+        for _, size, path in entries:
+            if total_size <= self.max_bytes:
+                break
+            if os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+            elif os.path.exists(path):
+                os.remove(path)
+            total_size -= size
+            self.evicted += 1
+
+    def get_stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evicted": self.evicted,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+PARSED_DOCUMENT_CACHE_SERVICE = ParsedDocumentCacheService()
@@ -0,0 +1,190 @@
+import asyncio
+import math
+import os
+from collections import deque
+from typing import AsyncIterator, List, Optional, Tuple
+
+import pdfplumber
+from PIL import Image
+
+from services.process_pool_service import WarmProcessPool
+from utils.get_env import (
+    get_pdf_page_image_dpi_env,
+    get_pdf_page_image_format_env,
+    get_pdf_render_max_queue_env,
+    get_pdf_render_workers_env,
+)
+
+
+DEFAULT_RESOLUTION = 150
+DEFAULT_IMAGE_FORMAT = "png"
+DEFAULT_MAX_QUEUE = 64
+
+# Extension and PIL format of supported page image formats
+IMAGE_FORMATS = {"png": "PNG", "jpeg": "JPEG", "jpg": "JPEG", "webp": "WEBP"}
+
+
+def get_default_workers() -> int:
+    return max(1, min(4, os.cpu_count() or 1))
+
+
+def initialize_pdf_render_worker():
+    # Registers PIL image plugins now instead of on the first saved page
+    Image.init()
+
+
+def render_pdf_pages(
+    file_path: str,
+    temp_dir: str,
+    page_range: Optional[Tuple[int, int]],
+    resolution: int,
+    image_format: str,
+) -> List[Tuple[int, str]]:
+    """
+    Renders pages to page_{number}.{image_format} files in temp_dir and
+    returns (page number, path) pairs. page_range is 1-based and inclusive,
+    all pages when not given.
+    """
+    images = []
+    with pdfplumber.open(file_path) as pdf:
+        start, end = page_range or (1, len(pdf.pages))
+        for page_number in range(start, end + 1):
+            page = pdf.pages[page_number - 1]
+            image = page.to_image(resolution=resolution)
+            image_path = os.path.join(temp_dir, f"page_{page_number}.{image_format}")
+            if image_format == "png":
+                image.save(image_path)
+            else:
+                image.original.convert("RGB").save(
+                    image_path, format=IMAGE_FORMATS[image_format], quality=90
+                )
+            # Releases parsed layout objects of the page
+            page.close()
+            images.append((page_number, image_path))
+    return images
+
+
+def get_pdf_page_count(file_path: str) -> int:
+    with pdfplumber.open(file_path) as pdf:
+        return len(pdf.pages)
+
+
+class PdfRenderService:
+    """
+    Rasterizes PDF pages in a pool of worker processes, so imports of long
+    decks use all cores instead of one thread.
+
+    Pages are split into small ranges rendered in parallel, and results are
+    yielded page by page in order as soon as their range is done. Only a few
+    ranges per worker are queued at once, so long documents neither exceed
+    PDF_RENDER_MAX_QUEUE nor render far ahead of a slow consumer.
+
+    Configured by PDF_RENDER_WORKERS, PDF_RENDER_MAX_QUEUE, PDF_PAGE_IMAGE_DPI
+    and PDF_PAGE_IMAGE_FORMAT (png, jpeg or webp).
+    """
+
+    MAX_PAGES_PER_JOB = 4
+    JOBS_PER_WORKER = 2
+    TIMEOUT_SECONDS = 300
+
+    def __init__(self):
+        self.pool = WarmProcessPool(
+            "pdf render",
+            initialize_pdf_render_worker,
+            get_workers=self.get_workers,
+            get_max_queue=lambda: int(
+                get_pdf_render_max_queue_env() or DEFAULT_MAX_QUEUE
+            ),
+        )
+
+    @staticmethod
+    def get_workers() -> int:
+        return int(get_pdf_render_workers_env() or get_default_workers())
+
+    @property
+    def resolution(self) -> int:
+        return int(get_pdf_page_image_dpi_env() or DEFAULT_RESOLUTION)
+
+    @property
+    def image_format(self) -> str:
+        image_format = (get_pdf_page_image_format_env() or DEFAULT_IMAGE_FORMAT).lower()
+        if image_format not in IMAGE_FORMATS:
+            print(f"Unsupported PDF_PAGE_IMAGE_FORMAT {image_format}, using png")
+            return DEFAULT_IMAGE_FORMAT
+        return image_format
+
+    def get_options(self) -> dict:
+        """Identifies rendered pages in the parsed document cache."""
+        return {
+            "kind": "page_images",
+            "resolution": self.resolution,
+            "format": self.image_format,
+        }
+
+    def split_page_ranges(self, n_pages: int) -> List[Tuple[int, int]]:
+        # Small documents are still spread over all workers
+        pages_per_job = max(
+            1, min(self.MAX_PAGES_PER_JOB, math.ceil(n_pages / self.get_workers()))
+        )
+        return [
+            (start, min(start + pages_per_job - 1, n_pages))
+            for start in range(1, n_pages + 1, pages_per_job)
+        ]
+
+    async def stop(self):
+        await self.pool.stop()
+
+    async def stream_page_images(
+        self, file_path: str, temp_dir: str
+    ) -> AsyncIterator[Tuple[int, str]]:
+        """
+        Yields (page number, image path) in page order. Raises
+        ProcessPoolBusyError and asyncio.TimeoutError like WarmProcessPool.run.
+        """
+        file_path = os.path.abspath(file_path)
+        n_pages = await asyncio.to_thread(get_pdf_page_count, file_path)
+        page_ranges = deque(self.split_page_ranges(n_pages))
+        resolution = self.resolution
+        image_format = self.image_format
+        max_jobs = self.get_workers() * self.JOBS_PER_WORKER
+
+        jobs: deque = deque()
+
+        def submit_jobs():
+            while page_ranges and len(jobs) < max_jobs:
+                jobs.append(
+                    asyncio.create_task(
+                        self.pool.run(
+                            render_pdf_pages,
+                            file_path,
+                            temp_dir,
+                            page_ranges.popleft(),
+                            resolution,
+                            image_format,
+                            timeout=self.TIMEOUT_SECONDS,
+                        )
+                    )
+                )
+
+        try:
+            submit_jobs()
+            while jobs:
+                pages = await jobs[0]
+                jobs.popleft()
+                submit_jobs()
+                for page in pages:
+                    yield page
+        finally:
+            # Stops rendering pages nobody will read, for example after an error
+            for job in jobs:
+                job.cancel()
+
+    def get_stats(self) -> dict:
+        return {
+            "resolution": self.resolution,
+            "image_format": self.image_format,
+            **self.pool.get_stats(),
+        }
+
+
+PDF_RENDER_SERVICE = PdfRenderService()
@@ -0,0 +1,150 @@
+import asyncio
+import re
+import statistics
+from dataclasses import dataclass
+from typing import AsyncIterator, List, Optional, Tuple
+
+import pdfplumber
+from pdfplumber.page import Page
+
+
+# Unmapped glyphs are extracted as "(cid:123)"
+_CID_RE = re.compile(r"\(cid:\d+\)")
+
+
+@dataclass
+class PdfProbeResult:
+    n_pages: int
+    is_text_native: bool
+    body_font_size: float
+    reason: str
+
+
+class PdfTextService:
+    """
+    Fast tier of PDF loading: reads the embedded text layer with pdfplumber,
+    10-50x faster than the docling layout pipeline.
+
+    `probe` samples a few pages and only accepts PDFs whose text layer looks
+    complete and clean. Scanned pages, broken font encodings and table heavy
+    layouts are left to docling. Headings are recovered from font sizes so
+    the markdown still chunks by heading.
+    """
+
+    PROBE_PAGES = 6
+    MIN_CHARS_PER_PAGE = 50
+    MIN_TEXT_PAGE_RATIO = 0.8
+    MAX_GARBAGE_RATIO = 0.02
+    # Pages with this many ruling lines most likely contain tables
+    MIN_TABLE_EDGES = 12
+    MAX_TABLE_PAGE_RATIO = 0.3
+    HEADING_FONT_RATIO = 1.2
+    TITLE_FONT_RATIO = 1.6
+    MAX_HEADING_LENGTH = 120
+
+    @staticmethod
+    def get_page_numbers(
+        n_pages: int, page_range: Optional[Tuple[int, int]]
+    ) -> List[int]:
+        """1-based, inclusive page_range clamped to the document."""
+        start, end = page_range or (1, n_pages)
+        return list(range(max(start, 1), min(end, n_pages) + 1))
+
+    def _get_garbage_ratio(self, text: str) -> float:
+        if not text:
+            return 0.0
+        garbage = sum(len(each) for each in _CID_RE.findall(text))
+        garbage += sum(
+            1
+            for char in text
+            if char == "\ufffd" or (not char.isprintable() and char not in "\n\t")
+        )
+        return garbage / len(text)
+
+    def _get_font_sizes(self, page: Page) -> List[float]:
+        return [round(char["size"], 1) for char in page.chars if char["text"].strip()]
+
+    def probe(
+        self, file_path: str, page_range: Optional[Tuple[int, int]] = None
+    ) -> PdfProbeResult:
+        with pdfplumber.open(file_path) as pdf:
+            n_pages = len(pdf.pages)
+            page_numbers = self.get_page_numbers(n_pages, page_range)
+            if not page_numbers:
+                return PdfProbeResult(n_pages, False, 0, "no pages")
+
+            # Spread samples over the document, covers and appendices differ
+            step = max(1, len(page_numbers) // self.PROBE_PAGES)
+            samples = page_numbers[::step][: self.PROBE_PAGES]
+
+            text_pages = 0
+            table_pages = 0
+            garbage_ratios = []
+            font_sizes = []
+            for page_number in samples:
+                page = pdf.pages[page_number - 1]
+                text = page.extract_text() or ""
+                if len(text.strip()) >= self.MIN_CHARS_PER_PAGE:
+                    text_pages += 1
+                garbage_ratios.append(self._get_garbage_ratio(text))
+                font_sizes.extend(self._get_font_sizes(page))
+                if len(page.edges) >= self.MIN_TABLE_EDGES:
+                    table_pages += 1
+                page.close()
+
+        body_font_size = statistics.median(font_sizes) if font_sizes else 0
+        if text_pages / len(samples) < self.MIN_TEXT_PAGE_RATIO:
+            reason = "pages without text layer"
+        elif max(garbage_ratios) > self.MAX_GARBAGE_RATIO:
+            reason = "unreadable text layer"
+        elif table_pages / len(samples) > self.MAX_TABLE_PAGE_RATIO:
+            reason = "complex layout"
+        else:
+            return PdfProbeResult(n_pages, True, body_font_size, "text layer")
+        return PdfProbeResult(n_pages, False, body_font_size, reason)
+
+    def page_to_markdown(self, page: Page, body_font_size: float) -> str:
+        lines = []
+        for line in page.extract_text_lines():
+            text = line["text"].strip()
+            if not text:
+                continue
+            sizes = [char["size"] for char in line["chars"] if char["text"].strip()]
+            size = statistics.median(sizes) if sizes else 0
+            if body_font_size and len(text) <= self.MAX_HEADING_LENGTH:
+                if size >= body_font_size * self.TITLE_FONT_RATIO:
+                    text = f"# {text}"
+                elif size >= body_font_size * self.HEADING_FONT_RATIO:
+                    text = f"## {text}"
+            lines.append(text)
+        return "\n".join(lines)
+
+    def _extract_page(
+        self, pdf: pdfplumber.PDF, page_number: int, body_font_size: float
+    ) -> str:
+        page = pdf.pages[page_number - 1]
+        try:
+            return self.page_to_markdown(page, body_font_size)
+        finally:
+            # Releases parsed layout objects, long documents otherwise keep all pages
+            page.close()
+
+    async def stream_pages(
+        self,
+        file_path: str,
+        body_font_size: float,
+        page_range: Optional[Tuple[int, int]] = None,
+    ) -> AsyncIterator[Tuple[int, str]]:
+        """Yields (page number, markdown) as each page is extracted."""
+        pdf = await asyncio.to_thread(pdfplumber.open, file_path)
+        try:
+            for page_number in self.get_page_numbers(len(pdf.pages), page_range):
+                markdown = await asyncio.to_thread(
+                    self._extract_page, pdf, page_number, body_font_size
+                )
+                yield page_number, markdown
+        finally:
+            pdf.close()
+
+
+PDF_TEXT_SERVICE = PdfTextService()
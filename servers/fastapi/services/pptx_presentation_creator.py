@@ -1,3 +1,4 @@
+import asyncio
 import os
 from typing import List, Optional
 from lxml import etree
@@ -34,7 +35,13 @@ from models.pptx_models import (
     PptxTextBoxModel,
     PptxTextRunModel,
 )
-from utils.download_helpers import download_files
+from services.image_derivative_service import IMAGE_DERIVATIVE_SERVICE
+from services.media_service import (
+    download_to_storage,
+    get_media_file_path,
+    is_external_media,
+    resolve_local_asset_paths,
+)
 from utils.image_utils import (
     clip_image,
     create_circle_image,
@@ -68,51 +75,77 @@ class PptxPresentationCreator:
         return element
 
     async def fetch_network_assets(self):
-        image_urls = []
-        models_with_network_asset: List[PptxPictureBoxModel] = []
+        """
+        Points pictures at local files. Urls served by this app and remote
+        urls downloaded before are resolved without network I/O, only the
+        remaining remote images are downloaded into media storage.
+        """
+        picture_models = [
+            each
+            for each in self.get_picture_models()
+            if each.picture.is_network
+            or each.picture.path.startswith("http")
+            or each.picture.path.startswith("/")
+        ]
+        urls = [each.picture.path for each in picture_models]
+        local_paths = await resolve_local_asset_paths(urls)
+
+        models_to_download = []
+        for each_model, each_path in zip(picture_models, local_paths):
+            if each_path:
+                each_model.picture.path = each_path
+                each_model.picture.is_network = False
+            elif is_external_media(each_model.picture.path):
+                models_to_download.append(each_model)
+
+        if not models_to_download:
+            return
 
+        stored_urls = await asyncio.gather(
+            *[download_to_storage(each.picture.path) for each in models_to_download]
+        )
+        for each_model, each_url in zip(models_to_download, stored_urls):
+            stored_path = get_media_file_path(each_url)
+            if stored_path:
+                each_model.picture.path = stored_path
+                each_model.picture.is_network = False
+
+    def get_picture_models(self) -> List[PptxPictureBoxModel]:
+        picture_models = []
         if self._ppt_model.shapes:
             for each_shape in self._ppt_model.shapes:
                 if isinstance(each_shape, PptxPictureBoxModel):
-                    image_path = each_shape.picture.path
-                    if image_path.startswith("http"):
-                        if "app_data/" in image_path:
-                            relative_path = image_path.split("app_data/")[1]
-                            each_shape.picture.path = os.path.join(
-                                "/app_data", relative_path
-                            )
-                            each_shape.picture.is_network = False
-                            continue
-                        image_urls.append(image_path)
-                        models_with_network_asset.append(each_shape)
-
+                    picture_models.append(each_shape)
         for each_slide in self._slide_models:
             for each_shape in each_slide.shapes:
                 if isinstance(each_shape, PptxPictureBoxModel):
-                    image_path = each_shape.picture.path
-                    if image_path.startswith("http"):
-                        if "app_data" in image_path:
-                            relative_path = image_path.split("app_data/")[1]
-                            each_shape.picture.path = os.path.join(
-                                "/app_data", relative_path
-                            )
-                            each_shape.picture.is_network = False
-                            continue
-                        image_urls.append(image_path)
-                        models_with_network_asset.append(each_shape)
-
-        if image_urls:
-            image_paths = await download_files(image_urls, self._temp_dir)
-
-            for each_shape, each_image_path in zip(
-                models_with_network_asset, image_paths
-            ):
-                if each_image_path:
-                    each_shape.picture.path = each_image_path
-                    each_shape.picture.is_network = False
+                    picture_models.append(each_shape)
+        return picture_models
+
+    async def use_picture_derivatives(self):
+        """
+        Replaces local pictures with derivatives sized for their box, so huge
+        originals are neither embedded nor transformed at full size.
+        """
+        picture_models = self.get_picture_models()
+
+        derivative_paths = await asyncio.gather(
+            *[
+                asyncio.to_thread(
+                    IMAGE_DERIVATIVE_SERVICE.get_derivative_path,
+                    each.picture.path,
+                    each.position.width,
+                    each.position.height,
+                )
+                for each in picture_models
+            ]
+        )
+        for each_model, each_path in zip(picture_models, derivative_paths):
+            each_model.picture.path = each_path
 
     async def create_ppt(self):
         await self.fetch_network_assets()
+        await self.use_picture_derivatives()
 
         for slide_model in self._slide_models:
             # Adding global shapes to slide
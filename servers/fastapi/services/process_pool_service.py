@@ -0,0 +1,153 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, List, Optional
+
+
+class ProcessPoolBusyError(Exception):
+    pass
+
+
+def _noop():
+    return None
+
+
+class WarmProcessPool:
+    """
+    Runs CPU heavy, blocking work in long lived worker processes.
+
+    Every worker is a single process executor whose `initializer` loads
+    expensive state (models, converters) once and keeps it for all jobs.
+    Jobs wait in a bounded queue for a free worker and fail fast with
+    ProcessPoolBusyError once `max_queue` jobs are waiting. A job that times
+    out or whose caller is cancelled gets its worker process killed and
+    replaced, so abandoned work does not keep burning CPU.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        initializer: Callable[[], None],
+        get_workers: Callable[[], int],
+        get_max_queue: Callable[[], int],
+    ):
+        self.name = name
+        self.initializer = initializer
+        self.get_workers = get_workers
+        self.get_max_queue = get_max_queue
+        self.completed = 0
+        self.failed = 0
+        self.timed_out = 0
+        self.cancelled = 0
+        self.rejected = 0
+        self._workers: List[ProcessPoolExecutor] = []
+        self._free_workers: Optional[asyncio.Queue] = None
+        self._waiting = 0
+
+    @property
+    def is_started(self) -> bool:
+        return self._free_workers is not None
+
+    def _create_worker(self) -> ProcessPoolExecutor:
+        # Spawned, forking a process running an event loop and threads is unsafe
+        worker = ProcessPoolExecutor(
+            max_workers=1,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=self.initializer,
+        )
+        # Starts the process and runs the initializer now instead of on first job
+        worker.submit(_noop)
+        return worker
+
+    def start(self):
+        if self.is_started:
+            return
+        self._free_workers = asyncio.Queue()
+        for _ in range(max(1, self.get_workers())):
+            worker = self._create_worker()
+            self._workers.append(worker)
+            self._free_workers.put_nowait(worker)
+        print(f"Started {len(self._workers)} {self.name} worker processes")
+
+    def _kill_worker(self, worker: ProcessPoolExecutor):
+        # Executors can't cancel a running call, so the process is killed
+        for process in list((worker._processes or {}).values()):
+            process.kill()
+        worker.shutdown(wait=False, cancel_futures=True)
+
+    def _replace_worker(
+        self, worker: ProcessPoolExecutor
+    ) -> Optional[ProcessPoolExecutor]:
+        self._kill_worker(worker)
+        if worker not in self._workers:
+            # The pool was stopped while the job ran
+            return None
+        new_worker = self._create_worker()
+        self._workers[self._workers.index(worker)] = new_worker
+        return new_worker
+
+    async def run(
+        self, func: Callable[..., Any], *args, timeout: Optional[float] = None
+    ) -> Any:
+        """
+        Runs func(*args) in a worker process. func and args must be picklable.
+        Raises ProcessPoolBusyError if the queue is full and
+        asyncio.TimeoutError if the job takes longer than timeout seconds.
+        """
+        if self._waiting >= self.get_max_queue():
+            self.rejected += 1
+            raise ProcessPoolBusyError(f"Too many queued {self.name} jobs")
+
+        self.start()
+        self._waiting += 1
+        try:
+            worker = await self._free_workers.get()
+        finally:
+            self._waiting -= 1
+
+        try:
+            result = await asyncio.wait_for(
+                asyncio.wrap_future(worker.submit(func, *args)), timeout
+            )
+            self.completed += 1
+            return result
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            worker = self._replace_worker(worker)
+            raise
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            worker = self._replace_worker(worker)
+            raise
+        except BrokenProcessPool:
+            # Worker crashed, for example ran out of memory
+            self.failed += 1
+            worker = self._replace_worker(worker)
+            raise
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            # Workers of a stopped pool are not queued again
+            if worker in self._workers:
+                self._free_workers.put_nowait(worker)
+
+    async def stop(self):
+        for worker in self._workers:
+            self._kill_worker(worker)
+        self._workers = []
+        self._free_workers = None
+
+    def get_stats(self) -> dict:
+        return {
+            "workers": len(self._workers),
+            "idle": self._free_workers.qsize() if self._free_workers else 0,
+            "waiting": self._waiting,
+            "max_queue": self.get_max_queue(),
+            "completed": self.completed,
+            "failed": self.failed,
+            "timed_out": self.timed_out,
+            "cancelled": self.cancelled,
+            "rejected": self.rejected,
+        }
@@ -0,0 +1,152 @@
+import asyncio
+import cProfile
+import json
+import os
+import re
+import threading
+import time
+import uuid
+from typing import List, Optional
+
+from utils.asset_directory_utils import get_profiles_directory
+
+try:
+    from pyinstrument import Profiler
+
+    PYINSTRUMENT_AVAILABLE = True
+except ImportError:
+    PYINSTRUMENT_AVAILABLE = False
+
+
+_PROFILE_ID_RE = re.compile(r"^[a-f0-9]{32}$")
+
+
+class ProfilingSession:
+    """
+    Profiles a single request.
+    Uses pyinstrument (sampling, async aware, HTML flamegraph) when installed
+    and falls back to cProfile (pstats) otherwise. cProfile is deterministic,
+    so overhead is much higher, and it also records other requests that
+    interleave on the event loop.
+    """
+
+    def __init__(self, method: str, path: str):
+        self.id = uuid.uuid4().hex
+        self.method = method
+        self.path = path
+        self.backend = "pyinstrument" if PYINSTRUMENT_AVAILABLE else "cprofile"
+        self._started_at = 0.0
+        self._duration_ms = 0.0
+        self._profiler = None
+
+    def start(self):
+        self._started_at = time.time()
+        if PYINSTRUMENT_AVAILABLE:
+            self._profiler = Profiler(interval=0.001, async_mode="enabled")
+            self._profiler.start()
+        else:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+
+    def stop(self):
+        """Must run on the same thread as start."""
+        self._duration_ms = (time.time() - self._started_at) * 1000
+        if PYINSTRUMENT_AVAILABLE:
+            self._profiler.stop()
+        else:
+            self._profiler.disable()
+
+    def save(self, status_code: Optional[int]) -> str:
+        profiles_directory = get_profiles_directory()
+
+        if PYINSTRUMENT_AVAILABLE:
+            output_path = os.path.join(profiles_directory, f"{self.id}.html")
+            with open(output_path, "w") as f:
+                f.write(self._profiler.output_html())
+        else:
+            output_path = os.path.join(profiles_directory, f"{self.id}.pstats")
+            self._profiler.dump_stats(output_path)
+
+        metadata = {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "status_code": status_code,
+            "backend": self.backend,
+            "started_at": self._started_at,
+            "duration_ms": self._duration_ms,
+            "file": os.path.basename(output_path),
+        }
+        if not PYINSTRUMENT_AVAILABLE:
+            metadata["note"] = (
+                "cProfile based, includes concurrent requests on the event loop"
+            )
+        with open(os.path.join(profiles_directory, f"{self.id}.json"), "w") as f:
+            json.dump(metadata, f)
+
+        return output_path
+
+
+class RequestProfilerService:
+    """
+    Keeps at most one profiling session active at a time, since neither
+    backend can attribute samples to overlapping requests reliably.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._active_session: Optional[ProfilingSession] = None
+
+    def start_session(self, method: str, path: str) -> Optional[ProfilingSession]:
+        with self._lock:
+            if self._active_session:
+                return None
+            session = ProfilingSession(method, path)
+            self._active_session = session
+        try:
+            session.start()
+        except Exception:
+            self._release(session)
+            raise
+        return session
+
+    async def finish_session(
+        self, session: ProfilingSession, status_code: Optional[int]
+    ):
+        try:
+            session.stop()
+            output_path = await asyncio.to_thread(session.save, status_code)
+            print(f"Saved request profile {session.id} to {output_path}")
+        except Exception as e:
+            print(f"Error saving request profile {session.id}: {e}")
+        finally:
+            self._release(session)
+
+    def _release(self, session: ProfilingSession):
+        with self._lock:
+            if self._active_session is session:
+                self._active_session = None
+
+    def list_profiles(self) -> List[dict]:
+        profiles_directory = get_profiles_directory()
+        profiles = []
+        for filename in os.listdir(profiles_directory):
+            if not filename.endswith(".json"):
+                continue
+            with open(os.path.join(profiles_directory, filename), "r") as f:
+                profiles.append(json.load(f))
+        profiles.sort(key=lambda x: x["started_at"], reverse=True)
+        return profiles
+
+    def get_profile_path(self, profile_id: str) -> Optional[str]:
+        if not _PROFILE_ID_RE.match(profile_id):
+            return None
+        metadata_path = os.path.join(get_profiles_directory(), f"{profile_id}.json")
+        if not os.path.exists(metadata_path):
+            return None
+        with open(metadata_path, "r") as f:
+            metadata = json.load(f)
+        return os.path.join(get_profiles_directory(), metadata["file"])
+
+
+REQUEST_PROFILER_SERVICE = RequestProfilerService()
@@ -1,22 +1,66 @@
 import asyncio
-from typing import List
+from collections import defaultdict, deque
+from typing import Deque, Dict, List, Optional, Tuple
 
 from models.document_chunk import DocumentChunk
 
 
+# Heading text, offset where its line starts, offset right after its line
+HeadingOffsets = List[Tuple[str, int, int]]
+
+
 class ScoreBasedChunker:
 
-    def extract_headings(self, text: str) -> List[str]:
-        lines = text.split("\n")
+    def extract_headings_with_offsets(self, text: str) -> HeadingOffsets:
+        """
+        Finds headings in a single scan, recording where their lines are.
+        Only lines containing "#" are inspected, the rest are skipped by
+        str.find without splitting text into lines.
+        """
         headings = []
-        
-        for line in lines:
-            line = line.strip()
-            if line.startswith("#"):
-                headings.append(line)
-        
+        position = text.find("#")
+        while position != -1:
+            line_start = text.rfind("\n", 0, position) + 1
+            line_end = text.find("\n", position)
+            if line_end == -1:
+                line_end = len(text)
+            # Heading lines start with "#" after optional indentation
+            if not text[line_start:position].strip():
+                headings.append(
+                    (
+                        text[position:line_end].strip(),
+                        line_start,
+                        min(line_end + 1, len(text)),
+                    )
+                )
+            position = text.find("#", line_end)
         return headings
 
+    def extract_headings(self, text: str) -> List[str]:
+        return [heading for heading, _, _ in self.extract_headings_with_offsets(text)]
+
+    def _get_heading_offsets(
+        self, text: str, headings: List[str]
+    ) -> Dict[int, Tuple[int, int]]:
+        """
+        Maps indices of headings to the offsets of their lines in text. Each
+        heading line goes to the first unmatched heading with the same text.
+        """
+        unmatched: Dict[str, Deque[int]] = defaultdict(deque)
+        for heading_idx, heading in enumerate(headings):
+            unmatched[heading].append(heading_idx)
+
+        heading_offsets = {}
+        for heading, line_start, content_start in self.extract_headings_with_offsets(
+            text
+        ):
+            if unmatched.get(heading):
+                heading_offsets[unmatched[heading].popleft()] = (
+                    line_start,
+                    content_start,
+                )
+        return heading_offsets
+
     def score_headings(self, headings: List[str]) -> List[float]:
         heading_scores = []
         last_heading_index = -1
@@ -52,7 +96,13 @@ class ScoreBasedChunker:
         headings: List[str],
         heading_scores: List[float],
         top_k: int = 10,
+        heading_offsets: Optional[Dict[int, Tuple[int, int]]] = None,
     ) -> List[DocumentChunk]:
+        """
+        Returns up to top_k chunks, each running from a selected heading to
+        the next selected heading. Chunk content is sliced from text using
+        heading_offsets, computed in one pass over text when not provided.
+        """
         if not heading_scores:
             heading_scores = self.score_headings(headings)
 
@@ -111,36 +161,23 @@ class ScoreBasedChunker:
 
             selected_indices.sort()
 
-        lines = text.split("\n")
-        heading_positions = {}
-        
-        for i, line in enumerate(lines):
-            line_stripped = line.strip()
-            if line_stripped.startswith("#"):
-                for heading_idx, heading in enumerate(headings):
-                    if heading == line_stripped and heading_idx not in heading_positions:
-                        heading_positions[heading_idx] = i
-                        break
-        
+        if heading_offsets is None:
+            heading_offsets = self._get_heading_offsets(text, headings)
+
         for i, heading_idx in enumerate(selected_indices):
-            if heading_idx not in heading_positions:
+            if heading_idx not in heading_offsets:
                 continue
-                
+
             heading = headings[heading_idx]
-            heading_line_idx = heading_positions[heading_idx]
-            
+            content_start = heading_offsets[heading_idx][1]
+
+            content_end = len(text)
             if i + 1 < len(selected_indices):
                 next_heading_idx = selected_indices[i + 1]
-                if next_heading_idx in heading_positions:
-                    next_heading_line_idx = heading_positions[next_heading_idx]
-                    content_end = next_heading_line_idx
-                else:
-                    content_end = len(lines)
-            else:
-                content_end = len(lines)
+                if next_heading_idx in heading_offsets:
+                    content_end = heading_offsets[next_heading_idx][0]
 
-            content_lines = lines[heading_line_idx + 1 : content_end]
-            content = "\n".join(content_lines).strip()
+            content = text[content_start:content_end].strip()
 
             chunk = DocumentChunk(
                 heading=heading,
@@ -152,12 +189,20 @@ class ScoreBasedChunker:
             
         return chunks
 
-    async def get_n_chunks(self, text: str, n: int) -> List[DocumentChunk]:
-        headings = await asyncio.to_thread(self.extract_headings, text)
-        heading_scores = await asyncio.to_thread(self.score_headings, headings)
-        chunks = await asyncio.to_thread(
-            self.get_chunks_from_headings, text, headings, heading_scores, n
+    def get_chunks(self, text: str, n: int) -> List[DocumentChunk]:
+        headings_with_offsets = self.extract_headings_with_offsets(text)
+        headings = [heading for heading, _, _ in headings_with_offsets]
+        heading_offsets = {
+            i: (line_start, content_start)
+            for i, (_, line_start, content_start) in enumerate(headings_with_offsets)
+        }
+        heading_scores = self.score_headings(headings)
+        return self.get_chunks_from_headings(
+            text, headings, heading_scores, n, heading_offsets
         )
+
+    async def get_n_chunks(self, text: str, n: int) -> List[DocumentChunk]:
+        chunks = await asyncio.to_thread(self.get_chunks, text, n)
         if len(chunks) < n:
             raise ValueError(f"Only {len(chunks)} chunks found, requested {n}")
         return chunks
@@ -0,0 +1,75 @@
+import asyncio
+import os
+from unittest.mock import patch
+
+import aiohttp
+
+from services.asset_fetch_scheduler_service import AssetFetchSchedulerService
+
+
+def test_limits_concurrency_and_starts_by_priority():
+    scheduler = AssetFetchSchedulerService()
+    started = []
+    running = 0
+    max_running = 0
+
+    def fetch(name):
+        async def inner():
+            nonlocal running, max_running
+            started.append(name)
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return name
+
+        return inner
+
+    async def run():
+        blocker = asyncio.create_task(
+            scheduler.run_for_provider("pexels", fetch("first"), priority=0)
+        )
+        await asyncio.sleep(0)
+        tasks = [
+            scheduler.run_for_provider("pexels", fetch(f"slide-{i}"), priority=i)
+            for i in [3, 1, 2]
+        ]
+        return await asyncio.gather(blocker, *tasks)
+
+    with patch.dict(os.environ, {"ASSET_FETCH_PROVIDER_CONCURRENCY": "1"}):
+        results = asyncio.run(run())
+
+    assert results == ["first", "slide-3", "slide-1", "slide-2"]
+    assert started == ["first", "slide-1", "slide-2", "slide-3"]
+    assert max_running == 1
+
+
+def test_deduplicates_in_flight_fetches_and_retries_transient_errors():
+    scheduler = AssetFetchSchedulerService()
+    scheduler.BACKOFF_SECONDS = 0
+    calls = 0
+
+    async def flaky():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        if calls == 1:
+            raise aiohttp.ClientConnectionError()
+        return "https://images.example.com/photo.jpg"
+
+    async def run():
+        return await asyncio.gather(
+            *[
+                scheduler.run_for_url(
+                    "https://images.example.com/photo.jpg", flaky, dedup_key="photo"
+                )
+                for _ in range(3)
+            ]
+        )
+
+    results = asyncio.run(run())
+
+    assert results == ["https://images.example.com/photo.jpg"] * 3
+    assert calls == 2
+    assert scheduler.deduplicated == 2
+    assert scheduler.retried == 1
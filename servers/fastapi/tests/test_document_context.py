@@ -0,0 +1,80 @@
+import asyncio
+import os
+from unittest.mock import patch
+
+from services import document_context_service
+from services.document_context_service import (
+    DocumentContextService,
+    estimate_tokens,
+)
+
+
+def make_document(n_sections: int, words_per_section: int) -> str:
+    return "\n\n".join(
+        f"## Section {i}\n" + " ".join(f"fact{i}" for _ in range(words_per_section))
+        for i in range(n_sections)
+    )
+
+
+def build(documents, env, model="test-model"):
+    with patch.dict(os.environ, env):
+        return asyncio.run(DocumentContextService().build(documents, model))
+
+
+def test_small_documents_are_passed_through():
+    documents = ["# Short\nA few words.", "", "Plain notes."]
+    assert build(documents, {}) == "# Short\nA few words.\n\nPlain notes."
+
+
+def test_large_documents_are_reduced_to_the_model_budget():
+    document = "Intro paragraph.\n\n" + make_document(200, 100)
+    env = {"ADDITIONAL_CONTEXT_TOKEN_BUDGET": "100000,test-model=3000"}
+
+    context = build([document], env)
+
+    assert estimate_tokens(context) <= 3000
+    assert context.startswith("Intro paragraph.\n\n## Section 0")
+    kept = [
+        int(line.split()[-1]) for line in context.split("\n") if line.startswith("## ")
+    ]
+    assert kept == sorted(kept) and len(kept) > 1
+    assert build([document], env, model="big-model") == document
+
+
+def test_summaries_run_in_parallel_before_selection():
+    documents = [make_document(40, 200), "no headings " * 8000]
+    active = 0
+    max_active = 0
+
+    async def summarize(chunk, max_tokens):
+        nonlocal active, max_active
+        active += 1
+        max_active = max(max_active, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return chunk[: max_tokens * 4]
+
+    with patch.object(document_context_service, "summarize_document_chunk", summarize):
+        context = build(
+            documents,
+            {
+                "ADDITIONAL_CONTEXT_TOKEN_BUDGET": "4000",
+                "ADDITIONAL_CONTEXT_SUMMARIZE": "true",
+            },
+        )
+
+    assert max_active == DocumentContextService.SUMMARY_CONCURRENCY
+    assert estimate_tokens(context) <= 4000
+    assert "## Section 0" in context and "no headings" in context
+
+
+def test_non_latin_scripts_are_counted_per_character():
+    assert estimate_tokens("a" * 400) == 100
+    assert estimate_tokens("数据" * 200) == 400
+
+    document = make_document(50, 0) + "\n\n" + "\n\n".join(
+        f"## 第{i}节\n" + "收入增长" * 300 for i in range(20)
+    )
+    context = build([document], {"ADDITIONAL_CONTEXT_TOKEN_BUDGET": "3000"})
+
+    assert 0 < estimate_tokens(context) <= 3000
@@ -0,0 +1,97 @@
+import asyncio
+import os
+import uuid
+import zlib
+from unittest.mock import patch
+
+import numpy as np
+
+from services.document_retrieval_service import DocumentRetrievalService
+from services.icon_finder_service import ICON_FINDER_SERVICE
+
+
+def embed(texts):
+    # Bag of words, similar texts share words
+    vectors = np.zeros((len(texts), 1024), dtype=np.float32)
+    for i, text in enumerate(texts):
+        for word in text.lower().split():
+            vectors[i, zlib.crc32(word.strip("#.,").encode()) % 1024] += 1
+    return vectors
+
+
+DOCUMENT = "\n\n".join(
+    [
+        "# Annual Report",
+        "## Revenue\nRevenue grew to 12 million dollars in 2024.",
+        "## Hiring\nThe team hired 40 engineers across three offices.",
+        "## Roadmap\nNext year focuses on mobile apps and offline sync.",
+    ]
+)
+
+
+def retrieve(service, documents, queries):
+    async def run():
+        presentation_id = uuid.uuid4()
+        service.start_build(presentation_id, documents)
+        index = await service.get_index(presentation_id)
+        return [await service.retrieve(index, query) for query in queries]
+
+    with patch.object(ICON_FINDER_SERVICE, "get_embedding_function", return_value=embed):
+        return asyncio.run(run())
+
+
+def test_slides_get_the_chunks_closest_to_their_outline():
+    service = DocumentRetrievalService()
+
+    with patch.dict(os.environ, {"DOCUMENT_RETRIEVAL_TOP_K": "1"}):
+        revenue, roadmap = retrieve(
+            service,
+            [DOCUMENT],
+            ["How much revenue did we make", "Roadmap for mobile apps next year"],
+        )
+
+    assert revenue == "## Revenue\nRevenue grew to 12 million dollars in 2024."
+    assert roadmap.startswith("## Roadmap")
+
+
+def test_long_sections_are_split_and_keep_their_heading():
+    service = DocumentRetrievalService()
+    section = "## Details\n" + "\n\n".join(
+        " ".join(f"word{i}" for _ in range(150)) for i in range(4)
+    )
+
+    chunks = service.split_chunks([section])
+
+    assert len(chunks) > 1
+    assert all(chunk.startswith("## Details") for chunk in chunks)
+    assert all(len(chunk) <= service.CHUNK_TOKENS * 4 + 20 for chunk in chunks)
+
+
+def test_disabled_or_missing_index_returns_no_excerpts():
+    service = DocumentRetrievalService()
+
+    with patch.dict(os.environ, {"DOCUMENT_RETRIEVAL_TOP_K": "0"}):
+        assert retrieve(service, [DOCUMENT], ["Revenue"]) == [None]
+    assert asyncio.run(service.get_index(uuid.uuid4())) is None
+
+
+def test_failed_build_is_retried(tmp_path):
+    service = DocumentRetrievalService()
+    notes = tmp_path / "notes.txt"
+    notes.write_text("## Revenue\nRevenue grew to 12 million dollars.")
+    embedding_function = patch.object(
+        ICON_FINDER_SERVICE,
+        "get_embedding_function",
+        side_effect=[RuntimeError("model missing"), embed, embed],
+    )
+
+    async def run():
+        presentation_id = uuid.uuid4()
+        service.start_build(presentation_id, [DOCUMENT])
+        assert await service.get_index(presentation_id) is None
+        index = await service.get_index(presentation_id, [str(notes)])
+        assert index is not None and len(index.chunks) == 1
+        assert not service._build_tasks
+
+    with embedding_function:
+        asyncio.run(run())
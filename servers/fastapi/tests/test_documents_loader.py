@@ -0,0 +1,51 @@
+import asyncio
+import os
+from unittest.mock import patch
+
+from services import documents_loader
+from services.documents_loader import DocumentsLoader
+
+
+def test_files_load_concurrently_in_order_with_isolated_errors(tmp_path):
+    paths = []
+    for name in ("slow.docx", "broken.docx", "fast.docx"):
+        path = tmp_path / name
+        path.write_bytes(name.encode())
+        paths.append(str(path))
+    notes = tmp_path / "notes.txt"
+    notes.write_text("plain text")
+    paths.append(str(notes))
+
+    active = 0
+    max_active = 0
+
+    async def parse_to_markdown(file_path, page_range=None):
+        nonlocal active, max_active
+        active += 1
+        max_active = max(max_active, active)
+        try:
+            name = os.path.basename(file_path)
+            await asyncio.sleep(0.2 if name == "slow.docx" else 0.05)
+            if name == "broken.docx":
+                raise ValueError("not a zip file")
+            return f"# {name}"
+        finally:
+            active -= 1
+
+    async def run():
+        loader = DocumentsLoader(paths)
+        with patch.dict(os.environ, {"DOCUMENT_CACHE_MAX_MB": "0"}), patch.object(
+            documents_loader.DOCLING_POOL_SERVICE,
+            "parse_to_markdown",
+            parse_to_markdown,
+        ):
+            await loader.load_documents()
+        return loader
+
+    loader = asyncio.run(run())
+
+    assert loader.documents == ["# slow.docx", "", "# fast.docx", "plain text"]
+    assert loader.errors[0] is None
+    assert loader.errors[1:] == ["not a zip file", None, None]
+    assert loader.get_error_messages() == ["Could not read broken.docx: not a zip file"]
+    assert max_active == 3
@@ -0,0 +1,75 @@
+import asyncio
+import os
+from unittest.mock import AsyncMock, patch
+
+from PIL import Image
+
+from models.pptx_models import (
+    PptxPictureBoxModel,
+    PptxPictureModel,
+    PptxPositionModel,
+    PptxPresentationModel,
+    PptxSlideModel,
+)
+from services import media_service, pptx_presentation_creator
+from services.media_service import STATIC_DIRECTORY, resolve_public_path
+from services.pptx_presentation_creator import PptxPresentationCreator
+
+
+def picture(path: str) -> PptxPictureBoxModel:
+    return PptxPictureBoxModel(
+        position=PptxPositionModel(left=0, top=0, width=100, height=100),
+        picture=PptxPictureModel(is_network=path.startswith("http"), path=path),
+    )
+
+
+def test_resolve_public_path_forms(tmp_path):
+    images_dir = tmp_path / "uploads" / "images"
+    images_dir.mkdir(parents=True)
+    Image.new("RGB", (10, 10)).save(images_dir / "a.png")
+
+    with patch.dict(os.environ, {"APP_DATA_DIRECTORY": str(tmp_path)}):
+        stored = str(images_dir / "a.png")
+        assert resolve_public_path("/api/local-image/a.png") == stored
+        assert resolve_public_path("http://localhost/api/local-image/a.png") == stored
+        assert resolve_public_path("https://example.com/app_data/uploads/images/a.png") == stored
+        assert resolve_public_path("http://localhost/static/images/placeholder.jpg") == os.path.join(
+            STATIC_DIRECTORY, "images", "placeholder.jpg"
+        )
+        assert resolve_public_path("/app_data/../../etc/passwd") is None
+        assert resolve_public_path("https://images.pexels.com/photo.jpeg") is None
+
+
+def test_export_downloads_only_unknown_remote_images(tmp_path):
+    images_dir = tmp_path / "uploads" / "images"
+    images_dir.mkdir(parents=True)
+    Image.new("RGB", (10, 10)).save(images_dir / "a.png")
+    Image.new("RGB", (10, 10)).save(images_dir / "b.png")
+
+    model = PptxPresentationModel(
+        slides=[
+            PptxSlideModel(
+                shapes=[
+                    picture("http://localhost/api/local-image/a.png"),
+                    picture("https://images.pexels.com/indexed.jpeg"),
+                    picture("https://images.pexels.com/new.jpeg"),
+                ]
+            )
+        ]
+    )
+    creator = PptxPresentationCreator(model, str(tmp_path))
+    download = AsyncMock(return_value="/api/local-image/b.png")
+
+    async def run():
+        with patch.dict(os.environ, {"APP_DATA_DIRECTORY": str(tmp_path)}), patch.object(
+            media_service,
+            "_get_indexed_filenames",
+            AsyncMock(return_value={"https://images.pexels.com/indexed.jpeg": "b.png"}),
+        ), patch.object(pptx_presentation_creator, "download_to_storage", download):
+            await creator.fetch_network_assets()
+
+    asyncio.run(run())
+
+    paths = [each.picture.path for each in model.slides[0].shapes]
+    assert paths == [str(images_dir / "a.png"), str(images_dir / "b.png"), str(images_dir / "b.png")]
+    download.assert_awaited_once_with("https://images.pexels.com/new.jpeg")
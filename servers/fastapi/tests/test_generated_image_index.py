@@ -0,0 +1,89 @@
+import asyncio
+import os
+from unittest.mock import AsyncMock, patch
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel
+
+from models.image_prompt import ImagePrompt
+from models.sql.image_asset import ImageAsset
+from services import generated_image_index_service
+from services.generated_image_index_service import GeneratedImageIndexService
+from services.image_generation_service import ImageGenerationService
+
+
+async def get_session_maker(tmp_path):
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{os.path.join(tmp_path, 'assets.db')}"
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            lambda sync_conn: SQLModel.metadata.create_all(
+                sync_conn, tables=[ImageAsset.__table__]
+            )
+        )
+    return async_sessionmaker(engine, expire_on_commit=False)
+
+
+def test_reuses_image_for_same_normalized_prompt_and_theme(tmp_path):
+    async def run():
+        session_maker = await get_session_maker(tmp_path)
+        image_path = os.path.join(tmp_path, "generated.png")
+        with open(image_path, "wb") as f:
+            f.write(b"image")
+        async with session_maker() as sql_session:
+            sql_session.add(
+                ImageAsset(
+                    path=image_path,
+                    extras={"prompt": "A red Car", "theme_prompt": "flat"},
+                )
+            )
+            await sql_session.commit()
+
+        index = GeneratedImageIndexService()
+        with patch.object(
+            generated_image_index_service, "async_session_maker", session_maker
+        ), patch.dict(os.environ, {"REUSE_GENERATED_IMAGES": "true"}):
+            exact = await index.find(
+                ImagePrompt(prompt="a red car!", theme_prompt="Flat")
+            )
+            other_theme = await index.find(
+                ImagePrompt(prompt="a red car", theme_prompt="photo")
+            )
+            os.remove(image_path)
+            removed = await index.find(
+                ImagePrompt(prompt="a red car", theme_prompt="flat")
+            )
+
+        assert exact == image_path
+        assert other_theme is None and removed is None
+        assert index.get_stats()["hits"] == 1
+        assert index.get_stats()["misses"] == 2
+
+    asyncio.run(run())
+
+
+def test_generation_is_skipped_on_index_hit(tmp_path):
+    async def run():
+        image_path = os.path.join(tmp_path, "generated.png")
+        with open(image_path, "wb") as f:
+            f.write(b"image")
+
+        with patch.dict(
+            os.environ,
+            {"IMAGE_PROVIDER": "dall-e-3", "APP_DATA_DIRECTORY": str(tmp_path)},
+        ), patch.object(
+            generated_image_index_service.GENERATED_IMAGE_INDEX_SERVICE,
+            "find",
+            AsyncMock(return_value=image_path),
+        ):
+            service = ImageGenerationService(str(tmp_path), str(tmp_path))
+            service.image_gen_func = AsyncMock()
+            result = await service.generate_image(
+                ImagePrompt(prompt="a red car", theme_prompt="flat")
+            )
+
+        assert result.startswith("/api/local-image/")
+        service.image_gen_func.assert_not_called()
+
+    asyncio.run(run())
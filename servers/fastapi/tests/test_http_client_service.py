@@ -0,0 +1,27 @@
+import asyncio
+
+from services.http_client_service import HttpClientService
+
+
+def test_sessions_are_shared_per_loop():
+    service = HttpClientService()
+
+    async def get_sessions():
+        external = service.get_session()
+        assert service.get_session() is external
+        internal = service.get_session(internal=True)
+        assert internal is not external
+        assert external._trust_env and not internal._trust_env
+        assert external.connector.limit_per_host == service.LIMIT_PER_HOST
+        return external
+
+    first = asyncio.run(get_sessions())
+    second = asyncio.run(get_sessions())
+    assert second is not first
+
+    async def close():
+        session = service.get_session()
+        await service.close()
+        assert session.closed
+
+    asyncio.run(close())
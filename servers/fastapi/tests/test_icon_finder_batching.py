@@ -0,0 +1,82 @@
+import asyncio
+import threading
+from unittest.mock import MagicMock, patch
+
+from services.icon_finder_service import PLACEHOLDER_ICON_URL, IconFinderService
+
+
+def get_ready_service() -> IconFinderService:
+    service = IconFinderService()
+    service.index = MagicMock()
+    service.status = "ready"
+    return service
+
+
+def test_concurrent_queries_share_one_index_query():
+    service = get_ready_service()
+    service.index.query.side_effect = lambda queries, n_results: [
+        [f"{q}-{i}" for i in range(n_results)] for q in queries
+    ]
+
+    async def run():
+        return await asyncio.gather(
+            service.search_icons("chart"),
+            service.search_icons("team", 2),
+            service.search_icons("chart"),
+        )
+
+    results = asyncio.run(run())
+
+    assert results == [
+        ["/static/icons/bold/chart-0.svg"],
+        ["/static/icons/bold/team-0.svg", "/static/icons/bold/team-1.svg"],
+        ["/static/icons/bold/chart-0.svg"],
+    ]
+    service.index.query.assert_called_once_with(["chart", "team"], 2)
+
+
+def test_search_returns_placeholder_while_warming_up():
+    service = IconFinderService()
+    release = threading.Event()
+
+    def initialize():
+        service.status = "warming_up"
+        release.wait(5)
+        service.index = MagicMock()
+        service.index.query.return_value = [["chart-bold"]]
+        service.status = "ready"
+
+    async def run():
+        with patch.object(service, "initialize", side_effect=initialize) as init:
+            assert await service.search_icons("chart") == [PLACEHOLDER_ICON_URL]
+            assert await service.search_icons("chart") == [PLACEHOLDER_ICON_URL]
+            release.set()
+            await service._warm_up_task
+            assert await service.search_icons("chart") == [
+                "/static/icons/bold/chart-bold.svg"
+            ]
+        init.assert_called_once()
+
+    asyncio.run(run())
+    assert service.get_status()["status"] == "ready"
+
+
+def test_repeated_queries_are_served_from_cache():
+    service = get_ready_service()
+    service.index.query.side_effect = lambda queries, n_results: [
+        [f"{q}-{i}" for i in range(n_results)] for q in queries
+    ]
+
+    async def run():
+        first = await service.search_icons("Growth!")
+        second = await service.search_icons("  growth ")
+        third = await service.search_icons("growth", 2)
+        return first, second, third
+
+    first, second, third = asyncio.run(run())
+
+    assert first == second == ["/static/icons/bold/growth-0.svg"]
+    assert len(third) == 2
+    assert service.index.query.call_count == 2
+    stats = service.results_cache.get_stats()
+    assert (stats["hits"], stats["misses"]) == (1, 2)
@@ -0,0 +1,54 @@
+import os
+from unittest.mock import patch
+
+from PIL import Image
+
+from services.image_derivative_service import ImageDerivativeService
+
+
+def save_image(path, size, mode="RGB"):
+    Image.new(mode, size, (200, 100, 50) if mode == "RGB" else (200, 100, 50, 128)).save(
+        path
+    )
+    return str(path)
+
+
+def test_large_image_is_downscaled_once_to_cover_box(tmp_path):
+    source = save_image(tmp_path / "photo.jpg", (4000, 2000))
+    service = ImageDerivativeService()
+
+    with patch.dict(
+        os.environ, {"APP_DATA_DIRECTORY": str(tmp_path), "IMAGE_DERIVATIVE_SCALE": "2"}
+    ):
+        derivative = service.get_derivative_path(source, 400, 400)
+        mtime = os.path.getmtime(derivative)
+        assert service.get_derivative_path(source, 400, 400) == derivative
+
+    assert derivative != source and derivative.endswith(".jpg")
+    assert os.path.getmtime(derivative) == mtime
+    with Image.open(derivative) as image:
+        # Covers 800x800 while keeping the 2:1 aspect ratio
+        assert image.size == (1600, 800)
+
+
+def test_small_or_transparent_images(tmp_path):
+    small = save_image(tmp_path / "small.jpg", (300, 200))
+    logo = save_image(tmp_path / "logo.png", (3000, 3000), mode="RGBA")
+    service = ImageDerivativeService()
+
+    with patch.dict(os.environ, {"APP_DATA_DIRECTORY": str(tmp_path)}):
+        assert service.get_derivative_path(small, 400, 400) == small
+        webp = service.get_derivative_path(small, 400, 400, "webp")
+        png = service.get_derivative_path(logo, 100, 100)
+
+    assert webp.endswith(".webp")
+    assert png.endswith(".png")
+    with Image.open(png) as image:
+        assert image.mode == "RGBA" and image.size == (200, 200)
+
+
+def test_original_is_used_without_app_data_directory(tmp_path):
+    source = save_image(tmp_path / "photo.jpg", (2000, 1500))
+    with patch.dict(os.environ):
+        os.environ.pop("APP_DATA_DIRECTORY", None)
+        assert ImageDerivativeService().get_derivative_path(source, 100, 100) == source
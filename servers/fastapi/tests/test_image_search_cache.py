@@ -0,0 +1,72 @@
+import asyncio
+import os
+from datetime import timedelta
+from unittest.mock import AsyncMock, patch
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel
+
+from models.sql.image_search_cache import ImageSearchCacheModel
+from services import image_search_cache_service
+from services.image_generation_service import ImageGenerationService
+from services.image_search_cache_service import ImageSearchCacheService
+from utils.datetime_utils import get_current_utc_datetime
+
+
+async def get_session_maker(tmp_path):
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{os.path.join(tmp_path, 'cache.db')}"
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            lambda sync_conn: SQLModel.metadata.create_all(
+                sync_conn, tables=[ImageSearchCacheModel.__table__]
+            )
+        )
+    return async_sessionmaker(engine, expire_on_commit=False)
+
+
+def test_cache_expires_and_evicts(tmp_path):
+    async def run():
+        session_maker = await get_session_maker(tmp_path)
+        cache = ImageSearchCacheService()
+        with patch.object(
+            image_search_cache_service, "async_session_maker", session_maker
+        ), patch.dict(os.environ, {"IMAGE_SEARCH_CACHE_MAX_ENTRIES": "2"}):
+            assert await cache.get("pexels", "Mountain Lake!") is None
+
+            await cache.set("pexels", "mountain lake", ["a", "b"])
+            assert await cache.get("pexels", "  Mountain   LAKE! ") == ["a", "b"]
+            assert await cache.get("pixabay", "mountain lake") is None
+
+            await cache.set("pexels", "forest", ["c"])
+            await cache.set("pexels", "desert", ["d"])
+            assert await cache.get("pexels", "mountain lake") is None
+            assert await cache.get("pexels", "desert") == ["d"]
+
+            with patch.object(
+                image_search_cache_service,
+                "get_current_utc_datetime",
+                return_value=get_current_utc_datetime() + timedelta(days=30),
+            ):
+                assert await cache.get("pexels", "desert") is None
+
+        assert cache.get_stats()["hits"] == 2
+
+    asyncio.run(run())
+
+
+def test_duplicate_prompts_get_different_photos(tmp_path):
+    async def run():
+        session_maker = await get_session_maker(tmp_path)
+        service = ImageGenerationService(str(tmp_path), str(tmp_path))
+        search_pexels = AsyncMock(return_value=["one", "two"])
+        with patch.object(
+            image_search_cache_service, "async_session_maker", session_maker
+        ), patch.object(service, "search_pexels", search_pexels):
+            results = [await service.get_image_from_pexels("office") for _ in range(3)]
+
+        assert results == ["one", "two", "one"]
+        search_pexels.assert_awaited_once()
+
+    asyncio.run(run())
@@ -0,0 +1,44 @@
+import asyncio
+import time
+
+from services.loop_monitor_service import LoopMonitorService
+
+
+def block_event_loop(seconds: float):
+    time.sleep(seconds)
+
+
+def test_loop_monitor_records_blocking_location():
+    async def run():
+        monitor = LoopMonitorService(threshold_ms=50, interval_ms=10)
+        monitor.start()
+        await asyncio.sleep(0.05)
+        block_event_loop(0.3)
+        await asyncio.sleep(0.05)
+        await monitor.stop()
+        return monitor.get_report()
+
+    report = asyncio.run(run())
+
+    assert report["lag"]["samples"] > 0
+    assert report["lag"]["max_ms"] >= 200
+    locations = report["blocking_locations"]
+    assert len(locations) == 1
+    assert "block_event_loop" in locations[0]["location"]
+    assert locations[0]["count"] == 1
+    assert locations[0]["max_ms"] >= 200
+
+
+def test_loop_monitor_ignores_short_callbacks():
+    async def run():
+        monitor = LoopMonitorService(threshold_ms=200, interval_ms=10)
+        monitor.start()
+        for _ in range(5):
+            block_event_loop(0.01)
+            await asyncio.sleep(0.01)
+        await monitor.stop()
+        return monitor.get_report()
+
+    report = asyncio.run(run())
+
+    assert report["blocking_locations"] == []
@@ -0,0 +1,156 @@
+import asyncio
+import os
+import time
+from unittest.mock import patch
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel
+
+from models.sql.image_asset import ImageAsset
+from models.sql.media_url import MediaUrlModel
+from models.sql.presentation import PresentationModel
+from models.sql.presentation_layout_code import PresentationLayoutCodeModel
+from models.sql.slide import SlideModel
+from services import media_gc_service, media_service
+from services.image_derivative_service import IMAGE_DERIVATIVE_SERVICE
+from services.media_gc_service import MediaGarbageCollectorService
+from services.media_service import download_to_storage, finalize_local_path
+
+
+async def get_session_maker(tmp_path):
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{os.path.join(tmp_path, 'media.db')}"
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            lambda sync_conn: SQLModel.metadata.create_all(
+                sync_conn,
+                tables=[
+                    PresentationModel.__table__,
+                    SlideModel.__table__,
+                    PresentationLayoutCodeModel.__table__,
+                    ImageAsset.__table__,
+                    MediaUrlModel.__table__,
+                ],
+            )
+        )
+    return async_sessionmaker(engine, expire_on_commit=False)
+
+
+def write_file(path, content: bytes):
+    with open(path, "wb") as f:
+        f.write(content)
+    return str(path)
+
+
+def test_finalize_local_path_deduplicates_content(tmp_path):
+    with patch.dict(os.environ, {"APP_DATA_DIRECTORY": str(tmp_path)}):
+        first = finalize_local_path(write_file(tmp_path / "a.png", b"same"))
+        second = finalize_local_path(write_file(tmp_path / "b.png", b"same"))
+        images = os.listdir(os.path.join(tmp_path, "uploads", "images"))
+
+    assert first == second
+    assert first.startswith("/api/local-image/") and first.endswith(".png")
+    assert images == [os.path.basename(first)]
+
+
+def test_indexed_url_is_not_downloaded_again(tmp_path):
+    async def run():
+        session_maker = await get_session_maker(tmp_path)
+        with patch.dict(os.environ, {"APP_DATA_DIRECTORY": str(tmp_path)}), patch.object(
+            media_service, "async_session_maker", session_maker
+        ):
+            local_url = finalize_local_path(write_file(tmp_path / "a.jpg", b"photo"))
+            url = "https://images.example.com/photo.jpg"
+            await media_service._index_url(url, os.path.basename(local_url))
+
+            with patch.object(
+                media_service.HTTP_CLIENT_SERVICE, "get_session"
+            ) as get_session:
+                assert await download_to_storage(url) == local_url
+                get_session.assert_not_called()
+
+    asyncio.run(run())
+
+
+def test_gc_deletes_only_unreferenced_old_files(tmp_path):
+    async def run():
+        session_maker = await get_session_maker(tmp_path)
+        with patch.dict(os.environ, {"APP_DATA_DIRECTORY": str(tmp_path)}), patch.object(
+            media_service, "async_session_maker", session_maker
+        ), patch.object(media_gc_service, "async_session_maker", session_maker):
+            images_dir = media_service.get_media_images_directory()
+            used = finalize_local_path(write_file(tmp_path / "used.png", b"used"))
+            orphan = finalize_local_path(write_file(tmp_path / "orphan.png", b"orphan"))
+            legacy = write_file(os.path.join(images_dir, "legacy.png"), b"legacy")
+            await media_service._index_url(
+                "https://example.com/orphan.png", os.path.basename(orphan)
+            )
+
+            presentation = PresentationModel(content="", n_slides=1, language="en")
+            async with session_maker() as sql_session:
+                sql_session.add(presentation)
+                sql_session.add(
+                    SlideModel(
+                        presentation=presentation.id,
+                        layout_group="general",
+                        layout="image",
+                        index=0,
+                        content={"image": {"__image_url__": used}},
+                        html_content=None,
+                        properties=None,
+                    )
+                )
+                await sql_session.commit()
+
+            old = time.time() - 24 * 60 * 60
+            for name in os.listdir(images_dir):
+                os.utime(os.path.join(images_dir, name), (old, old))
+
+            gc = MediaGarbageCollectorService()
+            dry_run = await gc.collect(dry_run=True)
+            assert dry_run["deleted"] == [os.path.basename(orphan)]
+            assert len(os.listdir(images_dir)) == 3
+
+            result = await gc.collect()
+            assert result["deleted"] == [os.path.basename(orphan)]
+            assert sorted(os.listdir(images_dir)) == sorted(
+                [os.path.basename(used), os.path.basename(legacy)]
+            )
+            async with session_maker() as sql_session:
+                assert await sql_session.get(
+                    MediaUrlModel, media_service._get_url_id("https://example.com/orphan.png")
+                ) is None
+
+    asyncio.run(run())
+
+
+def test_gc_keeps_derivatives_of_sources_that_still_exist(tmp_path):
+    async def run():
+        session_maker = await get_session_maker(tmp_path)
+        with patch.dict(os.environ, {"APP_DATA_DIRECTORY": str(tmp_path)}), patch.object(
+            media_gc_service, "async_session_maker", session_maker
+        ):
+            images_dir = media_service.get_media_images_directory()
+            derivatives_dir = os.path.join(tmp_path, "derivatives")
+            orphan = finalize_local_path(write_file(tmp_path / "orphan.png", b"orphan"))
+            orphan_hash = os.path.splitext(os.path.basename(orphan))[0]
+            # An upload named by uuid, its derivative is keyed by content hash
+            upload = write_file(tmp_path / "3f2a9c1e-upload.png", b"upload")
+            upload_hash = IMAGE_DERIVATIVE_SERVICE.get_source_hash(upload)
+            os.makedirs(derivatives_dir, exist_ok=True)
+            write_file(os.path.join(derivatives_dir, f"{orphan_hash}_10x10.jpg"), b"a")
+            write_file(os.path.join(derivatives_dir, f"{upload_hash}_10x10.jpg"), b"b")
+
+            old = time.time() - 24 * 60 * 60
+            for directory in (images_dir, derivatives_dir):
+                for name in os.listdir(directory):
+                    os.utime(os.path.join(directory, name), (old, old))
+
+            result = await MediaGarbageCollectorService().collect()
+
+            assert result["deleted"] == [os.path.basename(orphan)]
+            assert result["deleted_derivatives"] == 1
+            assert os.listdir(derivatives_dir) == [f"{upload_hash}_10x10.jpg"]
+
+    asyncio.run(run())
@@ -0,0 +1,115 @@
+import json
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from services import icon_finder_service
+from services.icon_finder_service import NumpyIconIndex
+
+
+def fake_embedding_function(texts):
+    vectors = []
+    for text in texts:
+        rng = np.random.default_rng(abs(hash(text.split()[0])) % 2**32)
+        vectors.append(rng.normal(size=16))
+    return vectors
+
+
+@pytest.fixture
+def icons_path(tmp_path, monkeypatch):
+    path = tmp_path / "icons.json"
+    path.write_text(json.dumps({"icons": []}))
+    monkeypatch.setattr(icon_finder_service, "ICONS_FILE_PATH", str(path))
+    return path
+
+
+def get_index(tmp_path):
+    return NumpyIconIndex(str(tmp_path / "index"), fake_embedding_function)
+
+
+def test_top_k_matches_brute_force(tmp_path, icons_path):
+    ids = [f"icon-{i}-bold" for i in range(200)]
+    index = get_index(tmp_path)
+    index.build(ids, ids)
+    index.load()
+
+    assert isinstance(index.embeddings, np.memmap)
+    assert index.embeddings.dtype == np.float16
+    assert index.count() == 200
+
+    queries = ["icon-7-bold", "icon-42-bold", "something else"]
+    results = index.query(queries, 5)
+
+    expected_scores = index.embed(queries) @ index.embeddings.astype(np.float32).T
+    for query, result, scores in zip(queries, results, expected_scores):
+        assert result == [ids[i] for i in np.argsort(-scores)[:5]]
+    assert results[0][0] == "icon-7-bold"
+    assert results[1][0] == "icon-42-bold"
+
+
+def test_query_clamps_k_to_index_size(tmp_path, icons_path):
+    index = get_index(tmp_path)
+    index.build(["a-bold", "b-bold"], ["a-bold", "b-bold"])
+    index.load()
+
+    assert index.query(["a-bold"], 10)[0][0] == "a-bold"
+    assert len(index.query(["a-bold"], 10)[0]) == 2
+
+
+def test_index_is_rebuilt_only_when_stale(tmp_path, icons_path):
+    icons_path.write_text(
+        json.dumps({"icons": [{"name": "chart-bold", "tags": "graph"}]})
+    )
+    index = get_index(tmp_path)
+    assert index.load_or_build() is True
+    assert index.get_manifest()["count"] == 1
+
+    with patch.object(index, "build") as build:
+        assert NumpyIconIndex(index.directory, fake_embedding_function).is_up_to_date()
+        assert index.load_or_build() is False
+        build.assert_not_called()
+
+    icons_path.write_text(
+        json.dumps(
+            {
+                "icons": [
+                    {"name": "chart-bold", "tags": "graph"},
+                    {"name": "team-bold", "tags": "people"},
+                ]
+            }
+        )
+    )
+    assert not index.is_up_to_date()
+    assert index.load_or_build() is True
+    assert index.ids == ["chart-bold", "team-bold"]
+
+    fake_embedding_function.MODEL_NAME = "another-model"
+    try:
+        assert not index.is_up_to_date()
+    finally:
+        del fake_embedding_function.MODEL_NAME
+
+    with open(index.embeddings_path, "r+b") as f:
+        f.seek(-4, 2)
+        f.write(b"\x00\x01\x02\x03")
+    assert not index.is_up_to_date()
+
+
+def test_query_embeddings_are_cached(tmp_path, icons_path):
+    calls = []
+
+    def embedding_function(texts):
+        calls.append(list(texts))
+        return fake_embedding_function(texts)
+
+    index = NumpyIconIndex(str(tmp_path / "index"), embedding_function)
+    index.build(["a-bold", "b-bold"], ["a-bold", "b-bold"])
+    index.load()
+    calls.clear()
+
+    index.query(["a-bold"], 1)
+    index.query(["a-bold", "b-bold"], 1)
+
+    assert calls == [["a-bold"], ["b-bold"]]
+    assert index.query_embeddings.get_stats()["hits"] == 1
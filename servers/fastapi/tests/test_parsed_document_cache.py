@@ -0,0 +1,104 @@
+import asyncio
+import os
+from unittest.mock import AsyncMock, patch
+
+from services import documents_loader
+from services.documents_loader import DocumentsLoader
+from services.parsed_document_cache_service import ParsedDocumentCacheService
+
+
+def test_same_file_is_parsed_once(tmp_path):
+    upload = tmp_path / "report.docx"
+    upload.write_bytes(b"first version")
+    copy = tmp_path / "report copy.docx"
+    copy.write_bytes(b"first version")
+    parse = AsyncMock(side_effect=lambda path, page_range=None: f"# parsed {os.path.basename(path)}")
+
+    async def load(path):
+        loader = DocumentsLoader([str(path)])
+        await loader.load_documents(str(tmp_path))
+        return loader.documents[0]
+
+    async def run():
+        with patch.dict(os.environ, {"APP_DATA_DIRECTORY": str(tmp_path)}), patch.object(
+            documents_loader.DOCLING_POOL_SERVICE, "parse_to_markdown", parse
+        ):
+            assert await load(upload) == "# parsed report.docx"
+            # Same bytes under another name hit the cache
+            assert await load(copy) == "# parsed report.docx"
+            assert parse.await_count == 1
+
+            upload.write_bytes(b"second version")
+            await load(upload)
+            assert parse.await_count == 2
+
+    asyncio.run(run())
+
+
+def test_page_images_are_cached_and_least_recently_used_evicted(tmp_path):
+    pages_dir = tmp_path / "render"
+    pages_dir.mkdir()
+    image_paths = []
+    for number in (1, 2, 10):
+        path = pages_dir / f"page_{number}.png"
+        path.write_bytes(b"x" * 400)
+        image_paths.append(str(path))
+    cache = ParsedDocumentCacheService()
+
+    async def run():
+        with patch.dict(
+            os.environ,
+            {"APP_DATA_DIRECTORY": str(tmp_path), "DOCUMENT_CACHE_MAX_MB": "0.002"},
+        ):
+            await cache.set_page_images("a", {"resolution": 150}, image_paths)
+            output_dir = tmp_path / "output"
+            output_dir.mkdir()
+            cached = await cache.get_page_images("a", {"resolution": 150}, str(output_dir))
+            assert [os.path.basename(each) for each in cached] == [
+                "page_1.png",
+                "page_2.png",
+                "page_10.png",
+            ]
+            assert await cache.get_page_images("a", {"resolution": 72}, str(output_dir)) is None
+
+            await cache.set_markdown("b", {}, "y" * 600)
+            await cache.set_markdown("c", {}, "z" * 600)
+            # 1200 pages bytes + 1200 markdown bytes exceed 2000, pages go first
+            assert await cache.get_page_images("a", {"resolution": 150}, str(output_dir)) is None
+            assert await cache.get_markdown("b", {}) == "y" * 600
+
+    asyncio.run(run())
+
+
+def test_broken_cache_falls_back_to_parsing(tmp_path):
+    upload = tmp_path / "report.docx"
+    upload.write_bytes(b"content")
+    parse = AsyncMock(side_effect=lambda path, page_range=None: "# parsed")
+
+    async def load():
+        loader = DocumentsLoader([str(upload)])
+        await loader.load_documents()
+        return loader.documents[0], loader.errors
+
+    async def run():
+        with patch.object(
+            documents_loader.DOCLING_POOL_SERVICE, "parse_to_markdown", parse
+        ):
+            # Cache directory can't be resolved without APP_DATA_DIRECTORY
+            with patch.dict(os.environ):
+                os.environ.pop("APP_DATA_DIRECTORY", None)
+                assert await load() == ("# parsed", [None])
+
+            # Entry that isn't valid UTF-8
+            with patch.dict(os.environ, {"APP_DATA_DIRECTORY": str(tmp_path)}):
+                cache = ParsedDocumentCacheService()
+                file_hash = await DocumentsLoader.get_file_hash(str(upload))
+                path = cache._get_path(
+                    cache.get_key(file_hash, documents_loader.DOCLING_PARSER_OPTIONS),
+                    ".md",
+                )
+                with open(path, "wb") as f:
+                    f.write(b"\xff\xfe\xfa")
+                assert await load() == ("# parsed", [None])
+
+    asyncio.run(run())
@@ -0,0 +1,54 @@
+import asyncio
+import os
+from unittest.mock import patch
+
+from PIL import Image
+
+from services.pdf_render_service import PdfRenderService
+from tests.test_pdf_text_extraction import write_pdf
+
+
+def render(pdf_path, temp_dir, env):
+    service = PdfRenderService()
+
+    async def run():
+        try:
+            return [
+                page
+                async for page in service.stream_page_images(str(pdf_path), temp_dir)
+            ]
+        finally:
+            await service.stop()
+
+    with patch.dict(os.environ, {"PDF_RENDER_WORKERS": "2", **env}):
+        return asyncio.run(run())
+
+
+def test_pages_are_split_over_workers():
+    service = PdfRenderService()
+
+    with patch.dict(os.environ, {"PDF_RENDER_WORKERS": "3"}):
+        assert service.split_page_ranges(5) == [(1, 2), (3, 4), (5, 5)]
+        assert service.split_page_ranges(20)[:2] == [(1, 4), (5, 8)]
+        assert service.split_page_ranges(0) == []
+
+
+def test_pages_stream_in_order_with_configured_format(tmp_path):
+    pdf_path = tmp_path / "deck.pdf"
+    write_pdf(pdf_path, [[(24, f"Slide {i}")] for i in range(1, 11)])
+    temp_dir = tmp_path / "pages"
+    temp_dir.mkdir()
+
+    pages = render(
+        pdf_path,
+        str(temp_dir),
+        {"PDF_PAGE_IMAGE_DPI": "36", "PDF_PAGE_IMAGE_FORMAT": "jpeg"},
+    )
+
+    assert [page_number for page_number, _ in pages] == list(range(1, 11))
+    for page_number, image_path in pages:
+        assert image_path == str(temp_dir / f"page_{page_number}.jpeg")
+        with Image.open(image_path) as image:
+            assert image.format == "JPEG"
+            # US Letter is 8.5 x 11 inches
+            assert image.size == (306, 396)
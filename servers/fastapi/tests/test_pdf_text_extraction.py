@@ -0,0 +1,133 @@
+import asyncio
+import os
+from unittest.mock import AsyncMock, patch
+
+from services import documents_loader
+from services.documents_loader import DocumentsLoader
+from services.pdf_text_service import PDF_TEXT_SERVICE
+
+
+def write_pdf(path, pages):
+    """Writes a minimal PDF, pages are lists of (font size, text) lines."""
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    page_ids = []
+    for lines in pages:
+        stream = b""
+        y = 740
+        for size, text in lines:
+            stream += b"BT /F1 %d Tf 72 %d Td (%s) Tj ET\n" % (size, y, text.encode())
+            y -= size + 10
+        objects.append(b"<< /Length %d >>\nstream\n%sendstream" % (len(stream), stream))
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>"
+            % len(objects)
+        )
+        page_ids.append(len(objects))
+    kids = b" ".join(b"%d 0 R" % each for each in page_ids)
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(page_ids))
+
+    content = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(content))
+        content += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(content)
+    content += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    content += b"".join(b"%010d 00000 n \n" % each for each in offsets)
+    content += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1,
+        xref,
+    )
+    path.write_bytes(content)
+
+
+BODY = "Quarterly revenue grew across every region thanks to new customers."
+
+
+def text_page(title):
+    return [(24, title), (11, BODY), (11, BODY), (11, BODY)]
+
+
+def load(paths, env):
+    parse = AsyncMock(side_effect=lambda path, page_range=None: "# from docling")
+
+    async def run():
+        loader = DocumentsLoader([str(each) for each in paths])
+        with patch.dict(os.environ, {"DOCUMENT_CACHE_MAX_MB": "0", **env}), patch.object(
+            documents_loader.DOCLING_POOL_SERVICE, "parse_to_markdown", parse
+        ):
+            await loader.load_documents()
+        return loader.documents
+
+    return asyncio.run(run()), parse
+
+
+def test_text_native_pdf_skips_docling(tmp_path):
+    path = tmp_path / "report.pdf"
+    write_pdf(path, [text_page("Overview"), text_page("Results"), text_page("Outlook")])
+
+    (document,), parse = load([path], {})
+
+    parse.assert_not_awaited()
+    assert document.startswith("# Overview\n" + BODY)
+    assert "# Results" in document and "# Outlook" in document
+
+
+def test_page_limit_and_scanned_fallback(tmp_path):
+    report = tmp_path / "report.pdf"
+    write_pdf(report, [text_page("One"), text_page("Two"), text_page("Three")])
+    scanned = tmp_path / "scanned.pdf"
+    write_pdf(scanned, [[], [], [(11, "tiny")]])
+
+    (document, scanned_document), parse = load(
+        [report, scanned], {"PDF_MAX_PAGES": "2"}
+    )
+
+    assert "# Two" in document and "Three" not in document
+    assert scanned_document == "# from docling"
+    parse.assert_awaited_once_with(str(scanned), (1, 2))
+    assert PDF_TEXT_SERVICE.probe(str(scanned)).reason == "pages without text layer"
+
+
+def test_pages_stream_one_at_a_time(tmp_path):
+    path = tmp_path / "report.pdf"
+    write_pdf(path, [text_page("One"), text_page("Two")])
+
+    async def run():
+        probe = PDF_TEXT_SERVICE.probe(str(path))
+        return [
+            page
+            async for page in PDF_TEXT_SERVICE.stream_pages(
+                str(path), probe.body_font_size
+            )
+        ]
+
+    pages = asyncio.run(run())
+    assert [number for number, _ in pages] == [1, 2]
+    assert pages[1][1].startswith("# Two")
+
+
+def test_unreadable_text_layer_falls_back_to_docling(tmp_path):
+    broken = tmp_path / "broken.pdf"
+    broken.write_bytes(b"%PDF-1.4\nnot really a pdf")
+    report = tmp_path / "report.pdf"
+    write_pdf(report, [text_page("One")])
+
+    (document,), parse = load([broken], {})
+
+    assert document == "# from docling"
+    parse.assert_awaited_once_with(str(broken), None)
+
+    def fail(*args, **kwargs):
+        raise ValueError("bad content stream")
+
+    with patch.object(PDF_TEXT_SERVICE, "stream_pages", fail):
+        (document,), parse = load([report], {})
+
+    assert document == "# from docling"
+    parse.assert_awaited_once_with(str(report), None)
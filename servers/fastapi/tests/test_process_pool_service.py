@@ -0,0 +1,96 @@
+import asyncio
+import os
+import time
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from services.process_pool_service import ProcessPoolBusyError, WarmProcessPool
+
+
+STATE = {}
+
+
+def initialize():
+    STATE["initialized_in"] = os.getpid()
+
+
+def get_initialized_pid():
+    return STATE["initialized_in"], os.getpid()
+
+
+def sleep_and_return(seconds: float, value: str) -> str:
+    time.sleep(seconds)
+    return value
+
+
+def get_pool(workers: int = 1, max_queue: int = 8) -> WarmProcessPool:
+    return WarmProcessPool("test", initialize, lambda: workers, lambda: max_queue)
+
+
+def test_jobs_run_in_initialized_workers():
+    async def run():
+        pool = get_pool(workers=2)
+        try:
+            results = await asyncio.gather(
+                *[pool.run(get_initialized_pid) for _ in range(4)]
+            )
+        finally:
+            await pool.stop()
+        return results
+
+    results = asyncio.run(run())
+    assert all(initialized == pid != os.getpid() for initialized, pid in results)
+
+
+def test_timed_out_job_gets_a_fresh_worker():
+    async def run():
+        pool = get_pool()
+        try:
+            await pool.run(sleep_and_return, 0, "warm")
+            with pytest.raises(asyncio.TimeoutError):
+                await pool.run(sleep_and_return, 30, "slow", timeout=0.5)
+            # Would wait for the slow job if its process was still running
+            started_at = time.perf_counter()
+            assert await pool.run(sleep_and_return, 0, "next", timeout=20) == "next"
+            assert time.perf_counter() - started_at < 20
+            assert pool.get_stats()["timed_out"] == 1
+        finally:
+            await pool.stop()
+
+    asyncio.run(run())
+
+
+def test_full_queue_rejects_jobs():
+    async def run():
+        pool = get_pool(workers=1, max_queue=1)
+        try:
+            running = asyncio.create_task(pool.run(sleep_and_return, 1, "a"))
+            await asyncio.sleep(0.1)
+            queued = asyncio.create_task(pool.run(sleep_and_return, 0, "b"))
+            await asyncio.sleep(0.1)
+            with pytest.raises(ProcessPoolBusyError):
+                await pool.run(sleep_and_return, 0, "c")
+            assert await asyncio.gather(running, queued) == ["a", "b"]
+        finally:
+            await pool.stop()
+
+    asyncio.run(run())
+
+
+def test_stop_with_jobs_in_flight():
+    async def run():
+        pool = get_pool()
+        running = asyncio.create_task(pool.run(sleep_and_return, 30, "slow"))
+        await asyncio.sleep(0.5)
+        await pool.stop()
+        with pytest.raises(BrokenProcessPool):
+            await running
+        assert not pool.is_started
+        # Starts again on the next job
+        try:
+            assert await pool.run(sleep_and_return, 0, "next", timeout=20) == "next"
+        finally:
+            await pool.stop()
+
+    asyncio.run(run())
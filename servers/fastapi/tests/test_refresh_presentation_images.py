@@ -0,0 +1,125 @@
+import asyncio
+import json
+import os
+from unittest.mock import AsyncMock, patch
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel
+
+from api.v1.ppt.endpoints import images
+from models.sql.image_asset import ImageAsset
+from models.sql.presentation import PresentationModel
+from models.sql.slide import SlideModel
+from services.database import get_async_session
+
+
+PEXELS_URL = "https://images.pexels.com/photos/1/a.jpeg"
+
+
+async def create_presentation(tmp_path):
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{os.path.join(tmp_path, 'refresh.db')}"
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            lambda sync_conn: SQLModel.metadata.create_all(
+                sync_conn,
+                tables=[
+                    PresentationModel.__table__,
+                    SlideModel.__table__,
+                    ImageAsset.__table__,
+                ],
+            )
+        )
+    session_maker = async_sessionmaker(engine, expire_on_commit=False)
+
+    presentation = PresentationModel(content="", n_slides=3, language="en")
+    contents = [
+        {"image": {"__image_prompt__": "office", "__image_url__": PEXELS_URL}},
+        {"image": {"__image_prompt__": "team", "__image_url__": "/api/local-image/x.jpg"}},
+        {
+            "images": [
+                {"__image_prompt__": "city", "__image_url__": PEXELS_URL},
+                {"__image_prompt__": "sea", "__image_url__": "https://cdn.pixabay.com/b.jpg"},
+            ]
+        },
+    ]
+    async with session_maker() as sql_session:
+        sql_session.add(presentation)
+        for index, content in enumerate(contents):
+            sql_session.add(
+                SlideModel(
+                    presentation=presentation.id,
+                    layout_group="general",
+                    layout="image",
+                    index=index,
+                    content=content,
+                    html_content=None,
+                    properties=None,
+                )
+            )
+        await sql_session.commit()
+    return session_maker, presentation.id
+
+
+def get_client(session_maker):
+    app = FastAPI()
+    app.include_router(images.IMAGES_ROUTER)
+
+    async def get_test_session():
+        async with session_maker() as session:
+            yield session
+
+    app.dependency_overrides[get_async_session] = get_test_session
+    return TestClient(app)
+
+
+def test_dry_run_counts_stock_images(tmp_path):
+    session_maker, presentation_id = asyncio.run(create_presentation(tmp_path))
+    response = get_client(session_maker).post(
+        "/images/refresh-presentation",
+        json={"id": str(presentation_id), "dry_run": True},
+    )
+
+    assert response.json() == {
+        "id": str(presentation_id),
+        "dry_run": True,
+        "slides": 2,
+        "images": 3,
+        "by_host": {"pexels.com": 2, "pixabay.com": 1},
+    }
+
+
+def test_streams_progress_and_commits_slides(tmp_path):
+    session_maker, presentation_id = asyncio.run(create_presentation(tmp_path))
+    generate_image = AsyncMock(side_effect=lambda prompt, priority: f"/local/{prompt.prompt}.jpg")
+
+    with patch.dict(os.environ, {"APP_DATA_DIRECTORY": str(tmp_path)}), patch.object(
+        images.ImageGenerationService, "generate_image", generate_image
+    ):
+        response = get_client(session_maker).post(
+            "/images/refresh-presentation",
+            json={"id": str(presentation_id), "stream": True},
+        )
+
+    events = [
+        json.loads(line[len("data: "):])
+        for line in response.text.splitlines()
+        if line.startswith("data: ")
+    ]
+    assert sorted(each["slide"] for each in events[:-1]) == [0, 2]
+    assert events[-1]["result"]["regenerated"] == 3
+
+    async def get_urls():
+        async with session_maker() as sql_session:
+            slides = await sql_session.scalars(
+                images.select(SlideModel).order_by(SlideModel.index)
+            )
+            return [json.dumps(slide.content) for slide in slides]
+
+    urls = asyncio.run(get_urls())
+    assert "/local/office.jpg" in urls[0]
+    assert "/api/local-image/x.jpg" in urls[1]
+    assert "/local/city.jpg" in urls[2] and "/local/sea.jpg" in urls[2]
@@ -0,0 +1,77 @@
+import os
+import time
+from unittest.mock import patch
+
+from fastapi import BackgroundTasks, FastAPI
+from fastapi.testclient import TestClient
+
+from api.middlewares import RequestProfilingMiddleware
+from api.v1.admin.router import API_V1_ADMIN_ROUTER
+from services.request_profiler_service import REQUEST_PROFILER_SERVICE
+
+
+def slow_background_job():
+    time.sleep(0.2)
+
+
+app = FastAPI()
+app.include_router(API_V1_ADMIN_ROUTER)
+app.add_middleware(RequestProfilingMiddleware)
+
+
+@app.post("/generate/async")
+async def generate_async(background_tasks: BackgroundTasks):
+    background_tasks.add_task(slow_background_job)
+    return {"status": "pending"}
+
+
+def get_env(tmp_path, profiling="true"):
+    return {
+        "APP_DATA_DIRECTORY": str(tmp_path),
+        "ADMIN_TOKEN": "secret",
+        "REQUEST_PROFILING": profiling,
+    }
+
+
+def test_profile_includes_background_tasks(tmp_path):
+    with patch.dict(os.environ, get_env(tmp_path)):
+        client = TestClient(app)
+        response = client.post(
+            "/generate/async",
+            headers={"X-Profile": "true", "X-Admin-Token": "secret"},
+        )
+        profile_id = response.headers["X-Profile-Id"]
+
+        profiles = client.get(
+            "/api/v1/admin/profiles", headers={"X-Admin-Token": "secret"}
+        ).json()
+        assert profiles[0]["id"] == profile_id
+        assert profiles[0]["path"] == "/generate/async"
+        assert profiles[0]["duration_ms"] >= 200
+
+        profile = client.get(
+            f"/api/v1/admin/profiles/{profile_id}",
+            headers={"X-Admin-Token": "secret"},
+        )
+        assert profile.status_code == 200
+        assert profile.content
+
+
+def test_requests_are_not_profiled_without_admin_token(tmp_path):
+    with patch.dict(os.environ, get_env(tmp_path)):
+        client = TestClient(app)
+        response = client.post(
+            "/generate/async", headers={"X-Profile": "true", "X-Admin-Token": "wrong"}
+        )
+        assert "X-Profile-Id" not in response.headers
+        assert REQUEST_PROFILER_SERVICE.list_profiles() == []
+
+
+def test_requests_are_not_profiled_when_disabled(tmp_path):
+    with patch.dict(os.environ, get_env(tmp_path, profiling="false")):
+        client = TestClient(app)
+        response = client.post(
+            "/generate/async",
+            headers={"X-Profile": "true", "X-Admin-Token": "secret"},
+        )
+        assert "X-Profile-Id" not in response.headers
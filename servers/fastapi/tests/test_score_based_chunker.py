@@ -0,0 +1,58 @@
+import asyncio
+
+import pytest
+
+from services.score_based_chunker import ScoreBasedChunker
+
+
+DOCUMENT = "\n".join(
+    [
+        "Preamble # not a heading",
+        "# Title",
+        "Intro",
+        "  ## Repeated",
+        "first body",
+        "## Repeated",
+        "second body",
+        "### Last\r",
+        "tail",
+    ]
+)
+
+
+def test_headings_are_found_with_line_offsets():
+    headings = ScoreBasedChunker().extract_headings_with_offsets(DOCUMENT)
+
+    assert [heading for heading, _, _ in headings] == [
+        "# Title",
+        "## Repeated",
+        "## Repeated",
+        "### Last",
+    ]
+    for heading, line_start, content_start in headings:
+        line = DOCUMENT[line_start:content_start]
+        assert line.strip() == heading
+        assert content_start == len(DOCUMENT) or DOCUMENT[content_start - 1] == "\n"
+
+
+def test_duplicate_headings_keep_their_own_content():
+    chunks = ScoreBasedChunker().get_chunks(DOCUMENT, 10)
+
+    assert [(chunk.heading, chunk.content) for chunk in chunks] == [
+        ("# Title", "Intro"),
+        ("## Repeated", "first body"),
+        ("## Repeated", "second body"),
+        ("### Last", "tail"),
+    ]
+
+
+def test_get_n_chunks_matches_chunks_from_headings():
+    chunker = ScoreBasedChunker()
+    headings = chunker.extract_headings(DOCUMENT)
+    scores = chunker.score_headings(headings)
+
+    chunks = asyncio.run(chunker.get_n_chunks(DOCUMENT, 2))
+
+    assert chunks == chunker.get_chunks_from_headings(DOCUMENT, headings, scores, 2)
+    with pytest.raises(ValueError):
+        asyncio.run(chunker.get_n_chunks(DOCUMENT, 5))
@@ -0,0 +1,25 @@
+import secrets
+from typing import Optional
+
+from fastapi import Header, HTTPException
+
+from utils.get_env import get_admin_token_env
+
+
+def is_valid_admin_token(token: Optional[str]) -> bool:
+    admin_token = get_admin_token_env()
+    if not admin_token or not token:
+        return False
+    return secrets.compare_digest(admin_token, token)
+
+
+async def verify_admin_token(x_admin_token: Optional[str] = Header(None)):
+    """
+    Dependency for admin-only endpoints.
+    Admin endpoints are disabled unless ADMIN_TOKEN is set, and every request
+    must send the same value in the X-Admin-Token header.
+    """
+    if not get_admin_token_env():
+        raise HTTPException(status_code=404, detail="Admin endpoints are disabled")
+    if not is_valid_admin_token(x_admin_token):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
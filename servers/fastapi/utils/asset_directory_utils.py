@@ -17,3 +17,23 @@ def get_uploads_directory():
     uploads_directory = os.path.join(get_app_data_directory_env(), "uploads")
     os.makedirs(uploads_directory, exist_ok=True)
     return uploads_directory
+
+
+def get_profiles_directory():
+    profiles_directory = os.path.join(get_app_data_directory_env(), "profiles")
+    os.makedirs(profiles_directory, exist_ok=True)
+    return profiles_directory
+
+
+def get_derivatives_directory():
+    derivatives_directory = os.path.join(get_app_data_directory_env(), "derivatives")
+    os.makedirs(derivatives_directory, exist_ok=True)
+    return derivatives_directory
+
+
+def get_document_cache_directory():
+    document_cache_directory = os.path.join(
+        get_app_data_directory_env(), "document_cache"
+    )
+    os.makedirs(document_cache_directory, exist_ok=True)
+    return document_cache_directory
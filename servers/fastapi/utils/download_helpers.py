@@ -4,11 +4,23 @@ import mimetypes
 from typing import List, Optional
 from urllib.parse import urlparse
 
-import aiohttp
+from services.http_client_service import HTTP_CLIENT_SERVICE
 
 import uuid
 
 
+def _get_filename_from_headers(headers) -> Optional[str]:
+    content_disposition = headers.get("Content-Disposition", "")
+    if "filename=" in content_disposition:
+        return content_disposition.split("filename=")[1].strip("\"'")
+    content_type = headers.get("Content-Type", "")
+    if content_type:
+        extension = mimetypes.guess_extension(content_type.split(";")[0])
+        if extension:
+            return f"{uuid.uuid4()}{extension}"
+    return None
+
+
 async def download_file(
     url: str, save_directory: str, headers: Optional[dict] = None
 ) -> Optional[str]:
@@ -18,40 +30,23 @@ async def download_file(
         parsed_url = urlparse(url)
         filename = os.path.basename(parsed_url.path)
 
-        if not filename or "." not in filename:
-            async with aiohttp.ClientSession(trust_env=True) as session:
-                async with session.head(url, headers=headers) as response:
-                    if response.status == 200:
-                        content_disposition = response.headers.get(
-                            "Content-Disposition", ""
-                        )
-                        if "filename=" in content_disposition:
-                            filename = content_disposition.split("filename=")[1].strip(
-                                "\"'"
-                            )
-                        else:
-                            content_type = response.headers.get("Content-Type", "")
-                            if content_type:
-                                extension = mimetypes.guess_extension(
-                                    content_type.split(";")[0]
-                                )
-                                if extension:
-                                    filename = f"{uuid.uuid4()}{extension}"
+        session = HTTP_CLIENT_SERVICE.get_session()
+        async with session.get(url, headers=headers) as response:
+            if response.status != 200:
+                print(f"Failed to download file. HTTP status: {response.status}")
+                return None
 
-        filename = filename or str(uuid.uuid4())
-        save_path = os.path.join(save_directory, filename)
+            # Name comes from the response headers instead of a separate HEAD
+            if not filename or "." not in filename:
+                filename = _get_filename_from_headers(response.headers)
+            filename = filename or str(uuid.uuid4())
+            save_path = os.path.join(save_directory, filename)
 
-        async with aiohttp.ClientSession(trust_env=True) as session:
-            async with session.get(url, headers=headers) as response:
-                if response.status == 200:
-                    with open(save_path, "wb") as file:
-                        async for chunk in response.content.iter_chunked(8192):
-                            file.write(chunk)
-                    print(f"File downloaded successfully: {save_path}")
-                    return save_path
-                else:
-                    print(f"Failed to download file. HTTP status: {response.status}")
-                    return None
+            with open(save_path, "wb") as file:
+                async for chunk in response.content.iter_chunked(8192):
+                    file.write(chunk)
+            print(f"File downloaded successfully: {save_path}")
+            return save_path
 
     except Exception as e:
         print(f"Error downloading file from {url}: {e}")
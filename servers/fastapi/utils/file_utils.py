@@ -1,3 +1,4 @@
+import hashlib
 import os
 from typing import BinaryIO
 import uuid
@@ -42,3 +43,11 @@ def set_file_ext(file_path: str, ext: str) -> str:
     if get_file_ext_or_none(file_path):
         return f"{os.path.splitext(file_path)[0]}{ext}"
     return f"{file_path}{ext}"
+
+
+def get_file_sha256(file_path: str) -> str:
+    hasher = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        while chunk := f.read(1024 * 1024):
+            hasher.update(chunk)
+    return hasher.hexdigest()
@@ -95,3 +95,115 @@ def get_extended_reasoning_env():
 
 def get_web_grounding_env():
     return os.getenv("WEB_GROUNDING")
+
+
+def get_admin_token_env():
+    return os.getenv("ADMIN_TOKEN")
+
+
+def get_loop_monitor_env():
+    return os.getenv("LOOP_MONITOR")
+
+
+def get_loop_monitor_threshold_ms_env():
+    return os.getenv("LOOP_MONITOR_THRESHOLD_MS")
+
+
+def get_request_profiling_env():
+    return os.getenv("REQUEST_PROFILING")
+
+
+def get_image_search_cache_ttl_hours_env():
+    return os.getenv("IMAGE_SEARCH_CACHE_TTL_HOURS")
+
+
+def get_image_search_cache_max_entries_env():
+    return os.getenv("IMAGE_SEARCH_CACHE_MAX_ENTRIES")
+
+
+def get_media_gc_interval_hours_env():
+    return os.getenv("MEDIA_GC_INTERVAL_HOURS")
+
+
+def get_asset_fetch_provider_concurrency_env():
+    return os.getenv("ASSET_FETCH_PROVIDER_CONCURRENCY")
+
+
+def get_asset_fetch_host_concurrency_env():
+    return os.getenv("ASSET_FETCH_HOST_CONCURRENCY")
+
+
+def get_reuse_generated_images_env():
+    return os.getenv("REUSE_GENERATED_IMAGES")
+
+
+def get_generated_image_similarity_threshold_env():
+    return os.getenv("GENERATED_IMAGE_SIMILARITY_THRESHOLD")
+
+
+def get_image_derivative_scale_env():
+    return os.getenv("IMAGE_DERIVATIVE_SCALE")
+
+
+def get_icon_index_warm_up_env():
+    return os.getenv("ICON_INDEX_WARM_UP")
+
+
+def get_icon_index_backend_env():
+    return os.getenv("ICON_INDEX_BACKEND")
+
+
+def get_icon_search_cache_size_env():
+    return os.getenv("ICON_SEARCH_CACHE_SIZE")
+
+
+def get_docling_workers_env():
+    return os.getenv("DOCLING_WORKERS")
+
+
+def get_docling_max_queue_env():
+    return os.getenv("DOCLING_MAX_QUEUE")
+
+
+def get_docling_timeout_seconds_env():
+    return os.getenv("DOCLING_TIMEOUT_SECONDS")
+
+
+def get_document_cache_max_mb_env():
+    return os.getenv("DOCUMENT_CACHE_MAX_MB")
+
+
+def get_pdf_fast_text_extraction_env():
+    return os.getenv("PDF_FAST_TEXT_EXTRACTION")
+
+
+def get_pdf_max_pages_env():
+    return os.getenv("PDF_MAX_PAGES")
+
+
+def get_additional_context_token_budget_env():
+    return os.getenv("ADDITIONAL_CONTEXT_TOKEN_BUDGET")
+
+
+def get_additional_context_summarize_env():
+    return os.getenv("ADDITIONAL_CONTEXT_SUMMARIZE")
+
+
+def get_document_retrieval_top_k_env():
+    return os.getenv("DOCUMENT_RETRIEVAL_TOP_K")
+
+
+def get_pdf_render_workers_env():
+    return os.getenv("PDF_RENDER_WORKERS")
+
+
+def get_pdf_render_max_queue_env():
+    return os.getenv("PDF_RENDER_MAX_QUEUE")
+
+
+def get_pdf_page_image_dpi_env():
+    return os.getenv("PDF_PAGE_IMAGE_DPI")
+
+
+def get_pdf_page_image_format_env():
+    return os.getenv("PDF_PAGE_IMAGE_FORMAT")
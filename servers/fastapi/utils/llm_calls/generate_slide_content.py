@@ -44,6 +44,7 @@ def get_system_prompt(
         - Be very careful with number of words to generate for given field. As generating more than max characters will overflow in the design. So, analyze early and never generate more characters than allowed.
         - Do not add emoji in the content.
         - Metrics should be in abbreviated form with least possible characters. Do not add long sequence of words for metrics.
+        - If document excerpts are provided, use them for facts, figures and names on the slide. Only use excerpts related to the outline.
         - For verbosity:
             - If verbosity is 'concise', then generate description as 1/3 or lower of the max character limit. Don't worry if you miss content or context.
             - If verbosity is 'standard', then generate description as 2/3 of the max character limit.
@@ -64,7 +65,9 @@ def get_system_prompt(
     """
 
 
-def get_user_prompt(outline: str, language: str):
+def get_user_prompt(
+    outline: str, language: str, document_excerpts: Optional[str] = None
+):
     return f"""
         ## Current Date and Time
         {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
@@ -77,6 +80,9 @@ def get_user_prompt(outline: str, language: str):
 
         ## Slide Outline
         {outline}
+
+        {"## Document Excerpts" if document_excerpts else ""}
+        {document_excerpts or ""}
     """
 
 
@@ -86,6 +92,7 @@ def get_messages(
     tone: Optional[str] = None,
     verbosity: Optional[str] = None,
     instructions: Optional[str] = None,
+    document_excerpts: Optional[str] = None,
 ):
 
     return [
@@ -93,7 +100,7 @@ def get_messages(
             content=get_system_prompt(tone, verbosity, instructions),
         ),
         LLMUserMessage(
-            content=get_user_prompt(outline, language),
+            content=get_user_prompt(outline, language, document_excerpts),
         ),
     ]
 
@@ -105,6 +112,7 @@ async def get_slide_content_from_type_and_outline(
     tone: Optional[str] = None,
     verbosity: Optional[str] = None,
     instructions: Optional[str] = None,
+    document_excerpts: Optional[str] = None,
 ):
     client = LLMClient()
     model = get_model()
@@ -134,6 +142,7 @@ async def get_slide_content_from_type_and_outline(
                 tone,
                 verbosity,
                 instructions,
+                document_excerpts,
             ),
             response_format=response_schema,
             strict=False,
@@ -0,0 +1,37 @@
+from models.llm_message import LLMSystemMessage, LLMUserMessage
+from services.llm_client import LLMClient
+from utils.llm_client_error_handler import handle_llm_client_exceptions
+from utils.llm_provider import get_model
+
+
+def get_system_prompt(max_words: int):
+    return f"""
+        Condense the provided part of a document so it can be used as source material for a presentation.
+
+        - Keep headings, key facts, numbers, names, dates and conclusions.
+        - Drop repetition, boilerplate, references and formatting noise.
+        - Write in the language of the document.
+        - Respond in markdown with at most {max_words} words.
+        - Do not add information that is not in the document.
+    """
+
+
+def get_messages(chunk: str, max_words: int):
+    return [
+        LLMSystemMessage(content=get_system_prompt(max_words)),
+        LLMUserMessage(content=chunk),
+    ]
+
+
+async def summarize_document_chunk(chunk: str, max_tokens: int) -> str:
+    model = get_model()
+    client = LLMClient()
+    try:
+        return await client.generate(
+            model=model,
+            # Roughly 0.75 words per token, leaves headroom below max_tokens
+            messages=get_messages(chunk, max(50, int(max_tokens * 0.6))),
+            max_tokens=max_tokens,
+        )
+    except Exception as e:
+        raise handle_llm_client_exceptions(e)
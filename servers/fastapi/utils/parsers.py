@@ -1,4 +1,14 @@
+import re
+
+
 def parse_bool_or_none(value: str | None) -> bool | None:
     if value is None:
         return None
     return value.lower() == "true"
+
+
+def normalize_text(value: str | None) -> str:
+    """Lowercases and keeps only word characters, single space separated."""
+    if not value:
+        return ""
+    return " ".join(re.findall(r"\w+", value.lower()))
@@ -27,7 +27,9 @@ async def process_slide_and_fetch_assets(
             image_generation_service.generate_image(
                 ImagePrompt(
                     prompt=__image_prompt__parent["__image_prompt__"],
-                )
+                ),
+                # Earlier slides first, so streamed decks fill in top down
+                priority=slide.index,
             )
         )
 
@@ -52,7 +54,7 @@ async def process_slide_and_fetch_assets(
             # If result is an external URL, cache it to local storage for stability
             if isinstance(result, str) and is_external_media(result):
                 try:
-                    cached = await download_to_storage(result)
+                    cached = await download_to_storage(result, priority=slide.index)
                     image_dict["__image_url__"] = cached or result
                 except Exception:
                     image_dict["__image_url__"] = result